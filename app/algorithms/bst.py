@@ -1,43 +1,321 @@
 # app/algorithms/bst.py
+"""
+Mapa ordenado sobre árvore AVL.
+
+- inserção, remoção e busca iterativas (sem limite de recursão);
+- altura O(log n) mesmo com chaves inseridas em ordem (preço, id...);
+- carga em massa O(n) a partir de entrada ordenada;
+- iteração preguiçosa por faixa com ``items(lo, hi)``;
+- estatística de ordem: ``rank`` e ``select`` em O(log n).
+
+``bst_insert``/``bst_inorder``/``bst_search`` continuam como fachada
+obsoleta sobre o ``OrderedMap`` (a "raiz" passa a ser o próprio mapa).
+"""
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any, Optional, List
+import warnings
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("key", "value", "left", "right", "height", "size")
+
+    def __init__(self, key: Any, value: Any):
+        self.key = key
+        self.value = value
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.height = 1
+        self.size = 1
+
+
+def _height(n: Optional[_Node]) -> int:
+    return n.height if n else 0
+
+
+def _size(n: Optional[_Node]) -> int:
+    return n.size if n else 0
+
+
+def _update(n: _Node) -> None:
+    # caminho quente: evita chamadas auxiliares
+    l, r = n.left, n.right
+    lh, ls = (l.height, l.size) if l is not None else (0, 0)
+    rh, rs = (r.height, r.size) if r is not None else (0, 0)
+    n.height = 1 + (lh if lh > rh else rh)
+    n.size = 1 + ls + rs
+
+
+def _rotate_right(y: _Node) -> _Node:
+    x = y.left
+    y.left = x.right
+    x.right = y
+    _update(y)
+    _update(x)
+    return x
+
+
+def _rotate_left(x: _Node) -> _Node:
+    y = x.right
+    x.right = y.left
+    y.left = x
+    _update(x)
+    _update(y)
+    return y
+
+
+def _rebalance(n: _Node) -> _Node:
+    _update(n)
+    balance = _height(n.left) - _height(n.right)
+    if balance > 1:
+        if _height(n.left.left) < _height(n.left.right):
+            n.left = _rotate_left(n.left)
+        return _rotate_right(n)
+    if balance < -1:
+        if _height(n.right.right) < _height(n.right.left):
+            n.right = _rotate_right(n.right)
+        return _rotate_left(n)
+    return n
+
+
+class OrderedMap:
+    """
+    Chaves precisam ser comparáveis com ``<`` (ex.: ``(price, id)``).
+    Alterar o mapa durante uma iteração de ``items`` não é suportado.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self):
+        self._root: Optional[_Node] = None
+
+    @classmethod
+    def from_sorted(cls, pairs: Iterable[Tuple[Any, Any]]) -> "OrderedMap":
+        """Carga em massa O(n); ``pairs`` deve vir com chaves estritamente crescentes."""
+        items = list(pairs)
+        for i in range(1, len(items)):
+            if not items[i - 1][0] < items[i][0]:
+                raise ValueError("from_sorted exige chaves estritamente crescentes")
+
+        def build(lo: int, hi: int) -> Optional[_Node]:
+            # profundidade da recursão é log2(n): segura mesmo para 10^6 chaves
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = _Node(*items[mid])
+            node.left = build(lo, mid)
+            node.right = build(mid + 1, hi)
+            _update(node)
+            return node
+
+        tree = cls()
+        tree._root = build(0, len(items))
+        return tree
 
-@dataclass
-class _BSTNode:
-    key: Any
-    value: Any
-    left: Optional["_BSTNode"] = None
-    right: Optional["_BSTNode"] = None
+    # ---------- Protocolo de mapa ----------
+    def __len__(self) -> int:
+        return _size(self._root)
 
-def bst_insert(root: Optional[_BSTNode], key: Any, value: Any) -> _BSTNode:
+    def __bool__(self) -> bool:
+        return self._root is not None
+
+    def __contains__(self, key: Any) -> bool:
+        return self._find(key) is not None
+
+    def __getitem__(self, key: Any) -> Any:
+        node = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.insert(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        for k, _ in self.items():
+            yield k
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        node = self._find(key)
+        return default if node is None else node.value
+
+    def height(self) -> int:
+        return _height(self._root)
+
+    # ---------- Busca / inserção / remoção ----------
+    def _find(self, key: Any) -> Optional[_Node]:
+        cur = self._root
+        while cur is not None:
+            if key < cur.key:
+                cur = cur.left
+            elif cur.key < key:
+                cur = cur.right
+            else:
+                return cur
+        return None
+
+    def _fix_path(self, path: list, child: Optional[_Node]) -> None:
+        # religa e rebalanceia de baixo para cima ao longo do caminho percorrido
+        for parent, went_left in reversed(path):
+            if went_left:
+                parent.left = child
+            else:
+                parent.right = child
+            child = _rebalance(parent)
+        self._root = child
+
+    def insert(self, key: Any, value: Any = None) -> bool:
+        """Insere ou atualiza; retorna True se a chave era nova."""
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            elif node.key < key:
+                path.append((node, False))
+                node = node.right
+            else:
+                # chave igual: atualiza valor
+                node.value = value
+                return False
+        self._fix_path(path, _Node(key, value))
+        return True
+
+    def delete(self, key: Any) -> bool:
+        path = []
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            elif node.key < key:
+                path.append((node, False))
+                node = node.right
+            else:
+                break
+        if node is None:
+            return False
+
+        if node.left is not None and node.right is not None:
+            # troca pelo sucessor e remove o sucessor (que não tem filho esquerdo)
+            path.append((node, False))
+            succ = node.right
+            while succ.left is not None:
+                path.append((succ, True))
+                succ = succ.left
+            node.key, node.value = succ.key, succ.value
+            replacement = succ.right
+        else:
+            replacement = node.left if node.left is not None else node.right
+        self._fix_path(path, replacement)
+        return True
+
+    # ---------- Ordem ----------
+    def items(self, lo: Any = None, hi: Any = None, reverse: bool = False) -> Iterator[Tuple[Any, Any]]:
+        """Gera (key, value) com ``lo <= key <= hi`` sob demanda (limites opcionais)."""
+        stack: list = []
+        node = self._root
+        if not reverse:
+            while stack or node is not None:
+                if node is not None:
+                    if lo is not None and node.key < lo:
+                        node = node.right
+                        continue
+                    stack.append(node)
+                    node = node.left
+                else:
+                    node = stack.pop()
+                    if hi is not None and hi < node.key:
+                        return
+                    yield node.key, node.value
+                    node = node.right
+        else:
+            while stack or node is not None:
+                if node is not None:
+                    if hi is not None and hi < node.key:
+                        node = node.left
+                        continue
+                    stack.append(node)
+                    node = node.right
+                else:
+                    node = stack.pop()
+                    if lo is not None and node.key < lo:
+                        return
+                    yield node.key, node.value
+                    node = node.left
+
+    def min(self) -> Tuple[Any, Any]:
+        if self._root is None:
+            raise KeyError("mapa vazio")
+        node = self._root
+        while node.left is not None:
+            node = node.left
+        return node.key, node.value
+
+    def max(self) -> Tuple[Any, Any]:
+        if self._root is None:
+            raise KeyError("mapa vazio")
+        node = self._root
+        while node.right is not None:
+            node = node.right
+        return node.key, node.value
+
+    def rank(self, key: Any) -> int:
+        """Quantidade de chaves estritamente menores que ``key``."""
+        r = 0
+        node = self._root
+        while node is not None:
+            if node.key < key:
+                r += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return r
+
+    def select(self, i: int) -> Tuple[Any, Any]:
+        """i-ésimo menor par (key, value), 0-based; aceita índice negativo."""
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("índice fora do intervalo")
+        node = self._root
+        while True:
+            left = _size(node.left)
+            if i < left:
+                node = node.left
+            elif i == left:
+                return node.key, node.value
+            else:
+                i -= left + 1
+                node = node.right
+
+
+# ---------- API antiga (compatibilidade) ----------
+def _deprecated(name: str) -> None:
+    warnings.warn(f"{name} está obsoleto; use OrderedMap", DeprecationWarning, stacklevel=3)
+
+
+def bst_insert(root: Optional[OrderedMap], key: Any, value: Any) -> OrderedMap:
+    """Insere (ou atualiza) e devolve a "raiz"; comece com ``None``, como antes."""
+    _deprecated("bst_insert")
     if root is None:
-        return _BSTNode(key, value)
-    if key < root.key:
-        root.left = bst_insert(root.left, key, value)
-    elif key > root.key:
-        root.right = bst_insert(root.right, key, value)
-    else:
-        # chave igual: atualiza valor
-        root.value = value
+        root = OrderedMap()
+    root.insert(key, value)
     return root
 
-def bst_inorder(root: Optional[_BSTNode]) -> List[Any]:
-    out: List[Any] = []
-    def _walk(n: Optional[_BSTNode]):
-        if not n:
-            return
-        _walk(n.left)
-        out.append(n.value)
-        _walk(n.right)
-    _walk(root)
-    return out
-
-def bst_search(root: Optional[_BSTNode], key: Any) -> Optional[Any]:
-    cur = root
-    while cur:
-        if key == cur.key:
-            return cur.value
-        cur = cur.left if key < cur.key else cur.right
-    return None
+
+def bst_inorder(root: Optional[OrderedMap]) -> List[Any]:
+    """Valores em ordem crescente de chave."""
+    _deprecated("bst_inorder")
+    return [v for _, v in root.items()] if root is not None else []
+
+
+def bst_search(root: Optional[OrderedMap], key: Any) -> Optional[Any]:
+    _deprecated("bst_search")
+    return root.get(key) if root is not None else None
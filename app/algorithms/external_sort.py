@@ -0,0 +1,83 @@
+# app/algorithms/external_sort.py
+"""
+Ordenação externa: k-way merge sobre corridas ordenadas em disco.
+
+- a entrada é consumida em streaming, em corridas de ``run_size`` itens;
+- cada corrida é ordenada em memória e gravada num arquivo temporário
+  (pickle em blocos), junto com a chave já calculada;
+- as corridas são intercaladas com ``heapq.merge``; com mais de ``fan_in``
+  corridas, passes intermediários juntam grupos até caber num só merge;
+- se tudo couber numa corrida, nada vai para o disco.
+
+Memória: uma corrida na fase de ordenação e um bloco por corrida no merge,
+independente do tamanho da entrada. A ordenação é estável.
+"""
+
+from __future__ import annotations
+
+import heapq
+import pickle
+import tempfile
+from itertools import islice
+from operator import itemgetter
+from typing import IO, Any, Callable, Iterable, Iterator
+
+_BLOCK = 1024  # itens por pickle: menos chamadas sem inflar a memória do merge
+_key = itemgetter(0, 1)  # (chave, seq): ordem total, estável entre corridas
+
+
+def _write_run(items: Iterable, tmp_dir: str | None) -> IO[bytes]:
+    f = tempfile.TemporaryFile(dir=tmp_dir)
+    it = iter(items)
+    while block := list(islice(it, _BLOCK)):
+        pickle.dump(block, f, pickle.HIGHEST_PROTOCOL)
+    f.seek(0)
+    return f
+
+
+def _read_run(f: IO[bytes]) -> Iterator:
+    while True:
+        try:
+            block = pickle.load(f)
+        except EOFError:
+            return
+        yield from block
+
+
+def external_sort(
+    items: Iterable[Any],
+    key: Callable[[Any], Any] | None = None,
+    run_size: int = 100_000,
+    fan_in: int = 64,
+    tmp_dir: str | None = None,
+) -> Iterator[Any]:
+    """Gera ``items`` em ordem de ``key``; os temporários somem ao esgotar ou fechar o gerador."""
+    key = key or (lambda x: x)
+    it = iter(items)
+    runs: list[IO[bytes]] = []
+    try:
+        while True:
+            # (chave, seq, item): seq desempata chaves iguais sem comparar itens
+            start = len(runs) * run_size
+            chunk = [(key(x), start + i, x) for i, x in enumerate(islice(it, run_size))]
+            if not chunk:
+                break
+            chunk.sort(key=_key)
+            if not runs and len(chunk) < run_size:
+                yield from (x for _, _, x in chunk)  # coube numa corrida: sem disco
+                return
+            runs.append(_write_run(chunk, tmp_dir))
+            del chunk
+
+        while len(runs) > fan_in:
+            group, runs = runs[:fan_in], runs[fan_in:]
+            merged = _write_run(heapq.merge(*map(_read_run, group), key=_key), tmp_dir)
+            for f in group:
+                f.close()
+            runs.append(merged)
+
+        for _, _, x in heapq.merge(*map(_read_run, runs), key=_key):
+            yield x
+    finally:
+        for f in runs:
+            f.close()
@@ -1,17 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from pydantic import BaseModel, EmailStr
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserOut
-from app.core.security import (
-    verify_password,
-    hash_password,
-    create_access_token,
-    decode_token,
-)
+from app.core import auth_cache
+from app.core.admission import auth_limiter
+from app.core.auth_cache import Principal
+from app.core.security import HasherBusy, create_access_token, hasher
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -22,46 +21,45 @@ class LoginIn(BaseModel):
     password: str
 
 
-# --------- Helper ----------
-def _get_current_user(db: Session, authorization: str | None) -> User:
+# --------- Helpers ----------
+def bearer_token(authorization: str | None) -> str:
     if not authorization or not authorization.lower().startswith("bearer "):
         raise HTTPException(status_code=401, detail="Token ausente")
-    token = authorization.split(" ", 1)[1]
-    payload = decode_token(token)
-    uid = payload.get("sub")
+    return authorization.split(" ", 1)[1]
+
+
+def _get_current_user(db: Session, authorization: str | None) -> Principal:
+    uid = auth_cache.token_subject(bearer_token(authorization))
     if not uid:
         raise HTTPException(status_code=401, detail="Token inválido")
+    principal = auth_cache.cached_principal(uid)
+    if principal:
+        return principal
     user = db.get(User, uid)
     if not user:
         raise HTTPException(status_code=401, detail="Usuário não encontrado")
-    return user
+    return auth_cache.remember(user)
 
 
-# --------- Endpoints ----------
-@router.post("/register", response_model=UserOut, status_code=201)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
-    exists = db.execute(select(User).where(User.email == payload.email)).scalar_one_or_none()
-    if exists:
-        raise HTTPException(status_code=409, detail="E-mail já cadastrado")
+def _busy() -> HTTPException:
+    return HTTPException(status_code=503, detail="Servidor ocupado, tente novamente", headers={"Retry-After": "1"})
 
-    obj = User(
-        full_name=payload.full_name,
-        email=payload.email,
-        password_hash=hash_password(payload.password),  # já corta em 72 bytes na função
-    )
-    db.add(obj)
-    db.commit()
-    db.refresh(obj)
-    return obj
 
+def rate_limit(request: Request, email: str) -> None:
+    """Balde de fichas por IP e por e-mail: barra força bruta antes do pbkdf2."""
+    client = request.client.host if request.client else "-"
+    wait = auth_limiter.retry_after(f"ip:{client}", f"email:{email.lower()}")
+    if wait:
+        raise HTTPException(
+            status_code=429,
+            detail="Muitas tentativas, aguarde e tente novamente",
+            headers={"Retry-After": str(wait)},
+        )
 
-@router.post("/login")
-def login(info: LoginIn, db: Session = Depends(get_db)):
-    user = db.execute(select(User).where(User.email == info.email)).scalar_one_or_none()
-    if not user or not verify_password(info.password, user.password_hash):
-        raise HTTPException(status_code=401, detail="E-mail ou senha inválidos")
 
-    token = create_access_token({"sub": user.id})
+def _login_response(user) -> dict:
+    # "sub" precisa ser string para o python-jose aceitar o token de volta
+    token = create_access_token({"sub": str(user.id)})
     return {
         "access_token": token,
         "token_type": "bearer",
@@ -73,7 +71,57 @@ def login(info: LoginIn, db: Session = Depends(get_db)):
     }
 
 
+# --------- Endpoints ----------
+# register/login são async: o pbkdf2 roda no pool do `hasher` e o acesso
+# ao banco no threadpool, sem prender um worker durante o hash.
+@router.post("/register", response_model=UserOut, status_code=201)
+async def register(payload: UserCreate, request: Request, db: Session = Depends(get_db)):
+    rate_limit(request, payload.email)
+
+    def _exists():
+        return db.execute(select(User).where(User.email == payload.email)).scalar_one_or_none()
+
+    if await run_in_threadpool(_exists):
+        raise HTTPException(status_code=409, detail="E-mail já cadastrado")
+
+    try:
+        password_hash = await hasher.hash(payload.password)
+    except HasherBusy:
+        raise _busy()
+
+    def _insert():
+        obj = User(
+            full_name=payload.full_name,
+            email=payload.email,
+            password_hash=password_hash,
+        )
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
+        return obj
+
+    return await run_in_threadpool(_insert)
+
+
+@router.post("/login")
+async def login(info: LoginIn, request: Request, db: Session = Depends(get_db)):
+    rate_limit(request, info.email)
+
+    def _find():
+        return db.execute(select(User).where(User.email == info.email)).scalar_one_or_none()
+
+    user = await run_in_threadpool(_find)
+    try:
+        ok = bool(user) and await hasher.verify(info.password, user.password_hash)
+    except HasherBusy:
+        raise _busy()
+    if not ok:
+        raise HTTPException(status_code=401, detail="E-mail ou senha inválidos")
+
+    auth_cache.remember(user)
+    return _login_response(user)
+
+
 @router.get("/me", response_model=UserOut)
-def me(Authorization: str | None = Header(None), db: Session = Depends(get_db)):
-    user = _get_current_user(db, Authorization)
-    return user
+def me(Authorization: str | None = Header(None), db: Session = Depends(get_read_db)):
+    return _get_current_user(db, Authorization)
@@ -0,0 +1,67 @@
+# app/api/auth_async.py
+"""Versão assíncrona (AsyncSession) das rotas de autenticação; ver ``DB_ASYNC``."""
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import LoginIn, _busy, _login_response, bearer_token, rate_limit
+from app.core import auth_cache
+from app.core.auth_cache import Principal
+from app.core.security import HasherBusy, hasher
+from app.db.session import get_async_db, get_async_read_db
+from app.models.user import User
+from app.schemas.user import UserCreate, UserOut
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+async def _get_current_user(db: AsyncSession, authorization: str | None) -> Principal:
+    uid = auth_cache.token_subject(bearer_token(authorization))
+    if not uid:
+        raise HTTPException(status_code=401, detail="Token inválido")
+    principal = auth_cache.cached_principal(uid)
+    if principal:
+        return principal
+    user = await db.get(User, uid)
+    if not user:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado")
+    return auth_cache.remember(user)
+
+
+@router.post("/register", response_model=UserOut, status_code=201)
+async def register(payload: UserCreate, request: Request, db: AsyncSession = Depends(get_async_db)):
+    rate_limit(request, payload.email)
+    exists = (await db.execute(select(User).where(User.email == payload.email))).scalar_one_or_none()
+    if exists:
+        raise HTTPException(status_code=409, detail="E-mail já cadastrado")
+
+    try:
+        password_hash = await hasher.hash(payload.password)
+    except HasherBusy:
+        raise _busy()
+
+    obj = User(full_name=payload.full_name, email=payload.email, password_hash=password_hash)
+    db.add(obj)
+    await db.commit()
+    await db.refresh(obj)
+    return obj
+
+
+@router.post("/login")
+async def login(info: LoginIn, request: Request, db: AsyncSession = Depends(get_async_db)):
+    rate_limit(request, info.email)
+    user = (await db.execute(select(User).where(User.email == info.email))).scalar_one_or_none()
+    try:
+        ok = bool(user) and await hasher.verify(info.password, user.password_hash)
+    except HasherBusy:
+        raise _busy()
+    if not ok:
+        raise HTTPException(status_code=401, detail="E-mail ou senha inválidos")
+
+    auth_cache.remember(user)
+    return _login_response(user)
+
+
+@router.get("/me", response_model=UserOut)
+async def me(Authorization: str | None = Header(None), db: AsyncSession = Depends(get_async_read_db)):
+    return await _get_current_user(db, Authorization)
@@ -1,56 +1,373 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.config import settings
+from app.core.http_cache import is_not_modified, not_modified, validators
+from app.db.session import get_db, get_read_db
 from app.models.product import Product
-from app.schemas.product import ProductCreate, ProductUpdate, ProductOut
+from app.schemas.product import ProductBatchResult, ProductBatchUpdate, ProductCreate, ProductUpdate, ProductOut
+from app.services import batch_update, catalog_events, catalog_version, products_service
+from app.services.catalog_events import ProductRow
+from app.services.catalog_snapshot import catalog_snapshot
+from app.services.change_feed import FeedFull, change_feed
+from app.services.pagination import InvalidCursor, filtered_select, paginate, split_page
+from app.services.price_analytics import price_analytics
+from app.services.price_index import SqlPriceIndex, price_index
+from app.services.product_cache import product_cache
+from app.services.search_index import search_index
+from app.services.serialization import PRODUCT_COLUMNS, PRODUCT_FIELDS, dumps, encode_product, encode_products
+from app.services.write_coalescer import write_coalescer
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+FORMAT_QUERY = Query("json", pattern="^(json|compact)$", description="compact: {columns, rows} colunar")
+
+def _json(body: bytes, headers: dict | None = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _cached(cached, request: Request) -> Response:
+    body, headers = cached
+    if headers and "ETag" in headers and is_not_modified(request.headers, headers["ETag"]):
+        return not_modified(headers)
+    return _json(body, headers)
+
+def _conflict():
+    # trava otimista (Product.version): outra requisição alterou a linha no meio
+    return HTTPException(status_code=409, detail="Produto alterado por outra requisição; tente novamente")
+
 # ---------- CRUD ----------
 
 @router.post("/", response_model=ProductOut, status_code=201)
 def create_product(payload: ProductCreate, db: Session = Depends(get_db)):
+    if write_coalescer.enabled:
+        return write_coalescer.submit(payload)
     obj = Product(**payload.model_dump())
     db.add(obj)
     db.commit()
     db.refresh(obj)
+    catalog_events.created(obj)
     return obj
 
 @router.get("/", response_model=list[ProductOut])
 def list_products(
-    db: Session = Depends(get_db),
-    q: str | None = Query(None, description="Busca por nome (ILIKE)"),
+    request: Request,
+    db: Session = Depends(get_read_db),
+    q: str | None = Query(None, description="Trecho do nome (ILIKE); busca por palavras: /products/search"),
     category: str | None = None,
     min_price: float | None = None,
     max_price: float | None = None,
     order_by_price: bool = False,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Cursor opaco do header X-Next-Cursor (paginação keyset)"),
+    format: str = FORMAT_QUERY,
 ):
-    query = db.query(Product)
-    if q:
-        query = query.filter(Product.name.ilike(f"%{q}%"))
-    if category:
-        query = query.filter(Product.category == category)
-    if min_price is not None:
-        query = query.filter(Product.price >= min_price)
-    if max_price is not None:
-        query = query.filter(Product.price <= max_price)
+    state = _catalog_state(db)
+    key, cached, stmt = _listing(q, category, min_price, max_price, order_by_price, limit, offset, cursor, format)
+    if cached is not None:
+        return _cached(cached, request)
+    # a ETag sai da versão do catálogo: 304 sem rodar a listagem nem serializar
+    etag, changed_at = _listing_etag(key, state)
+    headers = validators(etag, changed_at)
+    if is_not_modified(request.headers, etag, changed_at):
+        return not_modified(headers)
+    # ORDER BY/LIMIT no banco: só a página (+1 sentinela) é materializada, como tuplas
+    rows = db.execute(stmt).all()
+    return _render_page(key, rows, order_by_price, limit, format, headers)
 
-    items = query.all()
+def _catalog_state(db: Session):
+    """(versão, última alteração) do catálogo, já conferida pelo cache (escritas de outros workers)."""
+    state = catalog_version.current(db)
+    product_cache.sync(state[0])
+    return state
 
-    # Ordenação simples por preço (estável e suficiente aqui)
-    if order_by_price:
-        items = sorted(items, key=lambda p: p.price)
+def _listing(q, category, min_price, max_price, order_by_price, limit, offset, cursor, format="json"):
+    """Valida a paginação e consulta o cache; devolve (chave, (corpo, headers) em cache, stmt)."""
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use cursor ou offset, não ambos")
 
-    return items[offset:offset + limit]
+    key = product_cache.listing_key(
+        category, q=q, min_price=min_price, max_price=max_price,
+        order_by_price=order_by_price, limit=limit, offset=offset, cursor=cursor, format=format,
+    )
+    cached = product_cache.get(key)
+    if cached is not None:
+        return key, cached, None
 
-@router.get("/{product_id}", response_model=ProductOut)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    obj = db.get(Product, product_id)
-    if not obj:
+    stmt = filtered_select(q, category, min_price, max_price, columns=PRODUCT_COLUMNS)
+    try:
+        stmt = paginate(stmt, order_by_price, limit, offset, cursor)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return key, None, stmt
+
+def _listing_etag(key, state) -> tuple[str, object]:
+    version, changed_at = state
+    return f'"c{version}-{product_cache.listing_fingerprint(key)}"', changed_at
+
+def _render_page(key, rows, order_by_price: bool, limit: int, format: str = "json", headers: dict | None = None) -> Response:
+    items, next_cursor = split_page(rows, order_by_price, limit)
+    body = encode_products(items, compact=format == "compact")
+    headers = dict(headers or {})
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    product_cache.put(key, body, headers)
+    return _json(body, headers)
+
+def _product_stmt(product_id: int):
+    return select(*PRODUCT_COLUMNS, Product.version, Product.updated_at).where(Product.id == product_id)
+
+def _render_product(key, row, request: Request) -> Response:
+    if not row:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
-    return obj
+    # id + versão da linha (+ instante, caso um id seja reaproveitado após DELETE)
+    stamp = int(row.updated_at.timestamp()) if row.updated_at else 0
+    etag = f'"p{row.id}.{row.version}.{stamp}"'
+    headers = validators(etag, row.updated_at)
+    if is_not_modified(request.headers, etag, row.updated_at):
+        return not_modified(headers)
+    body = encode_product(row)
+    product_cache.put(key, body, headers)
+    return _json(body, headers)
+
+# ---------- Consultas por preço (índice em memória) ----------
+
+def _fetch_ordered(db: Session, ids: list[int]) -> Response:
+    """Carrega os produtos pelos ids preservando a ordem do índice."""
+    if not ids:
+        return _json(b"[]")
+    by_id = {r.id: r for r in db.execute(select(*PRODUCT_COLUMNS).where(Product.id.in_(ids)))}
+    return _json(encode_products(by_id[i] for i in ids if i in by_id))
+
+def _by_price(db: Session, query) -> Response:
+    """
+    ``query(index)`` devolve ids em ordem de preço. Com snapshot mapeado
+    índice e linhas vêm dele; se este worker escreveu depois da publicação
+    (ou o snapshot ainda não existe), a consulta vai ao banco.
+    """
+    if not catalog_snapshot.enabled:
+        price_index.ensure_loaded(db)
+        return _fetch_ordered(db, query(price_index))
+    snap = catalog_snapshot.current()
+    if snap is None or catalog_snapshot.has_dirty():
+        return _fetch_ordered(db, query(SqlPriceIndex(db)))
+    return _json(encode_products(snap.rows_for(query(snap.price_index))))
+
+@router.get("/price/exact", response_model=list[ProductOut])
+def price_exact(price: float, limit: int = Query(50, ge=1, le=200), db: Session = Depends(get_read_db)):
+    return _by_price(db, lambda index: index.exact(price, limit))
+
+@router.get("/price/range", response_model=list[ProductOut])
+def price_range(
+    min_price: float | None = None,
+    max_price: float | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    return _by_price(db, lambda index: index.range(min_price, max_price, limit, offset))
+
+@router.get("/price/nearest", response_model=list[ProductOut])
+def price_nearest(price: float, k: int = Query(1, ge=1, le=200), db: Session = Depends(get_read_db)):
+    return _by_price(db, lambda index: index.nearest(price, k))
+
+@router.get("/price/cheapest", response_model=list[ProductOut])
+def price_cheapest(k: int = Query(10, ge=1, le=200), db: Session = Depends(get_read_db)):
+    return _by_price(db, lambda index: index.cheapest(k))
+
+@router.get("/price/priciest", response_model=list[ProductOut])
+def price_priciest(k: int = Query(10, ge=1, le=200), db: Session = Depends(get_read_db)):
+    return _by_price(db, lambda index: index.priciest(k))
+
+# ---------- Top-K e facetas ----------
+
+@router.get("/top", response_model=list[ProductOut])
+def top_products(
+    k: int = Query(10, ge=1, le=200),
+    category: str | None = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    strategy: str = Query("auto", pattern="^(auto|sql|heap)$",
+                          description="auto: índice em memória ou ORDER BY/LIMIT; heap: heapq sobre cursor"),
+    db: Session = Depends(get_read_db),
+):
+    largest = order == "desc"
+    if strategy == "heap":
+        return _json(encode_products(products_service.stream_top_k(db, k, category, largest)))
+    if strategy == "auto" and not category and price_index.ready:
+        # já ordenado em memória: O(k); ensure_loaded só confere a versão
+        price_index.ensure_loaded(db)
+        return _fetch_ordered(db, price_index.priciest(k) if largest else price_index.cheapest(k))
+
+    return _json(encode_products(db.execute(products_service.top_k_select(k, category, largest)).all()))
+
+@router.get("/facets")
+def product_facets(
+    q: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    db: Session = Depends(get_read_db),
+):
+    """Contagem e min/max/média de preço por categoria, numa única consulta agregada."""
+    _catalog_state(db)
+    key = product_cache.listing_key(None, facets=True, q=q, min_price=min_price, max_price=max_price)
+    cached = product_cache.get(key)
+    if cached is not None:
+        return _json(cached[0])
+
+    cols = (
+        Product.category,
+        func.count(Product.id),
+        func.min(Product.price),
+        func.max(Product.price),
+        func.avg(Product.price),
+    )
+    stmt = filtered_select(q, None, min_price, max_price, columns=cols)
+    stmt = stmt.group_by(Product.category).order_by(Product.category)
+    body = dumps([
+        {"category": c, "count": n, "min_price": lo, "max_price": hi, "avg_price": round(float(avg), 2)}
+        for c, n, lo, hi, avg in db.execute(stmt)
+    ])
+    product_cache.put(key, body)
+    return _json(body)
+
+# ---------- Estatísticas de preço (snapshot NumPy) ----------
+
+def _parse_percentiles(q: str) -> list[float]:
+    try:
+        qs = [float(x) for x in q.split(",") if x.strip()]
+    except ValueError:
+        qs = []
+    if not qs or len(qs) > 20 or any(not 0 <= x <= 100 for x in qs):
+        raise HTTPException(status_code=422, detail="q deve ser uma lista de 1 a 20 percentis entre 0 e 100")
+    return qs
+
+@router.get("/stats/histogram")
+def stats_histogram(
+    bins: int = Query(20, ge=1, le=500),
+    category: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    db: Session = Depends(get_read_db),
+):
+    """Histograma de preços (``edges`` tem ``len(counts) + 1`` limites)."""
+    price_analytics.ensure_loaded(db)
+    return _json(dumps(price_analytics.histogram(bins, category, min_price, max_price)))
+
+@router.get("/stats/percentiles")
+def stats_percentiles(
+    q: str = Query("50,90,95,99", description="Percentis separados por vírgula (0-100)"),
+    category: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    qs = _parse_percentiles(q)
+    price_analytics.ensure_loaded(db)
+    return _json(dumps(price_analytics.percentiles(qs, category)))
+
+@router.get("/stats/categories")
+def stats_categories(db: Session = Depends(get_read_db)):
+    """Contagem, min/max, média, mediana e desvio padrão do preço por categoria."""
+    price_analytics.ensure_loaded(db)
+    return _json(dumps(price_analytics.category_stats()))
+
+@router.get("/stats/count")
+def stats_count(
+    min_price: float | None = None,
+    max_price: float | None = None,
+    category: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    """Quantos produtos têm preço em [min_price, max_price], sem ir ao banco."""
+    price_analytics.ensure_loaded(db)
+    return {"count": price_analytics.count_range(min_price, max_price, category)}
+
+# ---------- Busca textual ----------
+
+@router.get("/search", response_model=list[ProductOut])
+def search_products(
+    q: str = Query(..., min_length=1, description="Termos; cada um casa por prefixo, sem acento"),
+    category: str | None = None,
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_read_db),
+):
+    search_index.ensure_loaded(db)
+    return _fetch_ordered(db, search_index.search(q, limit, category))
+
+@router.get("/search/suggest", response_model=list[str])
+def search_suggest(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50), db: Session = Depends(get_read_db)):
+    search_index.ensure_loaded(db)
+    return search_index.suggest(q, limit)
+
+# ---------- Atualização em lote ----------
+
+@router.patch("/batch", response_model=ProductBatchResult)
+def batch_update_products(
+    payload: ProductBatchUpdate,
+    return_items: bool = Query(True, description="false: só a contagem, sem devolver as linhas"),
+    db: Session = Depends(get_db),
+):
+    """
+    Lista explícita ``items: [{id, fields, version?}]`` ou regra
+    ``rule: {category, price_factor, price_delta, ...}``, aplicada com
+    UPDATEs por conjunto numa única transação. Versões divergentes: 409.
+    """
+    try:
+        updated, version, rows = batch_update.apply(db, payload, return_items)
+    except batch_update.BatchConflict as exc:
+        raise HTTPException(status_code=409, detail={
+            "message": "Produtos alterados por outra requisição ou inexistentes; nada foi gravado",
+            "missing": exc.missing,
+            "stale": exc.stale,
+            "catalog_version": exc.catalog_version,
+        })
+    fields = (*PRODUCT_FIELDS, "version")
+    return _json(dumps({
+        "updated": updated,
+        "catalog_version": version,
+        "items": [dict(zip(fields, r)) for r in rows],
+    }))
+
+# ---------- Feed de alterações (SSE) ----------
+
+@router.get("/changes", response_class=StreamingResponse)
+async def product_changes(
+    last_event_id: str | None = Header(None),
+    since: str | None = Query(None, description="Alternativa ao header Last-Event-ID na primeira conexão"),
+):
+    """
+    Stream ``text/event-stream`` com ``create``/``update``/``delete`` (id, campos
+    novos e versão monotônica do feed). Reconectando com ``Last-Event-ID`` o
+    cliente recebe o que perdeu; se o buffer não cobre a lacuna, um ``reset``
+    pede para recarregar a lista.
+    """
+    try:
+        sub, backlog = change_feed.subscribe(last_event_id or since)
+    except FeedFull:
+        raise HTTPException(status_code=503, detail="Muitos clientes no feed", headers={"Retry-After": "5"})
+    stream = change_feed.stream(sub, backlog, settings.FEED_HEARTBEAT_SECONDS, settings.FEED_MAX_STREAM_SECONDS)
+    return StreamingResponse(stream, media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # nginx: não segurar os eventos no buffer do proxy
+    })
+
+@router.get("/cache/stats")
+def cache_stats():
+    return product_cache.stats()
+
+@router.get("/{product_id}", response_model=ProductOut)
+def get_product(product_id: int, request: Request, db: Session = Depends(get_read_db)):
+    if product_cache.enabled:
+        _catalog_state(db)
+    key = product_cache.product_key(product_id)
+    cached = product_cache.get(key)
+    if cached is not None:
+        return _cached(cached, request)
+
+    row = catalog_snapshot.get(product_id)
+    if row is None:
+        row = db.execute(_product_stmt(product_id)).first()
+    return _render_product(key, row, request)
 
 @router.put("/{product_id}", response_model=ProductOut)
 def update_product(product_id: int, payload: ProductUpdate, db: Session = Depends(get_db)):
@@ -58,13 +375,19 @@ def update_product(product_id: int, payload: ProductUpdate, db: Session = Depend
     if not obj:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
 
+    before = ProductRow.of(obj)
     data = payload.model_dump(exclude_unset=True)
     for k, v in data.items():
         setattr(obj, k, v)
 
     db.add(obj)
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise _conflict()
     db.refresh(obj)
+    catalog_events.updated(before, obj)
     return obj
 
 @router.delete("/{product_id}", status_code=204)
@@ -72,6 +395,12 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
     obj = db.get(Product, product_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
+    before = ProductRow.of(obj)
     db.delete(obj)
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise _conflict()
+    catalog_events.deleted(before)
     return None
@@ -0,0 +1,119 @@
+# app/api/products_async.py
+"""
+Versão assíncrona (AsyncSession) do CRUD e da listagem de produtos.
+Montada no lugar das rotas equivalentes de ``products.py`` quando
+``DB_ASYNC=true``; cache, paginação e eventos são os mesmos.
+"""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.api.products import (
+    FORMAT_QUERY, _cached, _conflict, _listing, _listing_etag, _product_stmt, _render_page, _render_product,
+)
+from app.core.http_cache import is_not_modified, not_modified, validators
+from app.db.replicas import note_write
+from app.db.session import get_async_db, get_async_read_db
+from app.models.product import Product
+from app.schemas.product import ProductCreate, ProductUpdate, ProductOut
+from app.services import catalog_events, catalog_version
+from app.services.catalog_events import ProductRow
+from app.services.catalog_snapshot import catalog_snapshot
+from app.services.product_cache import product_cache
+from app.services.write_coalescer import write_coalescer
+
+router = APIRouter(prefix="/products", tags=["products"])
+
+
+@router.post("/", response_model=ProductOut, status_code=201)
+async def create_product(payload: ProductCreate, db: AsyncSession = Depends(get_async_db)):
+    if write_coalescer.enabled:
+        row = await asyncio.wrap_future(write_coalescer.enqueue(payload))
+        note_write()
+        return row
+    obj = Product(**payload.model_dump())
+    db.add(obj)
+    await db.commit()
+    await db.refresh(obj)
+    catalog_events.created(obj)
+    return obj
+
+
+@router.get("/", response_model=list[ProductOut])
+async def list_products(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    q: str | None = Query(None, description="Trecho do nome (ILIKE); busca por palavras: /products/search"),
+    category: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    order_by_price: bool = False,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Cursor opaco do header X-Next-Cursor (paginação keyset)"),
+    format: str = FORMAT_QUERY,
+):
+    state = await db.run_sync(catalog_version.current)
+    product_cache.sync(state[0])
+    key, cached, stmt = _listing(q, category, min_price, max_price, order_by_price, limit, offset, cursor, format)
+    if cached is not None:
+        return _cached(cached, request)
+    etag, changed_at = _listing_etag(key, state)
+    headers = validators(etag, changed_at)
+    if is_not_modified(request.headers, etag, changed_at):
+        return not_modified(headers)
+    rows = (await db.execute(stmt)).all()
+    return _render_page(key, rows, order_by_price, limit, format, headers)
+
+
+@router.get("/{product_id}", response_model=ProductOut)
+async def get_product(product_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    if product_cache.enabled:
+        product_cache.sync((await db.run_sync(catalog_version.current))[0])
+    key = product_cache.product_key(product_id)
+    cached = product_cache.get(key)
+    if cached is not None:
+        return _cached(cached, request)
+
+    row = catalog_snapshot.get(product_id)
+    if row is None:
+        row = (await db.execute(_product_stmt(product_id))).first()
+    return _render_product(key, row, request)
+
+
+@router.put("/{product_id}", response_model=ProductOut)
+async def update_product(product_id: int, payload: ProductUpdate, db: AsyncSession = Depends(get_async_db)):
+    obj = await db.get(Product, product_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+
+    before = ProductRow.of(obj)
+    for k, v in payload.model_dump(exclude_unset=True).items():
+        setattr(obj, k, v)
+
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise _conflict()
+    await db.refresh(obj)
+    catalog_events.updated(before, obj)
+    return obj
+
+
+@router.delete("/{product_id}", status_code=204)
+async def delete_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    obj = await db.get(Product, product_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    before = ProductRow.of(obj)
+    await db.delete(obj)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise _conflict()
+    catalog_events.deleted(before)
+    return None
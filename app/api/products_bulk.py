@@ -0,0 +1,112 @@
+# app/api/products_bulk.py
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import get_db, read_session
+from app.services import bulk_io, catalog_events
+
+router = APIRouter(prefix="/products", tags=["products"])
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8", "json": "application/json"}
+ORDER_QUERY = Query("id", pattern="^(id|price|name)$",
+                    description="name: nome sem acento, via ordenação externa (memória limitada)")
+
+
+def _format_from(request: Request, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    ctype = request.headers.get("content-type", "")
+    return "csv" if "csv" in ctype else "ndjson"
+
+
+@router.post("/bulk")
+async def bulk_import(
+    request: Request,
+    format: str | None = Query(None, pattern="^(ndjson|csv)$", description="Padrão: pelo Content-Type"),
+    db: Session = Depends(get_db),
+):
+    """
+    Importa produtos de um upload NDJSON ou CSV (cabeçalho name,category,price)
+    em streaming. Linhas inválidas são reportadas sem abortar as demais.
+    """
+    fmt = _format_from(request, format)
+    report = bulk_io.ImportReport()
+    writer = bulk_io.BulkWriter(db, report)
+    batch: list[tuple[int, dict]] = []
+
+    try:
+        async for line_no, record, error in bulk_io.iter_records(request.stream(), fmt):
+            if error:
+                report.error(line_no, error)
+                continue
+            row, errors = bulk_io.validate(record)
+            if errors:
+                report.error(line_no, errors)
+                continue
+            batch.append((line_no, row))
+            if len(batch) >= settings.BULK_BATCH_SIZE:
+                await run_in_threadpool(writer.write_batch, batch)
+                batch = []
+        await run_in_threadpool(writer.write_batch, batch)
+        await run_in_threadpool(writer.commit)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="O arquivo precisa estar em UTF-8")
+    finally:
+        if writer.created is not None:
+            for row in writer.created:
+                catalog_events.created(row)
+        elif report.inserted:
+            # importação grande: evento por linha custaria mais que reconstruir
+            catalog_events.reloaded()
+
+    return report.as_dict()
+
+
+def _stream_rows(request: Request, fmt: str, headers: dict | None = None, **filters) -> StreamingResponse:
+    session = read_session(request)
+
+    def body():
+        # sessão própria (de preferência numa réplica): precisa viver enquanto a resposta é transmitida
+        with session as db:
+            rows = bulk_io.export_rows(db, **filters)
+            yield from bulk_io.encode_chunks(rows, fmt, settings.EXPORT_CHUNK_ROWS)
+
+    return StreamingResponse(body(), media_type=_MEDIA_TYPES[fmt], headers=headers)
+
+
+@router.get("/export")
+def bulk_export(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|json)$"),
+    category: str | None = None,
+    q: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    order: str = ORDER_QUERY,
+):
+    """Exporta o catálogo (ou o recorte filtrado) em streaming, sem materializar o resultado em memória."""
+    filename = f"products.{format}"
+    return _stream_rows(
+        request, format, {"Content-Disposition": f'attachment; filename="{filename}"'},
+        category=category, q=q, min_price=min_price, max_price=max_price, order=order,
+    )
+
+
+@router.get("/stream")
+def stream_products(
+    request: Request,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    category: str | None = None,
+    q: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    order: str = ORDER_QUERY,
+):
+    """
+    Listagem completa, sem limite de página: mesmo filtro e corpo de
+    ``GET /products`` (``json``) ou NDJSON, transmitidos conforme o banco entrega.
+    """
+    return _stream_rows(request, format, category=category, q=q, min_price=min_price, max_price=max_price, order=order)
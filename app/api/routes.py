@@ -2,7 +2,42 @@
 from fastapi import APIRouter
 from app.api.auth import router as auth_router
 from app.api.products import router as products_router
+from app.api.products_bulk import router as products_bulk_router
+from app.core.config import settings
 
-router = APIRouter()
-router.include_router(auth_router)
-router.include_router(products_router)
+
+def _merge(target: APIRouter, preferred: APIRouter, fallback: APIRouter) -> None:
+    """
+    Inclui as rotas de ``fallback`` trocando pelas de ``preferred`` quando
+    método e caminho coincidem. A ordem de ``fallback`` é mantida, então
+    caminhos fixos continuam antes de ``/{product_id}``.
+    """
+    replacements = {(r.path, m): r for r in preferred.routes for m in getattr(r, "methods", ())}
+    merged = APIRouter()
+    used = set()
+    for r in fallback.routes:
+        sub = next((replacements[(r.path, m)] for m in getattr(r, "methods", ()) if (r.path, m) in replacements), None)
+        merged.routes.append(sub or r)
+        if sub is not None:
+            used.add(id(sub))
+    merged.routes.extend(r for r in preferred.routes if id(r) not in used)
+    target.include_router(merged)
+
+
+def build_router(async_db: bool = False) -> APIRouter:
+    router = APIRouter()
+    # antes dos produtos: /products/export não pode cair em /products/{product_id}
+    router.include_router(products_bulk_router)
+    if async_db:
+        from app.api.auth_async import router as auth_async_router
+        from app.api.products_async import router as products_async_router
+
+        _merge(router, auth_async_router, auth_router)
+        _merge(router, products_async_router, products_router)
+    else:
+        router.include_router(auth_router)
+        router.include_router(products_router)
+    return router
+
+
+router = build_router(settings.DB_ASYNC)
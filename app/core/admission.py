@@ -0,0 +1,282 @@
+# app/core/admission.py
+"""
+Controle de admissão: cada grupo de rotas tem um limite de requisições em
+andamento e uma fila limitada com prazo. Grupo cheio e fila cheia (ou prazo
+vencido na fila) devolvem 503 + ``Retry-After`` na hora, sem ocupar thread
+nem conexão do pool. Assim um pico de login (pbkdf2) não derruba as
+leituras de produto, e rotas fora dos grupos (``/health``, ``/metrics``,
+``/static``) nunca esperam.
+
+Grupos padrão (ver ``ADMISSION_*`` em ``config.py``):
+
+- ``auth``: POST em ``/auth/*`` (login, cadastro);
+- ``bulk``: transferências longas (``/products/stream``, ``/products/export``,
+  ``/products/bulk``), que duram minutos e não podem ocupar as vagas de
+  leitura/escrita das rotas curtas;
+- ``write``: demais métodos de escrita em ``/products`` e ``/auth``;
+- ``read``: GET/HEAD em ``/products`` e ``/auth``.
+
+Também aqui: ``TokenBucketLimiter``, limite de taxa em memória usado nas
+rotas de autenticação por IP e por e-mail (429). Tudo é por processo: cada
+worker do uvicorn tem seus próprios contadores.
+"""
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+# ---------- Grupos de concorrência ----------
+class _Waiter:
+    __slots__ = ("loop", "future", "granted")
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+
+def _wake(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ConcurrencyGroup:
+    """
+    Semáforo com fila FIFO limitada. O estado fica sob um ``threading.Lock``
+    e o acordar usa ``call_soon_threadsafe``, então funciona com mais de um
+    event loop (ex.: vários TestClient no mesmo processo).
+    """
+
+    def __init__(self, name: str, limit: int, queue: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """True quando a requisição pode seguir; False = rejeitar (503)."""
+        with self._lock:
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                self.admitted += 1
+                return True
+            if len(self._waiters) >= self.queue or self.timeout <= 0:
+                self.rejected += 1
+                return False
+            waiter = _Waiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    self.timed_out += 1
+                    return False
+            # a vaga chegou junto com o prazo: fica com ela
+        except BaseException:
+            # cliente desconectou enquanto esperava
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise
+            self.release()
+            raise
+        with self._lock:
+            self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            if self._waiters:
+                # a vaga passa direto para o próximo da fila; active não muda
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            else:
+                self.active -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "queue": self.queue,
+                "active": self.active,
+                "queued": len(self._waiters),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+
+@dataclass(frozen=True)
+class Rule:
+    prefix: str
+    group: str | None  # None = fora do controle de admissão
+    methods: frozenset | None = None  # None = qualquer método
+
+    def matches(self, method: str, path: str) -> bool:
+        if not (path == self.prefix or path.startswith(self.prefix + "/")):
+            return False
+        return self.methods is None or method in self.methods
+
+
+DEFAULT_RULES = (
+    # stream SSE de longa duração: ocuparia uma vaga de leitura por horas
+    Rule("/products/changes", None, methods=READ_METHODS),
+    Rule("/products/stream", "bulk", methods=READ_METHODS),
+    Rule("/products/export", "bulk", methods=READ_METHODS),
+    Rule("/products/bulk", "bulk", methods=frozenset({"POST"})),
+    Rule("/auth", "auth", methods=frozenset({"POST"})),
+    Rule("/auth", "read", methods=READ_METHODS),
+    Rule("/auth", "write"),
+    Rule("/products", "read", methods=READ_METHODS),
+    Rule("/products", "write"),
+)
+
+
+class AdmissionController:
+    def __init__(self, groups: list[ConcurrencyGroup], rules=DEFAULT_RULES, retry_after: int = 1):
+        self.groups = {g.name: g for g in groups}
+        self.rules = [r for r in rules if r.group is None or r.group in self.groups]
+        self.retry_after = retry_after
+
+    def classify(self, method: str, path: str) -> ConcurrencyGroup | None:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return self.groups.get(rule.group)
+        return None
+
+    def stats(self) -> dict:
+        return {name: g.stats() for name, g in self.groups.items()}
+
+    def render(self) -> str:
+        """Métricas no formato Prometheus, anexadas ao ``GET /metrics``."""
+        out = []
+        snapshot = self.stats()
+        for metric, key, kind, help_ in (
+            ("admission_active", "active", "gauge", "Requisições em andamento por grupo."),
+            ("admission_queued", "queued", "gauge", "Requisições esperando vaga por grupo."),
+            ("admission_admitted_total", "admitted", "counter", "Requisições admitidas."),
+            ("admission_rejected_total", "rejected", "counter", "Rejeitadas com fila cheia."),
+            ("admission_timed_out_total", "timed_out", "counter", "Rejeitadas por prazo vencido na fila."),
+        ):
+            out.append(f"# HELP {metric} {help_}")
+            out.append(f"# TYPE {metric} {kind}")
+            for name, s in sorted(snapshot.items()):
+                out.append(f'{metric}{{group="{name}"}} {s[key]}')
+        return "\n".join(out) + "\n"
+
+
+def from_settings() -> AdmissionController:
+    timeout = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+    return AdmissionController(
+        [
+            ConcurrencyGroup("auth", settings.ADMISSION_AUTH_CONCURRENCY, settings.ADMISSION_AUTH_QUEUE, timeout),
+            ConcurrencyGroup("bulk", settings.ADMISSION_BULK_CONCURRENCY, settings.ADMISSION_BULK_QUEUE, timeout),
+            ConcurrencyGroup("write", settings.ADMISSION_WRITE_CONCURRENCY, settings.ADMISSION_WRITE_QUEUE, timeout),
+            ConcurrencyGroup("read", settings.ADMISSION_READ_CONCURRENCY, settings.ADMISSION_READ_QUEUE, timeout),
+        ],
+        retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
+
+
+# ---------- Middleware ----------
+async def _reject(send, group: str, retry_after: int) -> None:
+    body = json.dumps({"detail": "Servidor ocupado, tente novamente"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+            (b"x-admission-group", group.encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """ASGI puro; a vaga é liberada quando a resposta termina (inclusive streaming)."""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        group = self.controller.classify(scope["method"], scope["path"])
+        if group is None:
+            return await self.app(scope, receive, send)
+        if not await group.acquire():
+            return await _reject(send, group.name, self.controller.retry_after)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            group.release()
+
+
+# ---------- Limite de taxa ----------
+class TokenBucketLimiter:
+    """
+    Um balde por chave: ``burst`` fichas, repostas a ``rate`` por segundo.
+    Baldes cheios equivalem a chave ausente, então as chaves mais antigas
+    são descartadas quando passa de ``max_keys``.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.enabled = rate > 0
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, now: float | None = None) -> float:
+        """Consome uma ficha; devolve 0 se permitido ou os segundos até a próxima."""
+        if not self.enabled:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            if not wait:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def retry_after(self, *keys: str) -> int:
+        """Consome uma ficha de cada chave; devolve 0 ou o Retry-After (s) da mais restrita."""
+        wait = max((self.hit(k) for k in keys), default=0.0)
+        return math.ceil(wait) if wait else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+auth_limiter = TokenBucketLimiter(settings.AUTH_RATE_PER_MINUTE / 60, settings.AUTH_RATE_BURST)
@@ -0,0 +1,146 @@
+# app/core/assets.py
+"""
+Arquivos estáticos com fingerprint e pré-compressão.
+
+Build (rode a cada deploy que mude ``app/static``):
+
+    python -m app.core.assets
+
+gera ``app/static_dist/`` com:
+
+- ``app.<hash>.js``, ``styles.<hash>.css``: conteúdo imutável, servidos com
+  ``Cache-Control: immutable`` por um ano;
+- HTMLs com as referências ``/static/...`` reescritas para os nomes com hash
+  (esses mantêm o nome e revalidam a cada acesso);
+- variantes ``.gz`` e ``.br`` (brotli só se o pacote estiver instalado);
+- ``manifest.json``: nome original -> nome com hash.
+
+``PrecompressedStaticFiles`` escolhe a variante pelo ``Accept-Encoding``
+sem comprimir nada por requisição. Sem build, o app serve ``app/static``.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import re
+import shutil
+import stat
+from pathlib import Path
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli é opcional
+    brotli = None
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "static"
+DIST_DIR = SOURCE_DIR.parent / "static_dist"
+MANIFEST = "manifest.json"
+
+FINGERPRINTED = (".js", ".css")
+COMPRESSIBLE = (".js", ".css", ".html", ".svg", ".json", ".txt")
+MIN_COMPRESS_BYTES = 256
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{10}\.[a-z0-9]+$")
+
+
+# ---------- Build ----------
+def _fingerprint(path: Path, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def _compress(target: Path, data: bytes) -> None:
+    if target.suffix not in COMPRESSIBLE or len(data) < MIN_COMPRESS_BYTES:
+        return
+    # mtime=0: build reprodutível (mesmo conteúdo, mesmo .gz)
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        target.with_name(target.name + ".gz").write_bytes(gz)
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            target.with_name(target.name + ".br").write_bytes(br)
+
+
+def build(src: Path = SOURCE_DIR, out: Path = DIST_DIR, log=print) -> dict[str, str]:
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    manifest: dict[str, str] = {}
+    files = sorted(p for p in src.rglob("*") if p.is_file())
+    for path in files:
+        if path.suffix in FINGERPRINTED:
+            rel = path.relative_to(src)
+            manifest[rel.as_posix()] = rel.with_name(_fingerprint(path, path.read_bytes())).as_posix()
+
+    refs = re.compile("/static/(" + "|".join(re.escape(k) for k in manifest) + r")\b") if manifest else None
+    for path in files:
+        rel = path.relative_to(src).as_posix()
+        data = path.read_bytes()
+        if path.suffix == ".html" and refs is not None:
+            data = refs.sub(lambda m: "/static/" + manifest[m.group(1)], data.decode()).encode()
+        target = out / manifest.get(rel, rel)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        _compress(target, data)
+        log(f"{rel} -> {target.relative_to(out).as_posix()}")
+
+    (out / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    if brotli is None:
+        log("aviso: pacote brotli ausente, só variantes .gz geradas")
+    return manifest
+
+
+def static_root() -> Path:
+    """Diretório a servir em /static: o build, se existir, senão os fontes."""
+    return DIST_DIR if (DIST_DIR / MANIFEST).exists() else SOURCE_DIR
+
+
+# ---------- Servidor ----------
+def _accepted(headers: Headers) -> set[str]:
+    accepted = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles que serve ``arquivo.br``/``arquivo.gz`` quando o cliente aceita."""
+
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+    async def get_response(self, path: str, scope):
+        response = None
+        if scope["method"] in ("GET", "HEAD"):
+            accepted = _accepted(Headers(scope=scope))
+            for encoding, suffix in self.ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+                if stat_result and stat.S_ISREG(stat_result.st_mode):
+                    response = self.file_response(full_path, stat_result, scope)
+                    if response.status_code != 304:
+                        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                        if media_type.startswith("text/"):
+                            media_type += "; charset=utf-8"
+                        response.headers["content-type"] = media_type
+                    response.headers["content-encoding"] = encoding
+                    break
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers["vary"] = "Accept-Encoding"
+        response.headers["cache-control"] = IMMUTABLE if _HASHED_NAME.search(path) else REVALIDATE
+        return response
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,84 @@
+# app/core/auth_cache.py
+"""
+Cache de autenticação para leituras autenticadas sem ida ao banco.
+
+- token -> id do usuário: o JWT só é decodificado uma vez por TTL (e
+  nunca além do ``exp`` do próprio token);
+- id -> ``Principal`` (id, nome, e-mail): invalidado quando o usuário
+  muda, via eventos do mapper ``User``.
+
+TTL curto: em vários workers uma alteração só é vista pelos outros
+processos quando a entrada expira.
+"""
+import time
+from typing import NamedTuple
+
+from sqlalchemy import event
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+from app.core.security import decode_token
+from app.models.user import User
+
+
+class Principal(NamedTuple):
+    id: int
+    full_name: str
+    email: str
+
+    @classmethod
+    def of(cls, user) -> "Principal":
+        return cls(user.id, user.full_name, user.email)
+
+
+_tokens = LRUTTLCache(max_entries=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+_principals = LRUTTLCache(max_entries=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+enabled = settings.AUTH_CACHE_ENABLED
+
+
+def token_subject(token: str) -> int | None:
+    """Id do usuário dono do token, ou None se o token for inválido/expirado."""
+    if enabled:
+        hit = _tokens.get(token)
+        if hit is not None:
+            uid, exp = hit
+            if exp > time.time():
+                return uid
+            _tokens.delete(token)
+            return None
+
+    payload = decode_token(token)
+    sub = payload.get("sub") if payload else None
+    try:
+        uid = int(sub)
+    except (TypeError, ValueError):
+        return None
+    if enabled:
+        exp = float(payload.get("exp", 0))
+        _tokens.set(token, (uid, exp), ttl=max(0.0, min(settings.AUTH_CACHE_TTL_SECONDS, exp - time.time())))
+    return uid
+
+
+def cached_principal(uid: int) -> Principal | None:
+    return _principals.get(uid) if enabled else None
+
+
+def remember(user) -> Principal:
+    principal = Principal.of(user)
+    if enabled:
+        _principals.set(principal.id, principal)
+    return principal
+
+
+def invalidate_user(uid: int) -> None:
+    _principals.delete(uid)
+
+
+def stats() -> dict:
+    return {"enabled": enabled, "tokens": _tokens.stats(), "principals": _principals.stats()}
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_change(mapper, connection, target):
+    invalidate_user(target.id)
@@ -2,29 +2,31 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
-from app.core.security import decode_token
-from app.db.session import get_db
+from app.core import auth_cache
+from app.core.auth_cache import Principal
+from app.db.session import get_read_db
 from app.models.user import User
 
 security = HTTPBearer(auto_error=True)
 
 def get_current_user(
     creds: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: Session = Depends(get_read_db)
+) -> Principal:
     """
-    Lê 'Authorization: Bearer <token>', valida o JWT e retorna o usuário.
+    Lê 'Authorization: Bearer <token>', valida o JWT e retorna o usuário
+    autenticado (id, full_name, email). Token e usuário vêm do cache de
+    autenticação quando possível, sem consulta ao banco.
     """
-    try:
-        payload = decode_token(creds.credentials)
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
-
-    user_id = payload.get("sub")
+    user_id = auth_cache.token_subject(creds.credentials)
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
 
-    user = db.get(User, int(user_id))
+    principal = auth_cache.cached_principal(user_id)
+    if principal:
+        return principal
+
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuário não encontrado")
-    return user
+    return auth_cache.remember(user)
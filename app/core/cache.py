@@ -0,0 +1,91 @@
+# app/core/cache.py
+"""
+Backends de cache plugáveis.
+
+``CacheBackend`` é o contrato mínimo; ``LRUTTLCache`` é a implementação em
+processo, limitada por número de entradas e por bytes, com expiração por
+TTL e contadores de hit/miss/eviction.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Protocol
+
+
+class CacheBackend(Protocol):
+    def get(self, key: Hashable) -> Any | None: ...
+    def set(self, key: Hashable, value: Any, size: int = 1, ttl: float | None = None) -> None: ...
+    def delete(self, key: Hashable) -> None: ...
+    def clear(self) -> None: ...
+    def stats(self) -> dict: ...
+
+
+class LRUTTLCache:
+    def __init__(self, max_entries: int = 10_000, max_bytes: int | None = None, ttl: float | None = 60.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float | None, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, size: int = 1, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # maior que o cache inteiro: não vale guardar
+            self._data[key] = (expires_at, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
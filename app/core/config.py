@@ -6,6 +6,99 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change_me_please_32_chars_min"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # Aplica migrações pendentes no startup (prático em dev; em produção rode
+    # `python -m app.db.migrations upgrade` antes do deploy)
+    DB_AUTO_MIGRATE: bool = False
+
+    # Métricas (/metrics) e profiler por amostragem de requisições lentas
+    METRICS_ENABLED: bool = True
+    METRICS_PROFILE_SLOW_MS: float = 0.0  # 0 desliga; ex.: 500 guarda perfis acima de 500 ms
+    METRICS_PROFILE_INTERVAL_MS: float = 5.0
+
+    # Controle de admissão: requisições simultâneas e fila por grupo de rotas;
+    # acima disso, 503 + Retry-After imediato (ver app/core/admission.py)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_AUTH_CONCURRENCY: int = 4  # login/cadastro (pbkdf2); perto de HASH_WORKERS
+    ADMISSION_AUTH_QUEUE: int = 16
+    ADMISSION_WRITE_CONCURRENCY: int = 16
+    ADMISSION_WRITE_QUEUE: int = 64
+    ADMISSION_READ_CONCURRENCY: int = 64
+    ADMISSION_READ_QUEUE: int = 256
+    ADMISSION_BULK_CONCURRENCY: int = 4  # stream/export/import: uma conexão cada, por minutos
+    ADMISSION_BULK_QUEUE: int = 0
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0  # espera máxima na fila
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Limite de taxa em login/cadastro, por IP e por e-mail (0 desliga)
+    AUTH_RATE_PER_MINUTE: float = 30.0
+    AUTH_RATE_BURST: int = 10
+
+    # Hash de senha num pool dedicado: "thread", "process" ou "inline"
+    HASH_EXECUTOR: str = "thread"
+    HASH_WORKERS: int = 4
+    HASH_MAX_PENDING: int = 64  # em execução + na fila; acima disso, 503
+
+    # Cache de tokens decodificados e usuários autenticados
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Pool de conexões (ignorado no SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # segundos; abaixo do wait_timeout do MySQL
+    DB_POOL_TIMEOUT: float = 30.0
+
+    # Réplicas de leitura: URLs separadas por vírgula (vazio = tudo no primário)
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_CHECK_SECONDS: float = 5.0
+    # após uma escrita, o mesmo cliente lê do primário por este tempo (cookie)
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Rotas de produtos/auth com AsyncSession (aiomysql/aiosqlite)
+    DB_ASYNC: bool = False
+    ASYNC_DB_URL: str | None = None  # padrão: DB_URL com o driver assíncrono
+
+    # Cache de respostas de produto (em processo)
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 10_000
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_TTL_SECONDS: float = 60.0
+
+    # Importação/exportação em massa
+    BULK_BATCH_SIZE: int = 1_000  # linhas por executemany
+    BULK_TX_ROWS: int = 10_000  # linhas por transação
+    BULK_MAX_ERRORS: int = 1_000  # erros detalhados na resposta
+    EXPORT_CHUNK_ROWS: int = 1_000
+    EXPORT_SORT_RUN_ROWS: int = 100_000  # linhas por corrida da ordenação externa (ordem por nome)
+
+    # Feed SSE de alterações (GET /products/changes)
+    FEED_BUFFER_EVENTS: int = 1_000  # replay para Last-Event-ID
+    FEED_SUBSCRIBER_QUEUE: int = 256  # fila por cliente; estourou, recebe "reset"
+    FEED_MAX_SUBSCRIBERS: int = 1_000
+    FEED_HEARTBEAT_SECONDS: float = 15.0
+    FEED_MAX_STREAM_SECONDS: float = 300.0  # depois disso o cliente reconecta
+
+    # PATCH /products/batch
+    BATCH_CHUNK_ROWS: int = 500  # ids por UPDATE ... CASE
+    BATCH_EVENTS_MAX: int = 1_000  # acima disto, eventos por linha viram um "reload"
+
+    # Group commit dos POST /products (app/services/write_coalescer.py)
+    WRITE_COALESCE_ENABLED: bool = False
+    WRITE_COALESCE_MAX_BATCH: int = 64  # linhas por INSERT/commit
+    WRITE_COALESCE_LINGER_MS: float = 2.0  # espera por mais linhas depois da primeira
+
+    # Índices em memória: checagem da versão do catálogo (escritas de outros workers)
+    INDEX_REFRESH_SECONDS: float = 2.0  # 0 = só eventos locais
+
+    # Snapshot do catálogo mapeado em memória (app/services/catalog_snapshot.py)
+    SNAPSHOT_PATH: str = ""  # vazio = desligado
+    SNAPSHOT_CHECK_SECONDS: float = 1.0  # intervalo entre checagens de arquivo novo
+
+    @property
+    def replica_urls(self) -> list[str]:
+        return [u.strip() for u in self.DB_REPLICA_URLS.split(",") if u.strip()]
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,57 @@
+# app/core/http_cache.py
+"""
+Requisições condicionais (RFC 9110/9111): ETag, Last-Modified e 304.
+
+As rotas calculam o validador sem montar o corpo (versão da linha ou do
+catálogo) e só serializam quando o cliente não tem a representação atual.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Mapping
+
+from fastapi import Response
+
+# a resposta pode ficar no cache do navegador, mas sempre revalida
+REVALIDATE = "no-cache"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match usa comparação fraca: W/"x" casa com "x"
+    value = if_none_match.strip()
+    if value == "*":
+        return True
+    tags = {t.strip().removeprefix("W/") for t in value.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def http_date(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: datetime | None = None) -> bool:
+    """If-None-Match tem precedência; If-Modified-Since só vale sem ele."""
+    inm = headers.get("if-none-match")
+    if inm is not None:
+        return etag_matches(inm, etag)
+    ims = headers.get("if-modified-since")
+    if ims and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+        lm = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        return lm.replace(microsecond=0) <= since
+    return False
+
+
+def validators(etag: str, last_modified: datetime | None = None, **extra: str) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE, **extra}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
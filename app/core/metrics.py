@@ -0,0 +1,328 @@
+# app/core/metrics.py
+"""
+Instrumentação em processo, exposta em texto Prometheus (``GET /metrics``).
+
+- ``MetricsMiddleware`` (ASGI puro): latência, tamanho da resposta e status
+  por rota (template, não o path cru), além de requisições em andamento;
+- eventos ``before/after_cursor_execute`` do SQLAlchemy atribuem quantidade
+  de queries e tempo de banco à requisição corrente via ``ContextVar``;
+- ``query_budget``: falha quando um bloco executa mais queries que o limite
+  (base da fixture pytest em ``app/testing.py``);
+- profiler por amostragem opcional (``METRICS_PROFILE_SLOW_MS``) que guarda
+  as pilhas mais frequentes das requisições lentas em ``GET /metrics/slow``.
+
+Cada worker do uvicorn tem seus próprios contadores.
+"""
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+UNMATCHED = "<unmatched>"
+
+
+# ---------- Primitivas ----------
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # último = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        acc = 0
+        for le, n in zip((*self.buckets, "+Inf"), self.counts):
+            acc += n
+            yield le, acc
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    samples: Counter = field(default_factory=Counter)
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_request() -> RequestStats | None:
+    return _current.get()
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.sizes: dict[tuple[str, str], Histogram] = {}
+        self.route_queries: dict[tuple[str, str], Histogram] = {}
+        self.route_db_seconds: dict[tuple[str, str], float] = {}
+        self.responses: Counter = Counter()  # (method, route, status)
+        self.queries_total = 0
+        self.db_seconds_total = 0.0
+
+    def _hist(self, table: dict, key, buckets) -> Histogram:
+        h = table.get(key)
+        if h is None:
+            h = table[key] = Histogram(buckets)
+        return h
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float, size: int, stats: RequestStats) -> None:
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            self._hist(self.latency, key, LATENCY_BUCKETS).observe(seconds)
+            self._hist(self.sizes, key, SIZE_BUCKETS).observe(size)
+            self._hist(self.route_queries, key, QUERY_BUCKETS).observe(stats.queries)
+            self.route_db_seconds[key] = self.route_db_seconds.get(key, 0.0) + stats.db_seconds
+            self.responses[(method, route, status)] += 1
+
+    def query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries_total += 1
+            self.db_seconds_total += seconds
+
+    # ---------- Exposição ----------
+    def render(self) -> str:
+        out: list[str] = []
+
+        def hist(name: str, help_: str, table: dict):
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} histogram")
+            for (method, route), h in sorted(table.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                for le, n in h.cumulative():
+                    out.append(f'{name}_bucket{{{labels},le="{le}"}} {n}')
+                out.append(f"{name}_sum{{{labels}}} {h.sum:.6f}")
+                out.append(f"{name}_count{{{labels}}} {h.count}")
+
+        with self._lock:
+            out.append("# HELP http_requests_in_flight Requisições em andamento.")
+            out.append("# TYPE http_requests_in_flight gauge")
+            out.append(f"http_requests_in_flight {self.in_flight}")
+            out.append("# HELP http_requests_total Respostas por rota e status.")
+            out.append("# TYPE http_requests_total counter")
+            for (method, route, status), n in sorted(self.responses.items()):
+                out.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {n}')
+            hist("http_request_duration_seconds", "Latência por rota.", self.latency)
+            hist("http_response_size_bytes", "Tamanho do corpo da resposta por rota.", self.sizes)
+            hist("db_queries_per_request", "Queries SQL por requisição.", self.route_queries)
+            out.append("# HELP db_request_seconds_total Tempo de banco acumulado por rota.")
+            out.append("# TYPE db_request_seconds_total counter")
+            for (method, route), s in sorted(self.route_db_seconds.items()):
+                out.append(f'db_request_seconds_total{{method="{method}",route="{_escape(route)}"}} {s:.6f}')
+            out.append("# HELP db_queries_total Queries SQL executadas pelo processo (inclui fora de requisições).")
+            out.append("# TYPE db_queries_total counter")
+            out.append(f"db_queries_total {self.queries_total}")
+            out.append("# HELP db_query_seconds_total Tempo total em queries SQL.")
+            out.append("# TYPE db_query_seconds_total counter")
+            out.append(f"db_query_seconds_total {self.db_seconds_total:.6f}")
+        return "\n".join(out) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+registry = Registry()
+
+
+# ---------- SQLAlchemy ----------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+    registry.query(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def instrument_engine(engine) -> None:
+    """Registra os contadores de query num ``Engine`` (para AsyncEngine, use ``.sync_engine``)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, target=Engine):
+    """
+    Conta as queries executadas dentro do bloco, em qualquer thread, e falha
+    se passarem de ``max_queries``. Por padrão escuta todos os engines.
+    """
+    statements: list[str] = []
+    lock = threading.Lock()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        with lock:
+            statements.append(statement)
+
+    event.listen(target, "after_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(target, "after_cursor_execute", record)
+    if len(statements) > max_queries:
+        listing = "\n".join(f"  {i + 1}. {' '.join(s.split())[:200]}" for i, s in enumerate(statements))
+        raise QueryBudgetExceeded(f"{len(statements)} queries (limite {max_queries}):\n{listing}")
+
+
+# ---------- Profiler de requisições lentas ----------
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SlowRequestProfiler:
+    """
+    Enquanto há requisições em andamento, uma thread amostra as pilhas de todas
+    as threads a cada ``interval`` segundos (só frames do pacote ``app``).
+    Cada amostra é atribuída a todas as requisições abertas, então com muita
+    concorrência o perfil é aproximado. Requisições acima de ``threshold``
+    guardam as pilhas mais frequentes num buffer circular.
+    """
+
+    def __init__(self, threshold_ms: float, interval_ms: float = 5.0, keep: int = 50):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.slow: deque = deque(maxlen=keep)
+        self._active: set[int] = set()
+        self._open: dict[int, RequestStats] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def begin(self, stats: RequestStats) -> None:
+        with self._lock:
+            self._open[id(stats)] = stats
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def end(self, stats: RequestStats, method: str, route: str, seconds: float) -> None:
+        with self._lock:
+            self._open.pop(id(stats), None)
+        if seconds >= self.threshold:
+            self.slow.append({
+                "method": method,
+                "route": route,
+                "ms": round(seconds * 1000, 2),
+                "queries": stats.queries,
+                "db_ms": round(stats.db_seconds * 1000, 2),
+                "samples": sum(stats.samples.values()),
+                "stacks": [{"stack": s, "samples": n} for s, n in stats.samples.most_common(15)],
+            })
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                open_ = list(self._open.values())
+            if not open_:
+                self._wake.clear()
+                self._wake.wait()
+                continue
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = _collapse(frame)
+                if stack:
+                    stacks.append(stack)
+            for stats in open_:
+                stats.samples.update(stacks)
+            time.sleep(self.interval)
+
+
+def _collapse(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(_APP_ROOT):
+            rel = os.path.relpath(code.co_filename, os.path.dirname(_APP_ROOT))
+            parts.append(f"{rel}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+# ---------- Middleware ----------
+class MetricsMiddleware:
+    def __init__(self, app, registry: Registry = registry, profiler: SlowRequestProfiler | None = None):
+        self.app = app
+        self.registry = registry
+        self.profiler = profiler if profiler is not None and profiler.enabled else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+        size = 0
+        t0 = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # tempo até o início da resposta; em streaming o banco ainda pode rodar depois
+                elapsed = (time.perf_counter() - t0) * 1000
+                timing = f"app;dur={elapsed:.1f}, db;dur={stats.db_seconds * 1000:.1f};desc=\"{stats.queries} queries\""
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.registry.started()
+        if self.profiler:
+            self.profiler.begin(stats)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            seconds = time.perf_counter() - t0
+            route = getattr(scope.get("route"), "path", None)
+            if route is None:
+                # Mount (ex.: /static) não define "route", mas deixa o prefixo em root_path
+                mounted = scope.get("root_path", "")
+                route = mounted if mounted != scope.get("app_root_path", "") else UNMATCHED
+            self.registry.finished(scope["method"], route, status, seconds, size, stats)
+            if self.profiler:
+                self.profiler.end(stats, scope["method"], route, seconds)
+            _current.reset(token)
@@ -1,10 +1,15 @@
 # app/core/security.py
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Dict
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
+from app.core.config import settings
+
 # ⚠️ trocamos de bcrypt -> pbkdf2_sha256 para evitar erro de backend
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
@@ -32,3 +37,62 @@ def decode_token(token: str) -> Dict[str, Any] | None:
         return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+
+
+# ---------- Hash fora do event loop ----------
+class HasherBusy(Exception):
+    """Fila do pool de hash cheia: o chamador deve responder 503."""
+
+
+class PasswordHasher:
+    """
+    Executa hash/verify (pbkdf2, CPU puro) num pool dedicado e limitado.
+    ``max_pending`` conta tarefas em execução + na fila; acima disso a
+    chamada falha na hora (``HasherBusy``) em vez de empilhar requisições.
+    ``mode="inline"`` roda no próprio chamador (útil para comparação).
+    """
+
+    def __init__(self, mode: str = "thread", workers: int = 4, max_pending: int = 64):
+        self.mode = mode
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.mode == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hasher")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.mode == "inline":
+            return fn(*args)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HasherBusy()
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, plain: str) -> str:
+        return await self._run(hash_password, plain)
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run(verify_password, plain, hashed)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hasher = PasswordHasher(settings.HASH_EXECUTOR, settings.HASH_WORKERS, settings.HASH_MAX_PENDING)
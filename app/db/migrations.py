@@ -0,0 +1,240 @@
+# app/db/migrations.py
+"""
+Migrações versionadas do schema, executadas fora do processo do servidor:
+
+    python -m app.db.migrations upgrade   # aplica as pendentes
+    python -m app.db.migrations current   # versão atual
+    python -m app.db.migrations explain   # confere via EXPLAIN se as consultas quentes usam índice
+
+A versão aplicada fica na tabela ``schema_version``. Cada migração é
+idempotente, para aceitar bancos criados pelo antigo ``create_all``.
+"""
+import sys
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from sqlalchemy import (
+    Column, DateTime, Float, Integer, MetaData, String, Table, inspect, select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.session import Base, engine as default_engine
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+_meta = MetaData()
+schema_version = Table(
+    "schema_version", _meta,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+# ---------- Migrações ----------
+def _v1_initial(conn: Connection) -> None:
+    # schema de partida, igual ao que o create_all gerava
+    md = MetaData()
+    Table(
+        "users", md,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("full_name", String(120)),
+        Column("email", String(120), unique=True, index=True),
+        Column("password_hash", String(255)),
+    )
+    Table(
+        "products", md,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("name", String(120), index=True),
+        Column("category", String(60), index=True),
+        Column("price", Float, nullable=False),
+    )
+    md.create_all(conn)
+
+
+def _v2_product_indexes(conn: Connection) -> None:
+    import app.models.product  # noqa: F401  registra o modelo
+
+    table = Base.metadata.tables["products"]
+    for idx in table.indexes:
+        if idx.name in ("ix_products_price", "ix_products_category_price"):
+            idx.create(conn, checkfirst=True)
+
+
+def _v3_product_versions(conn: Connection) -> None:
+    cols = {c["name"] for c in inspect(conn).get_columns("products")}
+    if "version" not in cols:
+        conn.execute(text("ALTER TABLE products ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+    if "updated_at" not in cols:
+        conn.execute(text("ALTER TABLE products ADD COLUMN updated_at DATETIME NULL"))
+    now = datetime.utcnow().replace(microsecond=0)
+    conn.execute(text("UPDATE products SET updated_at = :now WHERE updated_at IS NULL"), {"now": now})
+
+    md = MetaData()
+    state = Table(
+        "catalog_state", md,
+        Column("id", Integer, primary_key=True),
+        Column("version", Integer, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+    )
+    md.create_all(conn)
+    if conn.execute(select(state.c.id)).first() is None:
+        conn.execute(state.insert().values(id=1, version=1, updated_at=now))
+
+
+def _v4_price_double(conn: Connection) -> None:
+    # FLOAT do MySQL tem 4 bytes: 19.99 volta como 19.9899997711 e a comparação
+    # do cursor keyset com o float do Python (8 bytes) erra na fronteira da página.
+    # No SQLite REAL já tem 8 bytes.
+    if conn.dialect.name == "mysql":
+        # passando por texto: FLOAT -> "19.99" -> DOUBLE 19.99; direto para DOUBLE
+        # ficaria o valor binário da precisão simples (19.989999771118164)
+        conn.execute(text("ALTER TABLE products MODIFY price VARCHAR(32) NOT NULL"))
+        conn.execute(text("ALTER TABLE products MODIFY price DOUBLE NOT NULL"))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text("ALTER TABLE products ALTER COLUMN price TYPE DOUBLE PRECISION USING price::text::double precision"))
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "tabelas iniciais (users, products)", _v1_initial),
+    Migration(2, "índices price e (category, price) em products", _v2_product_indexes),
+    Migration(3, "versão/updated_at em products e versão do catálogo", _v3_product_versions),
+    Migration(4, "price em precisão dupla (DOUBLE)", _v4_price_double),
+]
+
+
+# ---------- Execução ----------
+def current_version(conn: Connection) -> int:
+    if not inspect(conn).has_table("schema_version"):
+        return 0
+    return conn.execute(select(schema_version.c.version).order_by(schema_version.c.version.desc())).scalar() or 0
+
+
+def pending(engine: Engine = default_engine) -> list[Migration]:
+    with engine.connect() as conn:
+        version = current_version(conn)
+    return [m for m in MIGRATIONS if m.version > version]
+
+
+def upgrade(engine: Engine = default_engine, log=print) -> int:
+    """Aplica as migrações pendentes, uma transação por versão; retorna a versão final."""
+    with engine.begin() as conn:
+        _meta.create_all(conn)
+        version = current_version(conn)
+    for m in MIGRATIONS:
+        if m.version <= version:
+            continue
+        with engine.begin() as conn:
+            m.apply(conn)
+            conn.execute(schema_version.insert().values(
+                version=m.version, description=m.description, applied_at=datetime.utcnow(),
+            ))
+        log(f"aplicada {m.version:03d}: {m.description}")
+        version = m.version
+    return version
+
+
+# ---------- Verificação de planos ----------
+def compile_sql(conn: Connection, stmt) -> str:
+    """SQL do dialeto da conexão com os valores inline (listas IN expandidas)."""
+    if isinstance(stmt, str):
+        return stmt
+    return str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def explain(conn: Connection, stmt) -> list[str]:
+    """Plano da consulta como linhas de texto (MySQL ``EXPLAIN`` / SQLite ``EXPLAIN QUERY PLAN``)."""
+    sql = compile_sql(conn, stmt)
+    if conn.dialect.name == "sqlite":
+        return [r[-1] for r in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+    rows = conn.exec_driver_sql("EXPLAIN " + sql).mappings()
+    return [f"table={r['table']} type={r['type']} key={r['key']} extra={r.get('Extra')}" for r in rows]
+
+
+def uses_index(plan: list[str], bounded_walk: bool = False) -> bool:
+    """
+    Nem varredura completa nem ordenação fora do índice. Percorrer a tabela
+    ou um índice inteiro em ordem (SQLite ``SCAN``, MySQL ``type=index``) só
+    passa com ``bounded_walk``: consulta sem WHERE e com LIMIT, em que cada
+    linha lida é devolvida ou pulada pelo offset e o percurso para no LIMIT.
+    """
+    for line in plan:
+        if line.startswith("SCAN ") and not bounded_walk:  # SQLite: percorre tudo
+            return False
+        if "type=ALL" in line or "key=None" in line:  # MySQL: full table scan
+            return False
+        if "type=index " in line and not bounded_walk:  # MySQL: índice inteiro
+            return False
+        if "USE TEMP B-TREE" in line or "filesort" in line:  # ordenação fora do índice
+            return False
+    return True
+
+
+def walk_stops_at_limit(stmt) -> bool:
+    return stmt.whereclause is None and stmt._limit_clause is not None
+
+
+def plan_ok(conn: Connection, stmt) -> tuple[bool, list[str]]:
+    plan = explain(conn, stmt)
+    return uses_index(plan, walk_stops_at_limit(stmt)), plan
+
+
+def hot_queries() -> dict:
+    """Consultas quentes montadas pelos mesmos builders das rotas."""
+    from app.models.product import Product
+    from app.services.pagination import Cursor, encode_cursor, filtered_select, paginate
+    from app.services.products_service import top_k_select
+    from app.services.serialization import PRODUCT_COLUMNS
+
+    def page(by_price: bool, offset: int = 0, cursor: Cursor | None = None, **filters):
+        stmt = filtered_select(columns=PRODUCT_COLUMNS, **filters)
+        return paginate(stmt, by_price, 50, offset, encode_cursor(cursor) if cursor else None)
+
+    return {
+        "listagem por id (keyset)": page(False, cursor=Cursor(False, 1000)),
+        "listagem por preço (keyset)": page(True, cursor=Cursor(True, 1, 10.0)),
+        "listagem por id (offset)": page(False, offset=1000),
+        "listagem por preço (offset)": page(True, offset=1000),
+        "listagem por categoria ordenada por preço": page(True, category="periferico"),
+        "faixa de preço": page(True, min_price=10.0, max_price=50.0),
+        "top-k": top_k_select(10),
+        "top-k por categoria": top_k_select(10, "periferico"),
+        "top-k mais baratos por categoria": top_k_select(10, "periferico", largest=False),
+        "produto por id": filtered_select(columns=PRODUCT_COLUMNS).where(Product.id == 1),
+    }
+
+
+def check_hot_queries(engine: Engine = default_engine) -> list[tuple[str, bool, list[str]]]:
+    with engine.connect() as conn:
+        return [(name, *plan_ok(conn, stmt)) for name, stmt in hot_queries().items()]
+
+
+def main(argv: list[str]) -> int:
+    cmd = argv[0] if argv else "upgrade"
+    if cmd == "upgrade":
+        version = upgrade()
+        print(f"schema na versão {version}")
+    elif cmd == "current":
+        with default_engine.connect() as conn:
+            print(current_version(conn))
+    elif cmd == "explain":
+        ok = True
+        for name, indexed, plan in check_hot_queries():
+            ok &= indexed
+            print(f"[{'ok' if indexed else 'SEM ÍNDICE'}] {name}")
+            for line in plan:
+                print(f"    {line}")
+        return 0 if ok else 1
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,167 @@
+# app/db/replicas.py
+"""
+Roteamento de leituras para réplicas.
+
+- ``ReplicaRouter``: round-robin entre as réplicas saudáveis; uma thread
+  verifica cada uma com ``SELECT 1`` a cada ``check_interval``. Erros de
+  conexão tiram a réplica de rotação na hora, e ela só volta quando uma
+  verificação passar. Sem réplica saudável, a leitura vai para o primário;
+- read-your-writes: uma requisição que escreve no primário devolve o cookie
+  ``db_primary_until``; até esse instante as leituras do mesmo cliente
+  continuam no primário, então ele vê a própria escrita mesmo com atraso de
+  replicação.
+
+O roteador só escolhe *qual* réplica (índice); ``session.py`` mapeia o
+índice para o engine síncrono ou assíncrono correspondente.
+"""
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event, text
+
+log = logging.getLogger(__name__)
+
+STICKY_COOKIE = "db_primary_until"
+
+
+class ReplicaRouter:
+    def __init__(self, replicas: list, check_interval: float = 5.0):
+        self.replicas = replicas  # engines síncronos, usados nas verificações
+        self.check_interval = check_interval
+        self._down = [False] * len(replicas)  # só a verificação periódica traz de volta
+        self._rr = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.fallbacks = 0
+        for i, eng in enumerate(replicas):
+            event.listen(eng, "handle_error", self._on_error(i))
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def _on_error(self, i: int):
+        def handle_error(ctx):
+            # conexão caiu ou nem chegou a abrir (connection None = falha no connect)
+            if ctx.is_disconnect or ctx.connection is None:
+                self.mark_down(i)
+        return handle_error
+
+    def mark_down(self, i: int) -> None:
+        with self._lock:
+            if not self._down[i]:
+                log.warning("réplica %d fora de rotação", i)
+            self._down[i] = True
+
+    def healthy(self) -> list[int]:
+        return [i for i, down in enumerate(self._down) if not down]
+
+    def pick(self) -> int | None:
+        """Índice da próxima réplica saudável, ou None (use o primário)."""
+        if not self.replicas:
+            return None
+        self._ensure_checker()
+        n = len(self.replicas)
+        start = next(self._rr)
+        for k in range(n):
+            i = (start + k) % n
+            if not self._down[i]:
+                return i
+        self.fallbacks += 1
+        return None
+
+    # ---------- Verificação periódica ----------
+    def check(self) -> None:
+        for i, eng in enumerate(self.replicas):
+            try:
+                with eng.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except Exception as exc:
+                log.debug("réplica %d indisponível: %s", i, exc)
+                self.mark_down(i)
+            else:
+                with self._lock:
+                    if self._down[i]:
+                        log.info("réplica %d de volta à rotação", i)
+                    self._down[i] = False
+
+    def _ensure_checker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="replica-check", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self.check()
+            time.sleep(self.check_interval)
+
+    def stats(self) -> dict:
+        return {
+            "replicas": len(self.replicas),
+            "healthy": self.healthy(),
+            "down": [i for i, down in enumerate(self._down) if down],
+            "fallbacks_to_primary": self.fallbacks,
+        }
+
+
+# ---------- Read-your-writes ----------
+# dicionário mutável por requisição: escritas feitas no threadpool ou em
+# greenlets do driver assíncrono ficam visíveis para o middleware
+_request: ContextVar[dict | None] = ContextVar("db_request", default=None)
+
+
+def _mark_write(conn, cursor, statement, parameters, context, executemany):
+    state = _request.get()
+    if state is not None and context is not None and (context.isinsert or context.isupdate or context.isdelete):
+        state["wrote"] = True
+
+
+def note_write() -> None:
+    """Marca a requisição corrente quando a escrita foi feita por outra thread."""
+    state = _request.get()
+    if state is not None:
+        state["wrote"] = True
+
+
+def track_writes(engine) -> None:
+    """Registra no engine primário (para AsyncEngine, ``.sync_engine``)."""
+    if not event.contains(engine, "after_cursor_execute", _mark_write):
+        event.listen(engine, "after_cursor_execute", _mark_write)
+
+
+def prefers_primary(cookies: dict) -> bool:
+    try:
+        return float(cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """Marca o cliente com ``db_primary_until`` quando a requisição escreveu no primário."""
+
+    def __init__(self, app, window: float = 5.0):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        state = {"wrote": False}
+        token = _request.set(state)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and state["wrote"]:
+                until = time.time() + self.window
+                cookie = f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(self.window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request.reset(token)
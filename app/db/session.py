@@ -1,8 +1,26 @@
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy import create_engine
+from fastapi import Request
+
+from app.core import metrics
 from app.core.config import settings
+from app.db.replicas import ReplicaRouter, prefers_primary, track_writes
+
+
+def _pool_kwargs(url: str) -> dict:
+    # SQLite usa pools próprios que não aceitam esses parâmetros
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
 
-engine = create_engine(settings.DB_URL, pool_pre_ping=True, echo=False, future=True)
+engine = create_engine(settings.DB_URL, pool_pre_ping=True, echo=False, future=True, **_pool_kwargs(settings.DB_URL))
+metrics.instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
@@ -12,3 +30,90 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ---------- Réplicas de leitura (opcional, DB_REPLICA_URLS) ----------
+track_writes(engine)
+
+replica_engines = [
+    create_engine(url, pool_pre_ping=True, echo=False, future=True, **_pool_kwargs(url))
+    for url in settings.replica_urls
+]
+for _replica in replica_engines:
+    metrics.instrument_engine(_replica)
+read_router = ReplicaRouter(replica_engines, settings.DB_REPLICA_CHECK_SECONDS)
+
+
+def read_replica(request: Request) -> int | None:
+    """Réplica (índice) para uma leitura; None = primário (sem réplica saudável
+    ou o cliente escreveu há pouco)."""
+    return None if prefers_primary(request.cookies) else read_router.pick()
+
+
+def read_session(request: Request):
+    i = read_replica(request)
+    return SessionLocal() if i is None else SessionLocal(bind=replica_engines[i])
+
+
+def get_read_db(request: Request):
+    """Sessão para rotas só de leitura."""
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# ---------- Pilha assíncrona (opcional, DB_ASYNC=true) ----------
+_ASYNC_DRIVERS = {
+    "mysql+mysqldb": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+async_engine = None
+AsyncSessionLocal = None
+async_replica_engines: list = []
+
+
+def async_db_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def init_async_engine(url: str | None = None):
+    """Cria o engine assíncrono sob demanda (o driver só é importado se usado)."""
+    global async_engine, AsyncSessionLocal, async_replica_engines
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = url or settings.ASYNC_DB_URL or async_db_url(settings.DB_URL)
+    async_engine = create_async_engine(url, pool_pre_ping=True, echo=False, **_pool_kwargs(url))
+    metrics.instrument_engine(async_engine.sync_engine)
+    track_writes(async_engine.sync_engine)
+    # mesma ordem de replica_engines: o roteador (que verifica pelos engines síncronos) devolve o índice
+    async_replica_engines = [
+        create_async_engine(async_db_url(u), pool_pre_ping=True, echo=False, **_pool_kwargs(u))
+        for u in settings.replica_urls
+    ]
+    for eng in async_replica_engines:
+        metrics.instrument_engine(eng.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return async_engine
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        init_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    if AsyncSessionLocal is None:
+        init_async_engine()
+    i = read_replica(request)
+    bind = {} if i is None else {"bind": async_replica_engines[i]}
+    async with AsyncSessionLocal(**bind) as db:
+        yield db
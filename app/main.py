@@ -1,16 +1,71 @@
-from pathlib import Path
+import logging
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
+from sqlalchemy import text
 
+from app.core import admission, metrics
+from app.core.assets import PrecompressedStaticFiles, static_root
 from app.core.config import settings
-from app.db.session import Base, engine
+from app.core.security import hasher
+from app.db import migrations
+from app.db.replicas import ReadYourWritesMiddleware
+from app.db.session import SessionLocal, engine, read_router
 from app.api.routes import router
+from app.services.catalog_snapshot import catalog_snapshot
+from app.services.change_feed import change_feed
+from app.services.price_analytics import price_analytics
+from app.services.price_index import price_index
+from app.services.search_index import search_index
+from app.services.write_coalescer import write_coalescer
 
-Base.metadata.create_all(bind=engine)
+log = logging.getLogger(__name__)
 
-app = FastAPI(title=settings.APP_NAME)
+# ---------- Inicialização ----------
+# O schema é responsabilidade de `python -m app.db.migrations upgrade`; importar o
+# app não toca no banco. Os índices em memória aquecem em segundo plano e as
+# rotas que dependem deles continuam funcionando (carregam sob demanda).
+_warmup = {"thread": None, "done": False, "error": None}
+_warmup_lock = threading.Lock()
+
+def _warm_indexes():
+    try:
+        # com snapshot mapeado, detalhe e consultas por preço saem dele; busca e
+        # estatísticas carregam sob demanda, só nos workers que as recebem
+        if catalog_snapshot.current() is None:
+            with SessionLocal() as db:
+                price_index.ensure_loaded(db)
+                search_index.ensure_loaded(db)
+                price_analytics.ensure_loaded(db)
+    except Exception as exc:  # banco fora do ar no boot: /ready tenta de novo
+        log.warning("aquecimento dos índices falhou: %s", exc)
+        _warmup["error"] = str(exc)
+    else:
+        _warmup["done"], _warmup["error"] = True, None
+
+def start_warmup():
+    with _warmup_lock:
+        t = _warmup["thread"]
+        if _warmup["done"] or (t is not None and t.is_alive()):
+            return
+        t = threading.Thread(target=_warm_indexes, name="index-warmup", daemon=True)
+        _warmup["thread"] = t
+        t.start()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DB_AUTO_MIGRATE:
+        await run_in_threadpool(migrations.upgrade, engine, log.info)
+    start_warmup()
+    yield
+    change_feed.close()
+    await run_in_threadpool(write_coalescer.close)
+    hasher.shutdown()
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,17 +73,71 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
+if read_router:
+    # leituras vão para réplicas; quem acabou de escrever lê do primário por alguns segundos
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.DB_READ_YOUR_WRITES_SECONDS)
+
+admission_controller = admission.from_settings() if settings.ADMISSION_ENABLED else None
+if admission_controller:
+    # dentro das métricas: rejeições (503) também entram nas contagens por status
+    app.add_middleware(admission.AdmissionMiddleware, controller=admission_controller)
+
+if settings.METRICS_ENABLED:
+    profiler = metrics.SlowRequestProfiler(settings.METRICS_PROFILE_SLOW_MS, settings.METRICS_PROFILE_INTERVAL_MS)
+    app.add_middleware(metrics.MetricsMiddleware, profiler=profiler)
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        body = metrics.registry.render()
+        if admission_controller:
+            body += admission_controller.render()
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+    @app.get("/metrics/slow", include_in_schema=False)
+    def slow_requests():
+        # perfis amostrados (só com METRICS_PROFILE_SLOW_MS > 0), mais recentes por último
+        return {"enabled": profiler.enabled, "threshold_ms": settings.METRICS_PROFILE_SLOW_MS, "requests": list(profiler.slow)}
+
 app.include_router(router)
 
-static_dir = Path(__file__).parent / "static"
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+# app/static_dist (python -m app.core.assets) quando existir: hash no nome + .gz/.br
+app.mount("/static", PrecompressedStaticFiles(directory=static_root()), name="static")
 
 @app.get("/health", include_in_schema=False)
 def health():
+    # liveness: o processo responde; não depende do banco
     return {"status": "ok"}
 
+@app.get("/ready", include_in_schema=False)
+def ready():
+    # readiness: banco acessível, schema atualizado e índices em memória carregados
+    checks = {}
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        checks["database"] = "ok"
+        checks["migrations"] = "ok" if not migrations.pending(engine) else "pendentes"
+    except Exception as exc:
+        checks["database"] = f"erro: {exc.__class__.__name__}"
+    if not _warmup["done"]:
+        start_warmup()
+    checks["indexes"] = "ok" if _warmup["done"] else "carregando"
+    ok = all(v == "ok" for v in checks.values())
+    body = {"status": "ok" if ok else "starting", **checks}
+    if read_router:
+        # réplica fora não derruba o readiness: as leituras caem no primário
+        body["replicas"] = read_router.stats()
+    if admission_controller:
+        body["admission"] = admission_controller.stats()
+    if write_coalescer.enabled:
+        body["write_coalescer"] = write_coalescer.stats()
+    if catalog_snapshot.enabled:
+        body["snapshot"] = catalog_snapshot.stats()
+    return JSONResponse(body, status_code=200 if ok else 503)
+
 @app.get("/", include_in_schema=False)
 def root_redirect():
     return RedirectResponse(url="/static/auth.html", status_code=302)
@@ -0,0 +1,11 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Integer
+from app.db.session import Base
+
+class CatalogState(Base):
+    """Linha única com a versão do catálogo; muda a cada transação que escreve em products."""
+    __tablename__ = "catalog_state"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -1,10 +1,26 @@
+from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, Float
+from sqlalchemy import DateTime, Double, Index, Integer, String
 from app.db.session import Base
 
+def _utcnow() -> datetime:
+    return datetime.utcnow().replace(microsecond=0)
+
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # filtro por categoria + ordenação/faixa de preço (listagem, top-k)
+        Index("ix_products_category_price", "category", "price"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(120), index=True)
     category: Mapped[str] = mapped_column(String(60), index=True, default="")
-    price: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    # ordenação por (price, id) e faixas de preço; o id já vem junto no índice secundário.
+    # DOUBLE: com FLOAT (4 bytes) no MySQL o valor gravado não é igual ao float do
+    # Python e o cursor keyset (price, id) > (:p, :i) pula ou repete linhas
+    price: Mapped[float] = mapped_column(Double, nullable=False, default=0.0, index=True)
+    # versão da linha (ETag e trava otimista: o ORM incrementa a cada UPDATE)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, default=_utcnow, onupdate=_utcnow)
+
+    __mapper_args__ = {"version_id_col": version}
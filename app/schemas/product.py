@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 class ProductBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=120)
@@ -17,3 +17,43 @@ class ProductOut(ProductBase):
     id: int
     class Config:
         from_attributes = True
+
+# ---------- Atualização em lote ----------
+class BatchItem(BaseModel):
+    id: int
+    fields: ProductUpdate
+    version: int | None = Field(None, description="Versão esperada da linha; omitida = sem checagem")
+
+class BatchRule(BaseModel):
+    category: str | None = None
+    min_price: float | None = None
+    max_price: float | None = None
+    price_factor: float = Field(1.0, gt=0, description="Novo preço = preço * fator + delta (arredondado, mínimo 0)")
+    price_delta: float = 0.0
+    expected_catalog_version: int | None = Field(None, description="Falha com 409 se o catálogo mudou desde essa versão")
+
+    @model_validator(mode="after")
+    def _has_filter(self):
+        if self.category is None and self.min_price is None and self.max_price is None:
+            raise ValueError("A regra precisa de category, min_price ou max_price")
+        return self
+
+class ProductBatchUpdate(BaseModel):
+    items: list[BatchItem] | None = Field(None, min_length=1, max_length=10_000)
+    rule: BatchRule | None = None
+
+    @model_validator(mode="after")
+    def _one_mode(self):
+        if (self.items is None) == (self.rule is None):
+            raise ValueError("Informe items ou rule (um dos dois)")
+        if self.items is not None and len({i.id for i in self.items}) != len(self.items):
+            raise ValueError("ids repetidos em items")
+        return self
+
+class ProductVersionedOut(ProductOut):
+    version: int
+
+class ProductBatchResult(BaseModel):
+    updated: int
+    catalog_version: int
+    items: list[ProductVersionedOut] = []
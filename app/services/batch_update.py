@@ -0,0 +1,199 @@
+# app/services/batch_update.py
+"""
+Atualização de preços/campos em lote, baseada em conjuntos, numa transação.
+
+- lista explícita: as linhas são lidas antes com ``FOR UPDATE`` (no MySQL
+  isso trava as linhas) e cada bloco de ids vira um
+  ``UPDATE ... SET col = CASE id WHEN ... END`` que só toca linhas com a
+  versão lida (trava otimista por linha);
+- regra (ex.: categoria X, preço * 0.9): um único
+  ``UPDATE products SET price = ROUND(price * f + d, 2), version = version + 1
+  WHERE <filtro>``, sem ler os alvos antes. A trava otimista é a do
+  catálogo: com ``expected_catalog_version`` o lote só vale se ninguém
+  escreveu desde aquela versão.
+
+Qualquer divergência desfaz tudo e vira ``BatchConflict``. A ordem de travas
+é a mesma do ORM (products antes de catalog_state), então não há deadlock
+com os PUTs.
+
+As linhas alteradas voltam por RETURNING quando o dialeto suporta (SQLite,
+PostgreSQL) ou por um SELECT ao final (MySQL).
+"""
+from sqlalchemy import Double, case, cast, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.product import Product, _utcnow
+from app.schemas.product import BatchRule, ProductBatchUpdate
+from app.services import catalog_events, catalog_version
+from app.services.catalog_events import ProductChange, ProductRow
+from app.services.pagination import filtered_select
+
+ROW_COLUMNS = (Product.id, Product.name, Product.category, Product.price, Product.version)
+# o RETURNING do SQLite devolve o valor antes da afinidade da coluna (11.0 vira 11)
+RETURNING_COLUMNS = (*ROW_COLUMNS[:3], cast(Product.price, Double).label("price"), Product.version)
+UPDATABLE = ("name", "category", "price")
+
+
+class BatchConflict(Exception):
+    def __init__(self, missing=(), stale=(), catalog_version: int | None = None):
+        self.missing = sorted(missing)
+        self.stale = sorted(stale)
+        self.catalog_version = catalog_version
+        super().__init__("conflito na atualização em lote")
+
+
+def _chunks(seq: list, size: int):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def _lock_rows(db: Session, stmt) -> dict:
+    return {r.id: r for r in db.execute(stmt.with_for_update())}
+
+
+def _targets(db: Session, payload: ProductBatchUpdate) -> dict:
+    """id -> linha atual (id, name, category, price, version), travada até o commit."""
+    ids = [item.id for item in payload.items]
+    before = {}
+    for chunk in _chunks(ids, settings.BATCH_CHUNK_ROWS):
+        before.update(_lock_rows(db, select(*ROW_COLUMNS).where(Product.id.in_(chunk))))
+    missing = [i for i in ids if i not in before]
+    stale = [
+        item.id for item in payload.items
+        if item.version is not None and item.id in before and before[item.id].version != item.version
+    ]
+    if missing or stale:
+        raise BatchConflict(missing, stale)
+    return before
+
+
+def _set_values(payload: ProductBatchUpdate, chunk_ids: list[int]) -> dict:
+    by_id = {item.id: item.fields.model_dump(exclude_unset=True) for item in payload.items}
+    values = {}
+    for col in UPDATABLE:
+        whens = {pid: by_id[pid][col] for pid in chunk_ids if col in by_id[pid]}
+        if whens:
+            values[col] = case(whens, value=Product.id, else_=getattr(Product, col))
+    return values
+
+
+def apply(db: Session, payload: ProductBatchUpdate, return_items: bool = True) -> tuple[int, int, list]:
+    """Executa o lote; devolve (linhas alteradas, versão do catálogo, linhas novas)."""
+    if payload.rule is not None:
+        return _apply_rule(db, payload.rule, return_items)
+    try:
+        before = _targets(db, payload)
+        ids = sorted(before)
+        returning = db.get_bind().dialect.update_returning and return_items
+        now = _utcnow()
+        after = []
+        for chunk in _chunks(ids, settings.BATCH_CHUNK_ROWS):
+            expected = case({pid: before[pid].version for pid in chunk}, value=Product.id)
+            stmt = (
+                update(Product)
+                .where(Product.id.in_(chunk), Product.version == expected)
+                .values(**_set_values(payload, chunk), version=Product.version + 1, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            if returning:
+                rows = db.execute(stmt.returning(*RETURNING_COLUMNS)).all()
+                after.extend(rows)
+                changed = len(rows)
+            else:
+                changed = db.execute(stmt).rowcount
+            if changed != len(chunk):
+                # alguém alterou a linha entre a leitura e o UPDATE (SQLite não trava no SELECT)
+                current = dict(db.execute(select(Product.id, Product.version).where(Product.id.in_(chunk))).all())
+                raise BatchConflict(
+                    missing=[pid for pid in chunk if pid not in current],
+                    stale=[pid for pid in chunk if pid in current and current[pid] != before[pid].version + 1],
+                )
+
+        if ids:
+            catalog_version.bump(db)
+        version, _ = catalog_version.current(db)
+
+        if return_items and not returning:
+            for chunk in _chunks(ids, settings.BATCH_CHUNK_ROWS):
+                after.extend(db.execute(select(*ROW_COLUMNS).where(Product.id.in_(chunk))).all())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    _publish(before, after, len(ids))
+    after.sort(key=lambda r: r.id)
+    return len(ids), version, after
+
+
+# ---------- Regra ----------
+
+def _new_price(rule: BatchRule, price):
+    new = func.round(price * rule.price_factor + rule.price_delta, 2)
+    return case((new < 0, 0.0), else_=new)
+
+
+def _apply_rule(db: Session, rule: BatchRule, return_items: bool) -> tuple[int, int, list]:
+    where = filtered_select(None, rule.category, rule.min_price, rule.max_price, columns=(Product.id,)).whereclause
+    returning = db.get_bind().dialect.update_returning
+    # sem RETURNING (MySQL) as linhas são relidas por id depois do UPDATE: os
+    # alvos ficam travados desde a leitura, então o UPDATE pega os mesmos.
+    # Com RETURNING a leitura prévia é só a imagem anterior para os eventos.
+    complete = not returning and return_items
+    try:
+        start, _ = catalog_version.current(db)
+        prior = select(*ROW_COLUMNS).where(where).order_by(Product.id)
+        if not complete:
+            prior = prior.limit(settings.BATCH_EVENTS_MAX + 1)
+        if not returning:
+            prior = prior.with_for_update()
+        before = {r.id: r for r in db.execute(prior)}
+        stmt = (
+            update(Product)
+            .where(where)
+            .values(price=_new_price(rule, Product.price), version=Product.version + 1, updated_at=_utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if returning:
+            after = db.execute(stmt.returning(*RETURNING_COLUMNS)).all()
+            count = len(after)
+        else:
+            count = db.execute(stmt).rowcount
+            after = []
+            if count and (complete or len(before) <= settings.BATCH_EVENTS_MAX):
+                for chunk in _chunks(sorted(before), settings.BATCH_CHUNK_ROWS):
+                    after.extend(db.execute(select(*ROW_COLUMNS).where(Product.id.in_(chunk))).all())
+        if count:
+            catalog_version.bump(db)
+        version, _ = catalog_version.current(db)
+        if rule.expected_catalog_version is not None:
+            if version != rule.expected_catalog_version + (1 if count else 0):
+                # informa a versão que fica valendo depois do rollback
+                raise BatchConflict(catalog_version=version - (1 if count else 0))
+        if version != start + (1 if count else 0):
+            before = {}  # outra escrita entre a leitura e o UPDATE: imagem anterior incerta
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    _publish(before, after, count)
+    after.sort(key=lambda r: r.id)
+    return count, version, after if return_items else []
+
+
+def _publish(before: dict, after: list, count: int) -> None:
+    if not count:
+        return
+    if count > settings.BATCH_EVENTS_MAX or len(after) != count or any(r.id not in before for r in after):
+        # muitas linhas (ou linhas novas não lidas): estruturas em memória se reconstroem
+        catalog_events.reloaded()
+        return
+    for row in after:
+        old = before[row.id]
+        catalog_events.publish(ProductChange(
+            "update",
+            after=ProductRow(row.id, row.name, row.category, row.price),
+            before=ProductRow(old.id, old.name, old.category, old.price),
+        ))
@@ -0,0 +1,264 @@
+# app/services/bulk_io.py
+"""
+Importação/exportação em massa de produtos com I/O em streaming.
+
+Importação: linhas NDJSON ou CSV chegam em pedaços, são validadas com
+``ProductCreate`` e inseridas em lotes (executemany) dentro de transações
+de tamanho configurável. Uma linha ruim não derruba o lote: se o banco
+rejeitar um lote, a transação corrente é refeita linha a linha. Até
+``BATCH_EVENTS_MAX`` linhas os ids gerados são coletados e cada produto
+vira um evento ``create``; acima disso, um ``reload``.
+
+Exportação e listagens completas: gerador que lê o catálogo com cursor do
+lado do servidor (``stream_results``/``yield_per``), só com as colunas de
+``ProductOut``, e devolve pedaços já codificados (NDJSON, CSV ou um array
+JSON). Ordem por id ou por (price, id) sai do banco; por nome sem acento
+(o que a collation do banco não garante) passa pela ordenação externa, com
+memória limitada a ``EXPORT_SORT_RUN_ROWS`` linhas.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.algorithms.external_sort import external_sort
+from app.core.config import settings
+from app.models.product import Product
+from app.schemas.product import ProductCreate
+from app.services import catalog_version
+from app.services.catalog_events import ProductRow
+from app.services.pagination import filtered_select
+from app.services.search_index import fold
+from app.services.serialization import PRODUCT_COLUMNS, PRODUCT_FIELDS, dumps
+
+CSV_FIELDS = ("name", "category", "price")
+
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    def error(self, line: int, detail) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.BULK_MAX_ERRORS:
+            self.errors.append({"line": line, "detail": detail})
+
+    def as_dict(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+# ---------- Leitura do upload ----------
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Quebra o corpo em linhas (numeradas a partir de 1) sem carregá-lo inteiro."""
+    buf = b""
+    line_no = 0
+    async for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for raw in lines:
+            line_no += 1
+            yield line_no, raw.decode("utf-8-sig" if line_no == 1 else "utf-8").rstrip("\r")
+    if buf:
+        yield line_no + 1, buf.decode("utf-8").rstrip("\r")
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """Gera (linha, registro, erro). CSV exige cabeçalho; campos não podem ter quebra de linha."""
+    header = None
+    async for line_no, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [h.strip() for h in values]
+                missing = {"name", "price"} - set(header)
+                if missing:
+                    yield line_no, None, f"cabeçalho sem as colunas {sorted(missing)}"
+                    return
+                continue
+            if len(values) != len(header):
+                yield line_no, None, "quantidade de colunas diferente do cabeçalho"
+                continue
+            yield line_no, dict(zip(header, values)), None
+        else:
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield line_no, None, f"JSON inválido: {exc}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "cada linha deve ser um objeto JSON"
+                continue
+            yield line_no, record, None
+
+
+def validate(record: dict) -> tuple[dict | None, list | None]:
+    try:
+        return ProductCreate.model_validate(record).model_dump(), None
+    except ValidationError as exc:
+        return None, [{"loc": e["loc"], "msg": e["msg"]} for e in exc.errors()]
+
+
+# ---------- Escrita ----------
+_id_steps: dict = {}  # URL do MySQL -> passo do auto_increment; 0 = ids não consecutivos
+
+
+def _mysql_id_step(db: Session) -> int:
+    url = db.get_bind().url
+    if url not in _id_steps:
+        mode, step = db.execute(text("SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment")).one()
+        _id_steps[url] = int(step) if int(mode) in (0, 1) else 0
+    return _id_steps[url]
+
+
+def insert_rows(db: Session, rows: list[dict]) -> list[int]:
+    """
+    Insere as linhas e devolve os ids gerados, na ordem de ``rows``.
+
+    - SQLite, MariaDB, PostgreSQL: ``INSERT ... RETURNING id`` com
+      ``sort_by_parameter_order``;
+    - MySQL: ``lastrowid`` é o id da primeira linha de um INSERT de várias
+      linhas e os demais são consecutivos (passo ``auto_increment_increment``)
+      com ``innodb_autoinc_lock_mode`` 0 ou 1. No modo 2 (intercalado) essa
+      garantia não existe e vira um INSERT por linha.
+    """
+    dialect = db.get_bind().dialect
+    if dialect.insert_executemany_returning:
+        return list(db.scalars(insert(Product).returning(Product.id, sort_by_parameter_order=True), rows))
+    step = _mysql_id_step(db) if dialect.name == "mysql" else 0
+    if step and len(rows) > 1:
+        first = db.execute(insert(Product).values(rows)).lastrowid
+        return [first + i * step for i in range(len(rows))]
+    return [db.execute(insert(Product).values(row)).inserted_primary_key[0] for row in rows]
+
+
+class BulkWriter:
+    """Acumula linhas válidas e grava em lotes; chamado de uma thread do pool."""
+
+    def __init__(self, db: Session, report: ImportReport, max_events: int | None = None):
+        self.db = db
+        self.report = report
+        self._tx_rows: list[tuple[int, dict]] = []  # linhas da transação aberta
+        self._tx_ids: list[int] = []
+        self.max_events = settings.BATCH_EVENTS_MAX if max_events is None else max_events
+        # produtos commitados, para os eventos "create"; None passou do limite
+        self.created: list[ProductRow] | None = []
+
+    def _insert(self, rows: list[dict]) -> list[int]:
+        if self.created is None:
+            self.db.execute(insert(Product), rows)  # executemany: ids não interessam mais
+            return []
+        return insert_rows(self.db, rows)
+
+    def write_batch(self, rows: list[tuple[int, dict]]) -> None:
+        if not rows:
+            return
+        if self.created is not None and len(self.created) + len(self._tx_rows) + len(rows) > self.max_events:
+            self.created = None
+        try:
+            ids = self._insert([r for _, r in rows])
+        except DBAPIError:
+            self.db.rollback()
+            self._replay(self._tx_rows + rows)
+            self._tx_rows, self._tx_ids = [], []
+            return
+        self._tx_rows.extend(rows)
+        self._tx_ids.extend(ids)
+        if len(self._tx_rows) >= settings.BULK_TX_ROWS:
+            self.commit()
+
+    def commit(self) -> None:
+        if self._tx_rows:
+            catalog_version.bump(self.db)
+            self.db.commit()
+            self.report.inserted += len(self._tx_rows)
+            self._created([r for _, r in self._tx_rows], self._tx_ids)
+            self._tx_rows, self._tx_ids = [], []
+
+    def _created(self, rows: list[dict], ids: list[int]) -> None:
+        if self.created is not None:
+            self.created.extend(ProductRow(pid, r["name"], r["category"], r["price"]) for r, pid in zip(rows, ids))
+
+    def _replay(self, rows: list[tuple[int, dict]]) -> None:
+        # caminho lento e raro: isola a(s) linha(s) que o banco recusou
+        for line_no, row in rows:
+            try:
+                ids = self._insert([row])
+                catalog_version.bump(self.db)
+                self.db.commit()
+                self.report.inserted += 1
+                self._created([row], ids)
+            except DBAPIError as exc:
+                self.db.rollback()
+                self.report.error(line_no, str(exc.orig))
+
+
+# ---------- Exportação ----------
+def export_rows(db: Session, category: str | None = None, q: str | None = None,
+                min_price: float | None = None, max_price: float | None = None, order: str = "id") -> Iterator[tuple]:
+    """``order``: ``id``, ``price`` (price, id) ou ``name`` (nome sem acento, id)."""
+    stmt = filtered_select(q, category, min_price, max_price, columns=PRODUCT_COLUMNS)
+    stmt = stmt.order_by(Product.price, Product.id) if order == "price" else stmt.order_by(Product.id)
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=settings.EXPORT_CHUNK_ROWS))
+    rows = (row for partition in result.partitions() for row in partition)
+    if order == "name":
+        # a entrada já vem por id: empates de nome saem por id (ordenação estável)
+        rows = external_sort(
+            (tuple(r) for r in rows), key=lambda r: fold(r[1]), run_size=settings.EXPORT_SORT_RUN_ROWS
+        )
+    yield from rows
+
+
+def encode_chunks(rows: Iterator[tuple], fmt: str, chunk_rows: int) -> Iterator[bytes]:
+    if fmt == "json":
+        yield from _json_array_chunks(rows, chunk_rows)
+        return
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n") if fmt == "csv" else None
+    if writer:
+        writer.writerow(PRODUCT_FIELDS)
+    n = 0
+    for row in rows:
+        if writer:
+            writer.writerow(row)
+        else:
+            buf.write(json.dumps(dict(zip(PRODUCT_FIELDS, row)), ensure_ascii=False))
+            buf.write("\n")
+        n += 1
+        if n >= chunk_rows:
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+            n = 0
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+def _json_array_chunks(rows: Iterator[tuple], chunk_rows: int) -> Iterator[bytes]:
+    """Array JSON (mesmo corpo da listagem) emitido aos pedaços."""
+    parts = [b"["]
+    first = True
+    for row in rows:
+        if not first:
+            parts.append(b",")
+        parts.append(dumps(dict(zip(PRODUCT_FIELDS, row))))
+        first = False
+        if len(parts) >= 2 * chunk_rows:
+            yield b"".join(parts)
+            parts = []
+    parts.append(b"]")
+    yield b"".join(parts)
@@ -0,0 +1,81 @@
+# app/services/catalog_events.py
+"""
+Barramento síncrono de eventos de escrita do catálogo.
+
+Os caminhos de escrita (rotas e services) publicam um ``ProductChange``
+*depois* do commit; estruturas em memória derivadas da tabela ``products``
+(índice de preços, caches, ...) assinam para se manter atualizadas sem
+reconstruir tudo a cada requisição.
+"""
+import logging
+import threading
+from typing import Callable, NamedTuple
+
+log = logging.getLogger(__name__)
+
+
+class ProductRow(NamedTuple):
+    id: int
+    name: str
+    category: str
+    price: float
+
+    @classmethod
+    def of(cls, obj) -> "ProductRow":
+        return cls(obj.id, obj.name, obj.category, obj.price)
+
+
+class ProductChange(NamedTuple):
+    op: str  # "create" | "update" | "delete" | "reload"
+    after: ProductRow | None = None
+    before: ProductRow | None = None
+
+    @property
+    def id(self) -> int | None:
+        row = self.after or self.before
+        return row.id if row else None
+
+
+Listener = Callable[[ProductChange], None]
+
+_listeners: list[Listener] = []
+_lock = threading.Lock()
+
+
+def subscribe(listener: Listener) -> Listener:
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+    return listener
+
+
+def unsubscribe(listener: Listener) -> None:
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def publish(change: ProductChange) -> None:
+    # uma falha num assinante não pode desfazer a escrita já commitada
+    for listener in list(_listeners):
+        try:
+            listener(change)
+        except Exception:
+            log.exception("listener de catálogo falhou para %s", change.op)
+
+
+def created(obj) -> None:
+    publish(ProductChange("create", after=ProductRow.of(obj)))
+
+
+def updated(before: ProductRow, obj) -> None:
+    publish(ProductChange("update", after=ProductRow.of(obj), before=before))
+
+
+def deleted(before: ProductRow) -> None:
+    publish(ProductChange("delete", before=before))
+
+
+def reloaded() -> None:
+    """Escrita em massa: assinantes devem se reconstruir a partir do banco."""
+    publish(ProductChange("reload"))
@@ -0,0 +1,150 @@
+# app/services/catalog_index.py
+"""
+Base dos índices em memória derivados da tabela ``products`` (preços, busca
+textual, estatísticas).
+
+- carga: a tabela é lida sem segurar a trava das consultas; eventos que
+  chegam enquanto isso ficam numa fila e são reaplicados logo depois da
+  troca das estruturas (as atualizações dos índices são idempotentes), então
+  nenhuma escrita concorrente com a carga se perde;
+- versão: cada carga guarda a versão do catálogo (``catalog_state``) lida
+  antes da tabela. Os eventos só trazem as escritas deste processo; no
+  máximo a cada ``INDEX_REFRESH_SECONDS`` o ``ensure_loaded`` compara a
+  versão do banco com a esperada (carga + commits locais) e, se outro
+  worker escreveu, recarrega em segundo plano. Enquanto isso as consultas
+  seguem na cópia anterior;
+- escrita em massa local (evento ``reload``): mesma recarga em segundo
+  plano, sem fazer a próxima requisição esperar a tabela inteira.
+
+Subclasses implementam ``_read(db)`` (linhas para ``rebuild``), ``rebuild``
+(monta fora da trava e chama ``_installed()`` com a trava, logo depois da
+troca) e ``_apply(change)`` (atualização incremental, idempotente).
+"""
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.services import catalog_version
+from app.services.catalog_events import ProductChange
+
+log = logging.getLogger(__name__)
+
+_RELOAD = object()  # "reload" recebido durante a carga
+
+
+class CatalogIndex:
+    name = "index"
+
+    def __init__(self, refresh_seconds: float | None = None):
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._queued: list | None = None  # eventos recebidos durante a carga
+        self.ready = False
+        self.version: int | None = None  # versão do catálogo na última carga
+        self._local_at_load = 0
+        self.refresh_seconds = settings.INDEX_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self._checked = 0.0
+        self._refreshing = False
+        self._stale = False  # "reload" durante a carga: recarregar de novo
+        self.reloads = 0
+
+    # ---------- Subclasses ----------
+    def _read(self, db):
+        raise NotImplementedError
+
+    def rebuild(self, rows) -> None:
+        raise NotImplementedError
+
+    def _apply(self, change: ProductChange) -> None:
+        raise NotImplementedError
+
+    # ---------- Carga ----------
+    def _installed(self) -> None:
+        """Chamado pelo ``rebuild`` com a trava, depois de trocar as estruturas."""
+        queued, self._queued = self._queued, None
+        self.ready = True
+        for change in queued or ():
+            if change is _RELOAD:
+                # escrita em massa durante a leitura: a cópia nova já nasce velha
+                self._stale = True
+                return
+            self._apply(change)
+
+    def load(self, db, force: bool = False) -> None:
+        with self._load_lock:
+            if self.ready and not force:
+                return
+            with self._lock:
+                self._queued = []
+                self._stale = False
+            try:
+                # versão antes do contador: uma corrida só causa recarga a mais
+                version, _ = catalog_version.current(db)
+                local = catalog_version.local_commits()
+                self.rebuild(self._read(db))
+                self.version, self._local_at_load = version, local
+                self._checked = time.monotonic()
+                self.reloads += 1
+            finally:
+                with self._lock:
+                    self._queued = None
+        if self._stale and not self._refreshing:
+            self.refresh()
+
+    def ensure_loaded(self, db) -> None:
+        if not self.ready:
+            self.load(db)
+            return
+        if self.refresh_seconds and time.monotonic() - self._checked >= self.refresh_seconds:
+            self._checked = time.monotonic()
+            self._check(db)
+
+    def _check(self, db) -> None:
+        if self.version is None or self._refreshing:
+            return
+        version, _ = catalog_version.current(db)
+        expected = self.version + catalog_version.local_commits() - self._local_at_load
+        if version > expected:
+            self.refresh()
+
+    def refresh(self) -> None:
+        """Recarrega em segundo plano; as consultas seguem na cópia atual."""
+        with self._lock:
+            if self._refreshing:
+                self._stale = True  # a recarga em andamento pode já ter lido a tabela
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name=f"{self.name}-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        from app.db.session import SessionLocal
+
+        try:
+            with SessionLocal() as db:
+                self.load(db, force=True)
+        except Exception as exc:  # banco fora: tenta de novo na próxima checagem
+            log.warning("recarga de %s falhou: %s", self.name, exc)
+        finally:
+            with self._lock:
+                self._refreshing = False
+                again = self._stale
+            if again:
+                self.refresh()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.ready = False
+
+    # ---------- Eventos ----------
+    def apply(self, change: ProductChange) -> None:
+        with self._lock:
+            if self._queued is not None:
+                # recarga em andamento: vale para a cópia nova, e também para a atual
+                self._queued.append(_RELOAD if change.op == "reload" else change)
+            if change.op == "reload":
+                if self.ready and self._queued is None:
+                    self.refresh()
+                return
+            if self.ready:
+                self._apply(change)
@@ -0,0 +1,355 @@
+# app/services/catalog_snapshot.py
+"""
+Snapshot do catálogo num arquivo de layout fixo, mapeado em memória por
+todos os workers (``SNAPSHOT_PATH``):
+
+    python -m app.services.catalog_snapshot publish          # gera e troca o arquivo
+    python -m app.services.catalog_snapshot watch [segundos]  # líder: republica quando o catálogo muda
+    python -m app.services.catalog_snapshot info
+
+O arquivo é um cabeçalho ``struct`` seguido de colunas binárias alinhadas
+em 8 bytes:
+
+- por id (ordem crescente): ``ids`` (q), ``prices`` (d), ``codes`` (i,
+  código da categoria), ``versions`` (q), ``updated`` (q, µs desde 1970);
+- nomes: ``name_offsets`` (Q, n + 1 posições) sobre um blob UTF-8;
+- por preço: ``by_price_prices`` (d) e ``by_price_ids`` (q), ordenados
+  por ``(price, id)``, que viram um ``PriceIndex`` somente leitura;
+- categorias: ``cat_offsets`` (Q) sobre outro blob UTF-8.
+
+Cada worker abre o arquivo com ``mmap`` e lê as colunas por ``memoryview``,
+sem copiar: as páginas ficam no page cache e são compartilhadas entre os
+processos. A publicação grava num temporário e faz ``os.replace``; quem
+ainda usa o mapeamento antigo continua lendo o inode antigo, e os workers
+trocam para o novo na próxima verificação (``SNAPSHOT_CHECK_SECONDS``).
+
+O snapshot atrasa em relação ao banco até a próxima publicação. Escritas
+feitas no próprio worker marcam os ids como sujos: o detalhe deles volta ao
+banco e, enquanto houver algum sujo, as consultas por preço também (a ordem
+e as faixas do snapshot já não valem), até um snapshot mais novo que a
+escrita. Escritas de outros workers só aparecem na publicação seguinte, como
+numa réplica com atraso.
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.services import catalog_events
+from app.services.catalog_events import ProductChange
+from app.services.price_index import PriceIndex
+
+MAGIC = b"ECATSNAP"
+FORMAT_VERSION = 1
+SECTIONS = (
+    ("ids", "q"), ("prices", "d"), ("codes", "i"), ("versions", "q"), ("updated", "q"),
+    ("name_offsets", "Q"), ("names", "B"),
+    ("by_price_prices", "d"), ("by_price_ids", "q"),
+    ("cat_offsets", "Q"), ("cat_names", "B"),
+)
+# magic, formato, ordem dos bytes, linhas, categorias, versão do catálogo, instante da leitura
+_HEADER = struct.Struct("<8sII QQQd" + "QQ" * len(SECTIONS))
+_EPOCH = datetime(1970, 1, 1)
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class SnapshotRow(NamedTuple):
+    id: int
+    name: str
+    category: str
+    price: float
+    version: int
+    updated_at: datetime | None
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _micros(dt: datetime | None) -> int:
+    # DATETIME sem fuso, como o banco devolve; 0 = sem data
+    return (dt.replace(tzinfo=None) - _EPOCH) // timedelta(microseconds=1) if dt else 0
+
+
+# ---------- Publicação ----------
+def write(path, rows, catalog_version: int = 0, read_at: float | None = None) -> int:
+    """
+    Grava o snapshot de ``rows`` (id, name, category, price, version,
+    updated_at) em ordem crescente de id e troca o arquivo atomicamente.
+    Devolve o número de linhas.
+    """
+    read_at = time.time() if read_at is None else read_at
+    cols = {name: array(code) for name, code in SECTIONS if code != "B"}
+    names, cat_names = bytearray(), bytearray()
+    cols["name_offsets"].append(0)
+    cols["cat_offsets"].append(0)
+    codes: dict[str, int] = {}
+
+    for pid, name, category, price, version, updated_at in rows:
+        cols["ids"].append(pid)
+        cols["prices"].append(price)
+        code = codes.get(category or "")
+        if code is None:
+            code = codes[category or ""] = len(codes)
+            cat_names += (category or "").encode()
+            cols["cat_offsets"].append(len(cat_names))
+        cols["codes"].append(code)
+        cols["versions"].append(version or 0)
+        cols["updated"].append(_micros(updated_at))
+        names += (name or "").encode()
+        cols["name_offsets"].append(len(names))
+
+    ids, prices = cols["ids"], cols["prices"]
+    if any(ids[i] >= ids[i + 1] for i in range(len(ids) - 1)):
+        raise SnapshotError("linhas precisam vir em ordem crescente de id")
+    order = sorted(range(len(ids)), key=lambda i: (prices[i], ids[i]))
+    cols["by_price_prices"] = array("d", (prices[i] for i in order))
+    cols["by_price_ids"] = array("q", (ids[i] for i in order))
+    blobs = {"names": bytes(names), "cat_names": bytes(cat_names)}
+
+    layout, offset = [], _align(_HEADER.size)
+    for name, code in SECTIONS:
+        data = blobs[name] if code == "B" else cols[name].tobytes()
+        layout.append((offset, len(data), data))
+        offset = _align(offset + len(data))
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 1 if sys.byteorder == "little" else 2,
+        len(ids), len(codes), catalog_version, read_at,
+        *(v for off, size, _ in layout for v in (off, size)),
+    )
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for off, _, data in layout:
+            f.seek(off)
+            f.write(data)
+        f.truncate(offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(ids)
+
+
+def publish(db, path=None) -> dict:
+    """Lê o catálogo numa transação e publica o snapshot."""
+    from app.models.product import Product
+    from app.services import catalog_version
+
+    path = path or settings.SNAPSHOT_PATH
+    if not path:
+        raise SnapshotError("SNAPSHOT_PATH não configurado")
+    t0 = time.perf_counter()
+    read_at = time.time()
+    version, _ = catalog_version.current(db)
+    stmt = (
+        select(Product.id, Product.name, Product.category, Product.price, Product.version, Product.updated_at)
+        .order_by(Product.id)
+        .execution_options(yield_per=50_000)
+    )
+    n = write(path, db.execute(stmt), version, read_at)
+    return {"path": str(path), "rows": n, "catalog_version": version, "seconds": round(time.perf_counter() - t0, 3)}
+
+
+# ---------- Leitura ----------
+class CatalogSnapshot:
+    """Uma versão do arquivo, mapeada em memória; somente leitura."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm.size() < _HEADER.size:
+            raise SnapshotError(f"{path}: arquivo truncado")
+        head = _HEADER.unpack_from(self._mm)
+        magic, fmt, order, self.rows, n_cats, self.catalog_version, self.read_at = head[:7]
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise SnapshotError(f"{path}: formato desconhecido")
+        if order != (1 if sys.byteorder == "little" else 2):
+            raise SnapshotError(f"{path}: gerado numa máquina com outra ordem de bytes")
+
+        buf = memoryview(self._mm)
+        spans = head[7:]
+        for i, (name, code) in enumerate(SECTIONS):
+            off, size = spans[2 * i], spans[2 * i + 1]
+            setattr(self, f"_{name}", buf[off:off + size].cast(code) if code != "B" else buf[off:off + size])
+        self.categories = [
+            bytes(self._cat_names[self._cat_offsets[i]:self._cat_offsets[i + 1]]).decode()
+            for i in range(n_cats)
+        ]
+        self.price_index = PriceIndex.over(self._by_price_prices, self._by_price_ids)
+
+    def __len__(self):
+        return self.rows
+
+    def _row(self, i: int) -> SnapshotRow:
+        start, end = self._name_offsets[i], self._name_offsets[i + 1]
+        micros = self._updated[i]
+        return SnapshotRow(
+            self._ids[i],
+            bytes(self._names[start:end]).decode(),
+            self.categories[self._codes[i]],
+            self._prices[i],
+            self._versions[i],
+            _EPOCH + timedelta(microseconds=micros) if micros else None,
+        )
+
+    def get(self, product_id: int) -> SnapshotRow | None:
+        i = bisect_left(self._ids, product_id)
+        if i < self.rows and self._ids[i] == product_id:
+            return self._row(i)
+        return None
+
+    def rows_for(self, ids) -> list[SnapshotRow]:
+        """Linhas na ordem dos ids pedidos (ids ausentes são pulados)."""
+        return [row for row in map(self.get, ids) if row is not None]
+
+
+class SnapshotStore:
+    """
+    Mantém o snapshot corrente do worker. Confere o arquivo no máximo a cada
+    ``check_seconds`` (um ``os.stat``) e troca a referência quando ele muda.
+    """
+
+    def __init__(self, path: str = "", check_seconds: float = 1.0):
+        self.path = path
+        self.check_seconds = check_seconds
+        self._snap: CatalogSnapshot | None = None
+        self._stat = None
+        self._checked = 0.0
+        self._dirty: dict[int, float] = {}  # id -> instante da escrita local
+        self._stale_before = 0.0  # escrita em massa local: snapshots anteriores não servem
+        self._lock = threading.Lock()
+        self.swaps = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _refresh(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked < self.check_seconds:
+                return
+            self._checked = now
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                return
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if key == self._stat:
+                return
+            snap = CatalogSnapshot(self.path)
+            self._snap, self._stat = snap, key
+            self.swaps += 1
+            self._dirty = {pid: t for pid, t in self._dirty.items() if t >= snap.read_at}
+
+    def current(self) -> CatalogSnapshot | None:
+        if not self.enabled:
+            return None
+        if time.monotonic() - self._checked >= self.check_seconds:
+            self._refresh()
+        snap = self._snap
+        if snap is None or snap.read_at <= self._stale_before:
+            return None
+        return snap
+
+    def get(self, product_id: int) -> SnapshotRow | None:
+        """Linha do snapshot, ou None para ir ao banco (desligado, sujo ou ausente)."""
+        snap = self.current()
+        if snap is None or product_id in self._dirty:
+            return None
+        row = snap.get(product_id)
+        if row is None:
+            self.misses += 1  # pode ter sido criado depois da publicação
+        else:
+            self.hits += 1
+        return row
+
+    def has_dirty(self) -> bool:
+        """Há escrita local mais nova que o snapshot (a ordem por preço dele não vale)."""
+        return bool(self._dirty)
+
+    def apply(self, change: ProductChange) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        if change.op == "reload":
+            self._stale_before = now
+        elif change.id is not None:
+            self._dirty[change.id] = now
+
+    def stats(self) -> dict:
+        snap = self.current()
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "rows": len(snap) if snap else 0,
+            "catalog_version": snap.catalog_version if snap else None,
+            "read_at": snap.read_at if snap else None,
+            "swaps": self.swaps,
+            "dirty": len(self._dirty),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+catalog_snapshot = SnapshotStore(settings.SNAPSHOT_PATH, settings.SNAPSHOT_CHECK_SECONDS)
+catalog_events.subscribe(catalog_snapshot.apply)
+
+
+# ---------- Linha de comando ----------
+def main(argv: list[str]) -> int:
+    from app.db.session import SessionLocal
+    from app.services import catalog_version
+
+    cmd = argv[0] if argv else "publish"
+    if cmd == "publish":
+        with SessionLocal() as db:
+            print(publish(db))
+    elif cmd == "watch":
+        interval = float(argv[1]) if len(argv) > 1 else 5.0
+        published = None
+        while True:
+            with SessionLocal() as db:
+                version, _ = catalog_version.current(db)
+                if version != published:
+                    print(publish(db), flush=True)
+                    published = version
+            time.sleep(interval)
+    elif cmd == "info":
+        if not settings.SNAPSHOT_PATH:
+            print("SNAPSHOT_PATH não configurado")
+            return 1
+        snap = CatalogSnapshot(settings.SNAPSHOT_PATH)
+        print({
+            "path": settings.SNAPSHOT_PATH,
+            "rows": len(snap),
+            "categories": len(snap.categories),
+            "catalog_version": snap.catalog_version,
+            "read_at": datetime.fromtimestamp(snap.read_at).isoformat(timespec="seconds"),
+            "bytes": os.path.getsize(settings.SNAPSHOT_PATH),
+        })
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,76 @@
+# app/services/catalog_version.py
+"""
+Versão do catálogo, compartilhada entre workers via banco (tabela ``catalog_state``).
+
+Toda transação que escreve em ``products`` incrementa a versão na mesma
+transação: pelo ORM, automaticamente no ``after_flush``; por SQL Core
+(importação em massa, updates em lote), chamando ``bump`` antes do commit.
+A ETag das listagens deriva dela, então validar um ``If-None-Match`` custa
+uma leitura por chave primária em vez da consulta e da serialização.
+
+``local_commits`` conta os incrementos já commitados por este processo: os
+índices em memória comparam a versão do banco com a esperada e só recarregam
+quando outro worker escreveu.
+"""
+import threading
+from datetime import datetime
+from itertools import chain
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.models.catalog_state import CatalogState
+from app.models.product import Product, _utcnow
+
+STATE_ID = 1
+_PENDING = "catalog_bumps"  # Session.info: incrementos da transação aberta
+
+_local = {"commits": 0}
+_local_lock = threading.Lock()
+
+
+def bump(db, session: Session | None = None) -> None:
+    """
+    Incrementa a versão dentro da transação corrente (Session ou Connection).
+    Com uma Session (ou ``session`` dona da Connection) o incremento entra
+    em ``local_commits`` quando a transação é confirmada.
+    """
+    db.execute(
+        update(CatalogState)
+        .where(CatalogState.id == STATE_ID)
+        .values(version=CatalogState.version + 1, updated_at=_utcnow())
+    )
+    owner = session if session is not None else db if isinstance(db, Session) else None
+    if owner is not None:
+        owner.info[_PENDING] = owner.info.get(_PENDING, 0) + 1
+
+
+def local_commits() -> int:
+    """Incrementos de versão commitados por este processo (via Session)."""
+    return _local["commits"]
+
+
+@event.listens_for(Session, "after_commit")
+def _count_commit(session: Session) -> None:
+    n = session.info.pop(_PENDING, 0)
+    if n:
+        with _local_lock:
+            _local["commits"] += n
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def current(db) -> tuple[int, datetime | None]:
+    """(versão, última alteração); serve para AsyncSession via ``run_sync``."""
+    row = db.execute(select(CatalogState.version, CatalogState.updated_at).where(CatalogState.id == STATE_ID)).first()
+    return (row[0], row[1]) if row else (0, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_product_flush(session: Session, flush_context) -> None:
+    # new/dirty/deleted ainda refletem o que acabou de ser gravado
+    if any(isinstance(obj, Product) for obj in chain(session.new, session.dirty, session.deleted)):
+        bump(session.connection(), session)
@@ -0,0 +1,184 @@
+# app/services/change_feed.py
+"""
+Feed de alterações do catálogo para Server-Sent Events (``GET /products/changes``).
+
+Cada ``ProductChange`` publicado depois de um commit ganha um número de
+sequência monotônico e vai para:
+
+- um buffer circular com os últimos ``FEED_BUFFER_EVENTS`` eventos, de onde
+  sai o replay de quem reconecta com ``Last-Event-ID``;
+- a fila limitada de cada assinante. A publicação acontece na thread da
+  escrita; a entrega na fila usa ``call_soon_threadsafe`` no loop do
+  assinante. Fila cheia (cliente lento) descarta o que estava pendente e
+  manda um ``reset``: o cliente recarrega a lista em vez de travar o hub.
+
+Os ids de evento têm a forma ``<época>-<seq>``; a época muda a cada boot,
+então um ``Last-Event-ID`` de outro processo (ou anterior a um restart), ou
+mais antigo que o buffer, também recebe ``reset``. O hub é por processo:
+com vários workers, cada conexão só vê as escritas feitas no seu worker.
+"""
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+
+from app.core.config import settings
+from app.services import catalog_events
+from app.services.catalog_events import ProductChange
+from app.services.serialization import dumps
+
+RESET = "reset"
+_CLOSE = object()
+
+
+class FeedFull(Exception):
+    """Limite de assinantes atingido: o chamador deve responder 503."""
+
+
+class Subscriber:
+    __slots__ = ("loop", "queue", "overflowed")
+
+    def __init__(self, loop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def offer(self, item) -> None:
+        """Roda no loop do assinante."""
+        if self.overflowed and item is not _CLOSE:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            if item is _CLOSE:
+                self.queue.put_nowait(_CLOSE)
+            else:
+                self.overflowed = True
+                self.queue.put_nowait(RESET)
+
+
+class ChangeFeed:
+    def __init__(self, buffer_size: int = 1000, queue_size: int = 256, max_subscribers: int = 1000):
+        self.epoch = format(int(time.time() * 1000), "x")
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._seq = itertools.count(1)
+        self.last_seq = 0
+        self._buffer: deque[tuple[int, bytes]] = deque(maxlen=buffer_size)
+        self._subscribers: set[Subscriber] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    # ---------- Publicação ----------
+    def _encode(self, seq: int, change: ProductChange) -> bytes:
+        row = change.after
+        data = dumps({
+            "op": change.op,
+            "id": change.id,
+            "version": seq,
+            "product": row._asdict() if row is not None else None,
+        })
+        return b"id: %s-%d\nevent: %s\ndata: %s\n\n" % (self.epoch.encode(), seq, change.op.encode(), data)
+
+    def apply(self, change: ProductChange) -> None:
+        with self._lock:
+            seq = self.last_seq = next(self._seq)
+            if change.op == "reload":
+                # escrita em massa: não há linhas para repassar, e o replay
+                # anterior não basta para reconstruir a lista. O seq avança
+                # para que quem reconectar depois também receba o reset.
+                self._buffer.clear()
+                item = RESET
+            else:
+                item = (seq, self._encode(seq, change))
+                self._buffer.append(item)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, item)
+            except RuntimeError:  # loop já encerrado
+                self.unsubscribe(sub)
+
+    # ---------- Assinatura ----------
+    def _parse(self, last_event_id: str | None) -> int | None:
+        """seq a partir do qual retomar; None quando o id não é deste processo."""
+        epoch, _, seq = (last_event_id or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def subscribe(self, last_event_id: str | None = None) -> tuple[Subscriber, list]:
+        """
+        Registra um assinante no loop corrente e devolve o replay
+        (eventos depois de ``last_event_id``, ou ``[RESET]`` se houver lacuna)
+        de forma atômica com o registro: nada se perde nem se repete.
+        """
+        sub = Subscriber(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise FeedFull()
+            self._subscribers.add(sub)
+            if not last_event_id:
+                return sub, []
+            since = self._parse(last_event_id)
+            oldest = self._buffer[0][0] if self._buffer else self.last_seq + 1
+            if since is None or since > self.last_seq or since < oldest - 1:
+                return sub, [RESET]
+            return sub, [item for item in self._buffer if item[0] > since]
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def close(self) -> None:
+        """Encerra os streams abertos (ex.: no shutdown)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, _CLOSE)
+            except RuntimeError:
+                pass
+
+    # ---------- Stream SSE ----------
+    def reset_event(self) -> bytes:
+        return b"id: %s-%d\nevent: reset\ndata: {}\n\n" % (self.epoch.encode(), self.last_seq)
+
+    async def stream(self, sub: Subscriber, backlog: list, heartbeat: float, max_seconds: float):
+        """
+        Gera o corpo ``text/event-stream``. Depois de ``max_seconds`` o stream
+        termina e o EventSource reconecta sozinho com ``Last-Event-ID``; assim
+        conexões não seguram um shutdown nem ficam presas a um worker.
+        """
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield b"retry: 3000\n\n"
+            for item in backlog:
+                yield self.reset_event() if item is RESET else item[1]
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    item = await asyncio.wait_for(sub.queue.get(), min(heartbeat, remaining))
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if item is _CLOSE:
+                    return
+                if item is RESET:
+                    sub.overflowed = False
+                    yield self.reset_event()
+                else:
+                    yield item[1]
+        finally:
+            self.unsubscribe(sub)
+
+
+change_feed = ChangeFeed(settings.FEED_BUFFER_EVENTS, settings.FEED_SUBSCRIBER_QUEUE, settings.FEED_MAX_SUBSCRIBERS)
+catalog_events.subscribe(change_feed.apply)
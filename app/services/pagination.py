@@ -0,0 +1,109 @@
+# app/services/pagination.py
+"""
+Paginação no banco: filtros, ORDER BY e LIMIT executados em SQL.
+
+Dois modos convivem:
+- offset: compatível com o front atual (``limit``/``offset``);
+- keyset: cursor opaco sobre ``(price, id)`` ou ``(id)``, custo constante
+  mesmo em páginas profundas (usa o índice em vez de pular linhas).
+"""
+import base64
+import json
+from dataclasses import dataclass
+
+from sqlalchemy import Select, select, tuple_
+
+from app.models.product import Product
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Cursor:
+    by_price: bool
+    last_id: int
+    last_price: float | None = None
+
+
+def encode_cursor(c: Cursor) -> str:
+    raw = {"m": "p" if c.by_price else "i", "i": c.last_id}
+    if c.by_price:
+        raw["p"] = c.last_price
+    data = json.dumps(raw, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> Cursor:
+    try:
+        pad = "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(token + pad))
+        by_price = raw["m"] == "p"
+        return Cursor(
+            by_price=by_price,
+            last_id=int(raw["i"]),
+            last_price=float(raw["p"]) if by_price else None,
+        )
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("Cursor inválido") from exc
+
+
+def name_filter(q: str):
+    """
+    Filtro ``q`` da listagem, das facetas e da exportação: trecho do nome
+    (``ILIKE '%q%'``, "pad" acha "Mousepad"), sem diferenciar maiúsculas; os
+    acentos seguem a collation do banco (a ``utf8mb4_0900_ai_ci`` do MySQL
+    os ignora).
+
+    Fica no SQL, combinado com os outros filtros, a ordenação e o cursor, sem
+    depender do índice em memória de cada worker. Busca por palavras com
+    ranking (prefixo, sem acento) é a ``/products/search``.
+    """
+    return Product.name.ilike(f"%{q}%")
+
+
+def filtered_select(q=None, category=None, min_price=None, max_price=None, columns=None) -> Select:
+    """``columns``: seleciona só essas colunas (tuplas) em vez de entidades ``Product``."""
+    stmt = select(*columns) if columns else select(Product)
+    if q:
+        stmt = stmt.where(name_filter(q))
+    if category:
+        stmt = stmt.where(Product.category == category)
+    if min_price is not None:
+        stmt = stmt.where(Product.price >= min_price)
+    if max_price is not None:
+        stmt = stmt.where(Product.price <= max_price)
+    return stmt
+
+
+def paginate(stmt: Select, order_by_price: bool, limit: int, offset: int = 0, cursor: str | None = None) -> Select:
+    """
+    Aplica ordenação total (price, id) / (id) e a janela da página.
+    Busca ``limit + 1`` linhas para saber se existe próxima página.
+    """
+    if cursor:
+        c = decode_cursor(cursor)
+        if c.by_price != order_by_price:
+            raise InvalidCursor("Cursor não corresponde à ordenação pedida")
+        if c.by_price:
+            # row value: MySQL 8/SQLite resolvem como range no índice (price, id)
+            stmt = stmt.where(tuple_(Product.price, Product.id) > tuple_(c.last_price, c.last_id))
+        else:
+            stmt = stmt.where(Product.id > c.last_id)
+        offset = 0
+
+    if order_by_price:
+        stmt = stmt.order_by(Product.price, Product.id)
+    else:
+        stmt = stmt.order_by(Product.id)
+    return stmt.offset(offset).limit(limit + 1)
+
+
+def split_page(rows: list, order_by_price: bool, limit: int) -> tuple[list, str | None]:
+    """Separa a linha-sentinela e gera o cursor da próxima página."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(Cursor(order_by_price, last.id, last.price if order_by_price else None))
@@ -0,0 +1,220 @@
+# app/services/price_analytics.py
+"""
+Estatísticas de preço vetorizadas (NumPy) sobre um snapshot colunar do catálogo.
+
+O snapshot guarda três colunas paralelas ordenadas por ``(categoria, preço)``:
+``codes`` (int32, código da categoria), ``prices`` (float64) e ``ids``
+(int64). Cada categoria é então uma fatia contígua já ordenada por preço, e
+daí saem:
+
+- contagem por faixa: ``np.searchsorted`` em cada fatia, O(C log n);
+- histograma e percentis: ``np.histogram`` / ``np.percentile``, O(n) em C;
+- estatísticas por categoria: ``np.add.reduceat`` sobre as fatias.
+
+Escritas chegam pelos eventos do catálogo e ficam pendentes (O(1)). A
+primeira consulta seguinte aplica todas de uma vez (``np.isin`` + ``np.insert``,
+O(n) vetorizado). Cada worker do uvicorn mantém a sua cópia; escritas de
+outros workers chegam pela checagem de versão de ``CatalogIndex``.
+"""
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.services import catalog_events
+from app.services.catalog_events import ProductChange
+from app.services.catalog_index import CatalogIndex
+
+# acima desta fração de pendências, reordenar tudo sai mais barato que inserir
+REBUILD_RATIO = 0.1
+
+
+class Snapshot(NamedTuple):
+    codes: np.ndarray
+    prices: np.ndarray
+    ids: np.ndarray
+    bounds: np.ndarray  # fatia da categoria c = [bounds[c], bounds[c + 1])
+
+
+def _sorted(codes, prices, ids, ncat: int) -> Snapshot:
+    order = np.lexsort((ids, prices, codes))
+    codes, prices, ids = codes[order], prices[order], ids[order]
+    return Snapshot(codes, prices, ids, np.searchsorted(codes, np.arange(ncat + 1)))
+
+
+class PriceAnalytics(CatalogIndex):
+    name = "price-analytics"
+
+    def __init__(self, refresh_seconds: float | None = None):
+        super().__init__(refresh_seconds)
+        self._snap: Snapshot | None = None
+        self._categories: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._pending: dict[int, tuple[float, int] | None] = {}
+
+    def __len__(self):
+        return len(self.snapshot().ids) if self.ready else 0
+
+    # ---------- Construção ----------
+    def _code(self, category: str | None) -> int:
+        category = category or ""
+        code = self._codes.get(category)
+        if code is None:
+            # códigos novos entram no fim: a ordenação por código continua válida
+            code = self._codes[category] = len(self._categories)
+            self._categories.append(category)
+        return code
+
+    def rebuild(self, rows) -> None:
+        """Recebe tuplas (id, price, category)."""
+        categories: list[str] = []
+        known: dict[str, int] = {}
+        ids, prices, codes = [], [], []
+        for pid, price, category in rows:
+            category = category or ""
+            code = known.get(category)
+            if code is None:
+                code = known[category] = len(categories)
+                categories.append(category)
+            ids.append(pid)
+            prices.append(price)
+            codes.append(code)
+        snap = _sorted(
+            np.array(codes, dtype=np.int32),
+            np.array(prices, dtype=np.float64),
+            np.array(ids, dtype=np.int64),
+            len(categories),
+        )
+        with self._lock:
+            self._categories, self._codes, self._snap = categories, known, snap
+            self._pending.clear()
+            self._installed()
+
+    def _read(self, db):
+        from app.models.product import Product
+
+        stmt = select(Product.id, Product.price, Product.category).execution_options(yield_per=50_000)
+        return db.execute(stmt)
+
+    # ---------- Atualização incremental ----------
+    def _apply(self, change: ProductChange) -> None:
+        if change.after is None:
+            self._pending[change.before.id] = None
+        else:
+            self._pending[change.after.id] = (change.after.price, self._code(change.after.category))
+
+    def _compact(self) -> None:
+        pending, self._pending = self._pending, {}
+        snap = self._snap
+        ncat = len(self._categories)
+        touched = np.fromiter(pending, dtype=np.int64, count=len(pending))
+        keep = ~np.isin(snap.ids, touched)
+        upserts = [(code, price, pid) for pid, v in pending.items() if v is not None for price, code in [v]]
+
+        if len(upserts) > REBUILD_RATIO * max(len(snap.ids), 1):
+            codes = np.concatenate([snap.codes[keep], np.array([u[0] for u in upserts], dtype=np.int32)])
+            prices = np.concatenate([snap.prices[keep], np.array([u[1] for u in upserts], dtype=np.float64)])
+            ids = np.concatenate([snap.ids[keep], np.array([u[2] for u in upserts], dtype=np.int64)])
+            self._snap = _sorted(codes, prices, ids, ncat)
+            return
+
+        codes, prices, ids = snap.codes[keep], snap.prices[keep], snap.ids[keep]
+        bounds = np.searchsorted(codes, np.arange(ncat + 1))
+        upserts.sort()
+        positions = []
+        for code, price, pid in upserts:
+            lo, hi = bounds[code], bounds[code + 1]
+            positions.append(lo + np.searchsorted(prices[lo:hi], price, side="right"))
+        # np.insert mantém a ordem da lista para posições iguais (upserts já ordenados)
+        codes = np.insert(codes, positions, [u[0] for u in upserts]).astype(np.int32, copy=False)
+        self._snap = Snapshot(
+            codes,
+            np.insert(prices, positions, [u[1] for u in upserts]),
+            np.insert(ids, positions, [u[2] for u in upserts]),
+            np.searchsorted(codes, np.arange(ncat + 1)),
+        )
+
+    def snapshot(self) -> Snapshot:
+        with self._lock:
+            if self._pending:
+                self._compact()
+            return self._snap
+
+    # ---------- Consultas ----------
+    def _slice(self, snap: Snapshot, category: str | None) -> np.ndarray:
+        """Preços (ordenados) da categoria, ou todos (sem ordem) se category for None."""
+        if category is None:
+            return snap.prices
+        code = self._codes.get(category)
+        if code is None or code + 1 >= len(snap.bounds):
+            return snap.prices[:0]
+        return snap.prices[snap.bounds[code]:snap.bounds[code + 1]]
+
+    def count_range(self, min_price: float | None = None, max_price: float | None = None,
+                    category: str | None = None) -> int:
+        snap = self.snapshot()
+        lo = -np.inf if min_price is None else min_price
+        hi = np.inf if max_price is None else max_price
+        if category is not None:
+            prices = self._slice(snap, category)
+            return int(np.searchsorted(prices, hi, side="right") - np.searchsorted(prices, lo, side="left"))
+        # todas as categorias de uma vez: uma busca binária por fatia
+        total = 0
+        for c in range(len(snap.bounds) - 1):
+            prices = snap.prices[snap.bounds[c]:snap.bounds[c + 1]]
+            total += int(np.searchsorted(prices, hi, side="right") - np.searchsorted(prices, lo, side="left"))
+        return total
+
+    def histogram(self, bins: int = 20, category: str | None = None,
+                  min_price: float | None = None, max_price: float | None = None) -> dict:
+        prices = self._slice(self.snapshot(), category)
+        if min_price is not None or max_price is not None:
+            lo = -np.inf if min_price is None else min_price
+            hi = np.inf if max_price is None else max_price
+            prices = prices[(prices >= lo) & (prices <= hi)]
+        if not len(prices):
+            return {"edges": [], "counts": [], "total": 0}
+        counts, edges = np.histogram(prices, bins=bins)
+        return {"edges": np.round(edges, 2).tolist(), "counts": counts.tolist(), "total": int(len(prices))}
+
+    def percentiles(self, qs: list[float], category: str | None = None) -> dict:
+        prices = self._slice(self.snapshot(), category)
+        if not len(prices):
+            return {"count": 0, "percentiles": {}}
+        values = np.percentile(prices, qs)
+        return {
+            "count": int(len(prices)),
+            "percentiles": {f"p{q:g}": round(float(v), 2) for q, v in zip(qs, values)},
+        }
+
+    def category_stats(self) -> list[dict]:
+        snap = self.snapshot()
+        starts, ends = snap.bounds[:-1], snap.bounds[1:]
+        counts = ends - starts
+        present = np.flatnonzero(counts)
+        if not len(present):
+            return []
+        starts, ends, counts = starts[present], ends[present], counts[present]
+        # reduceat exige índices de início; fatias vazias já foram removidas
+        sums = np.add.reduceat(snap.prices, starts)
+        means = sums / counts
+        centered = snap.prices[starts[0]:] - np.repeat(means, counts)
+        stds = np.sqrt(np.add.reduceat(centered * centered, starts - starts[0]) / counts)
+        mid = starts + (counts - 1) // 2
+        medians = (snap.prices[mid] + snap.prices[starts + counts // 2]) / 2
+        return [
+            {
+                "category": self._categories[c],
+                "count": int(n),
+                "min_price": float(snap.prices[s]),
+                "max_price": float(snap.prices[e - 1]),
+                "avg_price": round(float(m), 2),
+                "median_price": round(float(md), 2),
+                "std_price": round(float(sd), 2),
+            }
+            for c, s, e, n, m, md, sd in zip(present, starts, ends, counts, means, medians, stds)
+        ]
+
+
+price_analytics = PriceAnalytics()
+catalog_events.subscribe(price_analytics.apply)
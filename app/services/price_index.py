@@ -0,0 +1,198 @@
+# app/services/price_index.py
+"""
+Índice de preços em memória, de vida longa.
+
+Duas colunas paralelas (``array('d')`` de preços e ``array('q')`` de ids)
+ordenadas por ``(price, id)``. É construído uma vez a partir do banco e
+depois corrigido incrementalmente pelos eventos de escrita, então cada
+consulta é uma busca binária — sem carregar a tabela nem ordenar por
+requisição como o ``merge_sort`` + ``binary_search`` faziam.
+
+Cada worker do uvicorn mantém a sua cópia; escritas de outros workers
+chegam pela checagem de versão de ``CatalogIndex``.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable
+
+from sqlalchemy import select
+
+from app.models.product import Product
+from app.services import catalog_events
+from app.services.catalog_events import ProductChange
+from app.services.catalog_index import CatalogIndex
+
+
+class PriceIndex(CatalogIndex):
+    name = "price-index"
+
+    def __init__(self, refresh_seconds: float | None = None):
+        super().__init__(refresh_seconds)
+        self._prices = array("d")
+        self._ids = array("q")
+
+    def __len__(self):
+        return len(self._ids)
+
+    @classmethod
+    def over(cls, prices, ids) -> "PriceIndex":
+        """
+        Índice somente para consulta sobre colunas já ordenadas por
+        ``(price, id)`` (ex.: ``memoryview`` de um snapshot mapeado).
+        Não assina eventos; ``add``/``remove`` não se aplicam.
+        """
+        index = cls(refresh_seconds=0)
+        index._prices, index._ids = prices, ids
+        index.ready = True
+        return index
+
+    # ---------- Construção ----------
+    def rebuild(self, rows: Iterable[tuple[int, float]]) -> None:
+        """Recebe pares (id, price); ordena uma única vez."""
+        pairs = sorted(rows, key=lambda r: (r[1], r[0]))
+        prices = array("d", (p for _, p in pairs))
+        ids = array("q", (i for i, _ in pairs))
+        with self._lock:
+            self._prices, self._ids = prices, ids
+            self._installed()
+
+    def _read(self, db):
+        return db.execute(select(Product.id, Product.price)).all()
+
+    # ---------- Atualização incremental ----------
+    def _position(self, product_id: int, price: float) -> int:
+        lo = bisect_left(self._prices, price)
+        hi = bisect_right(self._prices, price, lo)
+        # dentro de um mesmo preço os ids também estão ordenados
+        return bisect_left(self._ids, product_id, lo, hi)
+
+    def add(self, product_id: int, price: float) -> None:
+        with self._lock:
+            pos = self._position(product_id, price)
+            if pos < len(self._ids) and self._ids[pos] == product_id and self._prices[pos] == price:
+                return  # já presente (evento reaplicado depois de uma carga)
+            self._prices.insert(pos, price)
+            self._ids.insert(pos, product_id)
+
+    def remove(self, product_id: int, price: float) -> bool:
+        with self._lock:
+            pos = self._position(product_id, price)
+            if pos < len(self._ids) and self._ids[pos] == product_id and self._prices[pos] == price:
+                del self._prices[pos]
+                del self._ids[pos]
+                return True
+            return False
+
+    def _apply(self, change: ProductChange) -> None:
+        before, after = change.before, change.after
+        if before and after and before.price == after.price:
+            return
+        with self._lock:
+            if before:
+                self.remove(before.id, before.price)
+            if after:
+                self.add(after.id, after.price)
+
+    # ---------- Consultas ----------
+    def exact(self, price: float, limit: int | None = None) -> list[int]:
+        with self._lock:
+            lo = bisect_left(self._prices, price)
+            hi = bisect_right(self._prices, price, lo)
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            return self._ids[lo:hi].tolist()
+
+    def range(self, min_price: float | None = None, max_price: float | None = None,
+              limit: int = 50, offset: int = 0) -> list[int]:
+        with self._lock:
+            lo = 0 if min_price is None else bisect_left(self._prices, min_price)
+            hi = len(self._prices) if max_price is None else bisect_right(self._prices, max_price, lo)
+            start = min(lo + offset, hi)
+            return self._ids[start:min(start + limit, hi)].tolist()
+
+    def count_range(self, min_price: float | None = None, max_price: float | None = None) -> int:
+        with self._lock:
+            lo = 0 if min_price is None else bisect_left(self._prices, min_price)
+            hi = len(self._prices) if max_price is None else bisect_right(self._prices, max_price, lo)
+            return max(0, hi - lo)
+
+    def nearest(self, price: float, k: int = 1) -> list[int]:
+        """Os ``k`` ids com preço mais próximo (expansão a partir do ponto de inserção)."""
+        with self._lock:
+            prices, ids = self._prices, self._ids
+            right = bisect_left(prices, price)
+            left = right - 1
+            out: list[int] = []
+            while len(out) < k and (left >= 0 or right < len(prices)):
+                if right >= len(prices) or (left >= 0 and price - prices[left] <= prices[right] - price):
+                    out.append(ids[left]); left -= 1
+                else:
+                    out.append(ids[right]); right += 1
+            return out
+
+    def cheapest(self, k: int) -> list[int]:
+        with self._lock:
+            return self._ids[:k].tolist()
+
+    def priciest(self, k: int) -> list[int]:
+        """Preço decrescente; empates por id decrescente (igual a ORDER BY price DESC, id DESC)."""
+        with self._lock:
+            return self._ids[max(0, len(self._ids) - k):][::-1].tolist()
+
+
+class SqlPriceIndex:
+    """
+    As consultas do ``PriceIndex`` respondidas pelo banco (índice ``price``,
+    que já carrega o id), com a mesma ordem e os mesmos desempates. Serve os
+    workers com snapshot quando ele não reflete uma escrita local, sem montar
+    a cópia do índice por worker.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def _ids(self, *where, order=None, limit: int, offset: int = 0) -> list[int]:
+        order = order or (Product.price, Product.id)
+        stmt = select(Product.id).where(*where).order_by(*order).offset(offset).limit(limit)
+        return list(self.db.scalars(stmt))
+
+    @staticmethod
+    def _desc():
+        return Product.price.desc(), Product.id.desc()
+
+    def exact(self, price: float, limit: int | None = None) -> list[int]:
+        return self._ids(Product.price == price, limit=limit)
+
+    def range(self, min_price: float | None = None, max_price: float | None = None,
+              limit: int = 50, offset: int = 0) -> list[int]:
+        where = []
+        if min_price is not None:
+            where.append(Product.price >= min_price)
+        if max_price is not None:
+            where.append(Product.price <= max_price)
+        return self._ids(*where, limit=limit, offset=offset)
+
+    def nearest(self, price: float, k: int = 1) -> list[int]:
+        # k de cada lado do ponto de inserção, intercalados como em PriceIndex.nearest
+        right = self.db.execute(select(Product.price, Product.id).where(Product.price >= price)
+                                .order_by(Product.price, Product.id).limit(k)).all()
+        left = self.db.execute(select(Product.price, Product.id).where(Product.price < price)
+                               .order_by(*self._desc()).limit(k)).all()
+        out: list[int] = []
+        li = ri = 0
+        while len(out) < k and (li < len(left) or ri < len(right)):
+            if ri >= len(right) or (li < len(left) and price - left[li][0] <= right[ri][0] - price):
+                out.append(left[li][1]); li += 1
+            else:
+                out.append(right[ri][1]); ri += 1
+        return out
+
+    def cheapest(self, k: int) -> list[int]:
+        return self._ids(limit=k)
+
+    def priciest(self, k: int) -> list[int]:
+        return self._ids(order=self._desc(), limit=k)
+
+
+price_index = PriceIndex()
+catalog_events.subscribe(price_index.apply)
@@ -0,0 +1,109 @@
+# app/services/product_cache.py
+"""
+Cache read-through das respostas de produto (JSON já serializado).
+
+Invalidação por contadores de geração, atualizados pelos eventos de
+escrita do catálogo:
+
+- listagens com ``category=X`` usam a geração de X;
+- listagens sem categoria usam a geração global (qualquer escrita);
+- ``GET /products/{id}`` usa a geração da faixa do id (``id % STRIPES``).
+
+A chave é calculada *antes* de ir ao banco; se uma escrita acontecer no
+meio, o resultado antigo fica gravado numa geração que ninguém mais lê e
+sai pelo LRU/TTL.
+
+Os eventos só trazem as escritas deste processo. Antes de consultar o cache
+a rota passa a versão do catálogo lida do banco para ``sync``: se ela passou
+da esperada (última vista + commits locais), outro worker escreveu e a época
+muda, descartando tudo.
+"""
+import hashlib
+import threading
+from collections import defaultdict
+
+from app.core.cache import CacheBackend, LRUTTLCache
+from app.core.config import settings
+from app.services import catalog_events, catalog_version
+from app.services.catalog_events import ProductChange
+
+STRIPES = 1024
+
+
+class ProductCache:
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._all_gen = 0
+        self._category_gen: dict[str, int] = defaultdict(int)
+        self._id_gen = [0] * STRIPES
+        self._version: int | None = None  # versão do catálogo vista por último
+        self._local_at_version = 0
+
+    # ---------- Chaves ----------
+    def product_key(self, product_id: int) -> tuple:
+        return ("p", self._epoch, self._id_gen[product_id % STRIPES], product_id)
+
+    def listing_key(self, category: str | None = None, **params) -> tuple:
+        gen = self._category_gen[category] if category else self._all_gen
+        # parâmetros como vieram (q é substring: caixa e acento dependem da collation)
+        normalized = tuple(sorted((k, v) for k, v in params.items() if v is not None))
+        return ("l", self._epoch, category or None, gen, normalized)
+
+    @staticmethod
+    def listing_fingerprint(key: tuple) -> str:
+        """Resumo dos parâmetros de uma listagem, sem época/geração (que são do processo)."""
+        return hashlib.blake2b(repr((key[2], key[4])).encode(), digest_size=8).hexdigest()
+
+    # ---------- Leitura/escrita ----------
+    def get(self, key: tuple):
+        if not self.enabled:
+            return None
+        return self.backend.get(key)
+
+    def put(self, key: tuple, body: bytes, headers: dict | None = None) -> None:
+        """Guarda o corpo com os headers da resposta (ETag, X-Next-Cursor...)."""
+        if self.enabled:
+            self.backend.set(key, (body, headers), size=len(body))
+
+    # ---------- Invalidação ----------
+    def sync(self, version: int) -> None:
+        """Chamado com a versão do banco antes de qualquer ``get``; escrita de outro worker limpa o cache."""
+        local = catalog_version.local_commits()
+        with self._lock:
+            if self._version is not None:
+                expected = self._version + local - self._local_at_version
+                if version < expected:
+                    return  # leitura anterior a um commit local (ou réplica atrasada)
+                if version > expected:
+                    self._epoch += 1
+                    self.backend.clear()
+            self._version, self._local_at_version = version, local
+
+    def apply(self, change: ProductChange) -> None:
+        with self._lock:
+            if change.op == "reload":
+                self._epoch += 1
+                self.backend.clear()
+                return
+            self._all_gen += 1
+            for row in (change.before, change.after):
+                if row is not None:
+                    self._category_gen[row.category or ""] += 1
+                    self._id_gen[row.id % STRIPES] += 1
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, **self.backend.stats()}
+
+
+product_cache = ProductCache(
+    LRUTTLCache(
+        max_entries=settings.CACHE_MAX_ENTRIES,
+        max_bytes=settings.CACHE_MAX_BYTES,
+        ttl=settings.CACHE_TTL_SECONDS,
+    ),
+    enabled=settings.CACHE_ENABLED,
+)
+catalog_events.subscribe(product_cache.apply)
@@ -1,8 +1,16 @@
-from sqlalchemy.orm import Session
+import heapq
+
 from sqlalchemy import select
+from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.services import bulk_io, catalog_events
+from app.services.catalog_events import ProductRow
+from app.services.pagination import filtered_select
+from app.services.price_index import price_index
+from app.services.serialization import PRODUCT_COLUMNS
+from app.services.write_coalescer import write_coalescer
 
 # ---------- Algoritmos ----------
 def merge_sort(items, key=lambda x: x):
@@ -36,19 +44,20 @@ def binary_search(items, target, key=lambda x: x):
             high = mid - 1
     return None
 
+def top_k(items, k, key=lambda x: x, largest=True):
+    """Seleção por heap de tamanho k: O(n log k), consome ``items`` em streaming."""
+    return heapq.nlargest(k, items, key=key) if largest else heapq.nsmallest(k, items, key=key)
+
 # ---------- CRUD ----------
 def get_all(db: Session, q=None, category=None, min_price=None, max_price=None, order_by_price=False):
-    stmt = select(Product)
-    if q:
-        stmt = stmt.where(Product.name.ilike(f"%{q}%"))
-    if category:
-        stmt = stmt.where(Product.category == category)
-    if min_price is not None:
-        stmt = stmt.where(Product.price >= min_price)
-    if max_price is not None:
-        stmt = stmt.where(Product.price <= max_price)
-    items = db.execute(stmt).scalars().all()
-    return merge_sort(items, key=lambda p: p.price) if order_by_price else items
+    """Entidades ``Product`` em lista; para resultados grandes use ``iter_all``."""
+    stmt = filtered_select(q, category, min_price, max_price)
+    stmt = stmt.order_by(Product.price, Product.id) if order_by_price else stmt.order_by(Product.id)
+    return db.execute(stmt).scalars().all()
+
+def iter_all(db: Session, q=None, category=None, min_price=None, max_price=None, order_by_price=False):
+    """Mesmo filtro de ``get_all`` em streaming: tuplas (id, name, category, price), sem identity map."""
+    return bulk_io.export_rows(db, category, q, min_price, max_price, "price" if order_by_price else "id")
 
 def get_by_id(db: Session, product_id: int):
     product = db.get(Product, product_id)
@@ -57,27 +66,60 @@ def get_by_id(db: Session, product_id: int):
     return product
 
 def create(db: Session, data: ProductCreate):
+    if write_coalescer.enabled:
+        # gravado pelo lote; devolve a entidade, como nos outros caminhos do service
+        return db.get(Product, write_coalescer.submit(data).id)
     product = Product(**data.model_dump())
     db.add(product)
     db.commit()
     db.refresh(product)
+    catalog_events.created(product)
     return product
 
 def update(db: Session, product_id: int, data: ProductUpdate):
     product = get_by_id(db, product_id)
+    before = ProductRow.of(product)
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(product, field, value)
     db.commit()
     db.refresh(product)
+    catalog_events.updated(before, product)
     return product
 
 def delete(db: Session, product_id: int):
     product = get_by_id(db, product_id)
+    before = ProductRow.of(product)
     db.delete(product)
     db.commit()
+    catalog_events.deleted(before)
     return {"detail": "Produto removido com sucesso"}
 
+def top_k_select(k: int, category=None, largest=True):
+    """
+    Top-K em SQL. Com o índice (category, price) o banco lê só k entradas:
+    (price, id) nos dois sentidos é o próprio índice, percorrido de trás para
+    frente no decrescente, sem filesort.
+    """
+    stmt = select(*PRODUCT_COLUMNS)
+    if category:
+        stmt = stmt.where(Product.category == category)
+    if largest:
+        return stmt.order_by(Product.price.desc(), Product.id.desc()).limit(k)
+    return stmt.order_by(Product.price, Product.id).limit(k)
+
+def stream_top_k(db: Session, k: int, category=None, largest=True, chunk: int = 5_000):
+    """Top-k por preço com heap sobre um cursor do servidor, sem carregar a tabela."""
+    stmt = select(*PRODUCT_COLUMNS)
+    if category:
+        stmt = stmt.where(Product.category == category)
+    rows = db.execute(stmt.execution_options(stream_results=True, yield_per=chunk))
+    # desempate por id para bater com ORDER BY price DESC, id DESC / price, id
+    if largest:
+        return top_k(rows, k, key=lambda r: (r.price, r.id))
+    return top_k(rows, k, key=lambda r: (r.price, r.id), largest=False)
+
 def search_by_price(db: Session, price: float):
-    items = db.execute(select(Product)).scalars().all()
-    items_sorted = merge_sort(items, key=lambda p: p.price)
-    return binary_search(items_sorted, price, key=lambda p: p.price)
+    # índice de preços mantido em memória: busca binária sem varrer a tabela
+    price_index.ensure_loaded(db)
+    ids = price_index.exact(price, limit=1)
+    return db.get(Product, ids[0]) if ids else None
@@ -0,0 +1,171 @@
+# app/services/search_index.py
+"""
+Índice invertido em memória sobre os nomes dos produtos.
+
+- tokens com acentos removidos e casefold ("Café" -> "cafe");
+- todo termo da consulta casa por prefixo (autocomplete), termos exatos
+  pontuam mais que prefixos;
+- ranking por IDF com normalização pelo tamanho do nome;
+- atualizado incrementalmente pelos eventos de escrita do catálogo.
+
+Cada worker do uvicorn mantém a sua cópia; escritas de outros workers
+chegam pela checagem de versão de ``CatalogIndex``.
+"""
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from app.services import catalog_events
+from app.services.catalog_events import ProductChange
+from app.services.catalog_index import CatalogIndex
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# limite de termos expandidos por prefixo no ranking e no autocomplete (ex.: "c"
+# casaria quase o vocabulário todo); match_ids não corta
+MAX_PREFIX_EXPANSIONS = 256
+
+
+def fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(fold(text or ""))
+
+
+class SearchIndex(CatalogIndex):
+    name = "search-index"
+
+    def __init__(self, refresh_seconds: float | None = None):
+        super().__init__(refresh_seconds)
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._vocab: list[str] = []  # ordenado, para busca por prefixo
+        self._docs: dict[int, tuple[tuple[str, ...], str]] = {}  # id -> (tokens, categoria)
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ---------- Construção ----------
+    def rebuild(self, rows) -> None:
+        """Recebe tuplas (id, name, category)."""
+        postings: dict[str, set[int]] = defaultdict(set)
+        docs = {}
+        for pid, name, category in rows:
+            tokens = tuple(dict.fromkeys(tokenize(name)))
+            docs[pid] = (tokens, category or "")
+            for t in tokens:
+                postings[t].add(pid)
+        with self._lock:
+            self._postings, self._docs = postings, docs
+            self._vocab = sorted(postings)
+            self._installed()
+
+    def _read(self, db):
+        from app.models.product import Product
+
+        stmt = select(Product.id, Product.name, Product.category).execution_options(yield_per=10_000)
+        return db.execute(stmt)
+
+    # ---------- Atualização incremental ----------
+    def add(self, pid: int, name: str, category: str = "") -> None:
+        tokens = tuple(dict.fromkeys(tokenize(name)))
+        with self._lock:
+            self.remove(pid)
+            self._docs[pid] = (tokens, category or "")
+            for t in tokens:
+                posting = self._postings[t]
+                if not posting:
+                    insort(self._vocab, t)
+                posting.add(pid)
+
+    def remove(self, pid: int) -> None:
+        with self._lock:
+            doc = self._docs.pop(pid, None)
+            if doc is None:
+                return
+            for t in doc[0]:
+                posting = self._postings.get(t)
+                if posting is None:
+                    continue
+                posting.discard(pid)
+                if not posting:
+                    del self._postings[t]
+                    i = bisect_left(self._vocab, t)
+                    if i < len(self._vocab) and self._vocab[i] == t:
+                        del self._vocab[i]
+
+    def _apply(self, change: ProductChange) -> None:
+        if change.after is None:
+            self.remove(change.before.id)
+        else:
+            self.add(change.after.id, change.after.name, change.after.category)
+
+    # ---------- Consultas ----------
+    def _expand(self, prefix: str, limit: int | None = MAX_PREFIX_EXPANSIONS) -> list[str]:
+        i = bisect_left(self._vocab, prefix)
+        out = []
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix) and (limit is None or len(out) < limit):
+            out.append(self._vocab[i])
+            i += 1
+        return out
+
+    def _idf(self, term: str) -> float:
+        return math.log(1 + len(self._docs) / (1 + len(self._postings.get(term, ()))))
+
+    def _candidates(self, q: str, category: str | None, limit: int | None = MAX_PREFIX_EXPANSIONS) -> dict[int, float]:
+        """id -> score parcial; todos os termos da consulta precisam casar (AND)."""
+        qtokens = list(dict.fromkeys(tokenize(q)))
+        if not qtokens:
+            return {}
+        scores: dict[int, float] | None = None
+        for qt in qtokens:
+            weights: dict[int, float] = {}
+            for term in self._expand(qt, limit):
+                w = self._idf(term) * (1.0 if term == qt else 0.5 * len(qt) / len(term))
+                for pid in self._postings[term]:
+                    if weights.get(pid, 0.0) < w:
+                        weights[pid] = w
+            if scores is None:
+                scores = weights
+            else:
+                scores = {pid: s + weights[pid] for pid, s in scores.items() if pid in weights}
+            if not scores:
+                return {}
+        if category:
+            scores = {pid: s for pid, s in scores.items() if self._docs[pid][1] == category}
+        return scores
+
+    def match_ids(self, q: str, category: str | None = None) -> set[int]:
+        """Todos os ids que casam, sem o limite de expansão do ranking."""
+        with self._lock:
+            return set(self._candidates(q, category, limit=None))
+
+    def search(self, q: str, limit: int = 20, category: str | None = None) -> list[int]:
+        """Ids ordenados por relevância (empate: id menor primeiro)."""
+        with self._lock:
+            scores = self._candidates(q, category)
+            ranked = heapq.nlargest(
+                limit, scores.items(),
+                key=lambda kv: (kv[1] / (1 + 0.1 * len(self._docs[kv[0]][0])), -kv[0]),
+            )
+            return [pid for pid, _ in ranked]
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[str]:
+        """Termos do vocabulário que começam com o prefixo, os mais frequentes primeiro."""
+        tokens = tokenize(prefix)
+        if not tokens:
+            return []
+        with self._lock:
+            terms = self._expand(tokens[-1])
+            return heapq.nlargest(limit, terms, key=lambda t: len(self._postings[t]))
+
+
+search_index = SearchIndex()
+catalog_events.subscribe(search_index.apply)
@@ -0,0 +1,44 @@
+# app/services/serialization.py
+"""
+Serialização rápida das respostas de produto.
+
+As listagens selecionam só as colunas de ``ProductOut`` (tuplas ``Row``,
+sem identity map) e o JSON é montado direto em bytes com orjson, sem a
+segunda validação que o ``response_model`` faria objeto a objeto. Os
+valores vêm do banco, que já respeita o schema.
+
+Formato ``compact`` (colunar) para o front:
+``{"columns": ["id", "name", "category", "price"], "rows": [[1, "Mouse", "periferico", 99.9], ...]}``
+"""
+import json
+from typing import Any, Iterable, Sequence
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional
+    orjson = None
+
+from app.models.product import Product
+
+PRODUCT_FIELDS = ("id", "name", "category", "price")
+PRODUCT_COLUMNS = (Product.id, Product.name, Product.category, Product.price)
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def product_dict(row: Sequence) -> dict:
+    return dict(zip(PRODUCT_FIELDS, row))
+
+
+def encode_products(rows: Iterable[Sequence], compact: bool = False) -> bytes:
+    if compact:
+        return dumps({"columns": PRODUCT_FIELDS, "rows": [tuple(r) for r in rows]})
+    return dumps([dict(zip(PRODUCT_FIELDS, r)) for r in rows])
+
+
+def encode_product(row: Sequence) -> bytes:
+    return dumps(dict(zip(PRODUCT_FIELDS, row)))
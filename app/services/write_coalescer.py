@@ -0,0 +1,165 @@
+# app/services/write_coalescer.py
+"""
+Group commit para criações de produto concorrentes (``WRITE_COALESCE_ENABLED``).
+
+Cada ``POST /products`` validado entra numa fila; uma thread de escrita junta
+o que chegou — até ``WRITE_COALESCE_MAX_BATCH`` linhas ou
+``WRITE_COALESCE_LINGER_MS`` depois da primeira, janela usada só quando o
+lote anterior teve mais de uma linha — e grava tudo com um
+INSERT de várias linhas e um único commit (um fsync no MySQL em vez de um
+por requisição). Enquanto um lote grava, os próximos pedidos já se acumulam
+para o seguinte, então sob carga os lotes crescem sozinhos.
+
+Cada requisição espera o seu ``Future`` e recebe a própria linha, com o id
+atribuído: ``bulk_io.insert_rows`` devolve os ids na ordem das linhas
+(RETURNING com ``sort_by_parameter_order``; no MySQL, ``lastrowid`` e o
+passo do auto_increment, ou um INSERT por linha no modo intercalado, ainda
+num único commit).
+
+Se o banco recusar o lote, ele é refeito linha a linha (como na importação
+em massa): só as linhas ruins falham, cada uma com a sua exceção.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.db.replicas import note_write
+from app.models.product import _utcnow
+from app.schemas.product import ProductCreate
+from app.services import catalog_events, catalog_version
+from app.services.bulk_io import insert_rows
+from app.services.catalog_events import ProductRow
+
+_STOP = object()
+
+
+class WriteCoalescer:
+    def __init__(self, max_batch: int = 64, linger_ms: float = 2.0, enabled: bool = False):
+        self.enabled = enabled
+        self.max_batch = max(1, max_batch)
+        self.linger = max(0.0, linger_ms) / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+        self.failed = 0
+        self.largest_batch = 0
+
+    # ---------- Chamadores (threads do pool / loop) ----------
+    def enqueue(self, data: ProductCreate) -> Future:
+        fut: Future = Future()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="write-coalescer", daemon=True)
+                self._thread.start()
+            self._queue.put((data.model_dump(), fut))
+        return fut
+
+    def submit(self, data: ProductCreate) -> ProductRow:
+        """Bloqueia até o commit do lote; relança o erro da própria linha."""
+        row = self.enqueue(data).result()
+        note_write()  # o commit foi em outra thread: marca o read-your-writes aqui
+        return row
+
+    def close(self) -> None:
+        """Grava o que estiver na fila e encerra a thread (shutdown)."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join()
+
+    # ---------- Thread de escrita ----------
+    def _run(self) -> None:
+        last = 1
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            # só espera por mais linhas se o último lote mostrou concorrência;
+            # um cliente sozinho não paga a janela
+            deadline = time.monotonic() + (self.linger if last > 1 else 0.0)
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            last = len(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: list) -> None:
+        from app.db.session import SessionLocal
+
+        stamp = _utcnow()
+        rows = [dict(data, version=1, updated_at=stamp) for data, _ in batch]
+        try:
+            with SessionLocal() as db:
+                ids = insert_rows(db, rows)
+                catalog_version.bump(db)
+                db.commit()
+        except DBAPIError:
+            self._replay(batch, rows)
+            return
+        except Exception as exc:  # a thread não pode morrer com requisições esperando
+            for _, fut in batch:
+                fut.set_exception(exc)
+            self.failed += len(batch)
+            return
+        self.batches += 1
+        self.rows += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for (_, fut), row, pid in zip(batch, rows, ids):
+            self._done(fut, row, pid)
+
+    def _replay(self, batch: list, rows: list[dict]) -> None:
+        # caminho lento e raro: isola a(s) linha(s) que o banco recusou
+        from app.db.session import SessionLocal
+
+        for (_, fut), row in zip(batch, rows):
+            try:
+                with SessionLocal() as db:
+                    pid = insert_rows(db, [row])[0]
+                    catalog_version.bump(db)
+                    db.commit()
+            except Exception as exc:
+                self.failed += 1
+                fut.set_exception(exc)
+                continue
+            self.batches += 1
+            self.rows += 1
+            self._done(fut, row, pid)
+
+    def _done(self, fut: Future, row: dict, pid: int) -> None:
+        out = ProductRow(pid, row["name"], row["category"], row["price"])
+        catalog_events.created(out)
+        fut.set_result(out)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queued": self._queue.qsize(),
+            "batches": self.batches,
+            "rows": self.rows,
+            "failed": self.failed,
+            "avg_batch": round(self.rows / self.batches, 1) if self.batches else 0,
+            "largest_batch": self.largest_batch,
+        }
+
+
+write_coalescer = WriteCoalescer(
+    settings.WRITE_COALESCE_MAX_BATCH, settings.WRITE_COALESCE_LINGER_MS, settings.WRITE_COALESCE_ENABLED
+)
@@ -21,11 +21,40 @@ function fmtMoney(n) {
   return Number(n).toLocaleString("pt-BR", { style: "currency", currency: "BRL" });
 }
 
+// Formato colunar da listagem: {columns: [...], rows: [[...], ...]}
+function decodeCompact(body) {
+  const cols = body.columns || [];
+  return (body.rows || []).map((row) => {
+    const obj = {};
+    cols.forEach((c, i) => { obj[c] = row[i]; });
+    return obj;
+  });
+}
+
 // -------- HTTP --------
+// Respostas com ETag ficam em memória; a próxima leitura envia If-None-Match
+// e, se o servidor responder 304, reaproveita o corpo sem baixá-lo de novo.
+const etagCache = new Map();
+const ETAG_CACHE_MAX = 100;
+
 async function apiGet(url) {
-  const res = await fetch(url, { headers: authHeaders() });
+  const cached = etagCache.get(url);
+  const extra = cached ? { "If-None-Match": cached.etag } : {};
+  const res = await fetch(url, { headers: authHeaders(extra) });
+  if (res.status === 304 && cached) {
+    // reinsere para manter a ordem de uso (LRU simples)
+    etagCache.delete(url);
+    etagCache.set(url, cached);
+    return cached.body;
+  }
   const body = await res.json().catch(() => ({}));
   if (!res.ok) throw new Error(body.detail || `Erro ${res.status}`);
+  const etag = res.headers.get("ETag");
+  if (etag) {
+    etagCache.delete(url);
+    etagCache.set(url, { etag, body });
+    if (etagCache.size > ETAG_CACHE_MAX) etagCache.delete(etagCache.keys().next().value);
+  }
   return body;
 }
 
@@ -67,6 +96,10 @@ function setupNavbar() {
 }
 
 // -------- Produtos --------
+// Página atual em memória: os eventos de /products/changes aplicam o delta
+// nela em vez de refazer a listagem. Sem o feed (ou num "reset"), recarrega.
+const listState = { items: [], filters: null, loading: false, queued: [], lastVersion: 0 };
+
 function renderTable(items = []) {
   const tbody = document.getElementById("tbody");
   tbody.innerHTML = "";
@@ -81,30 +114,118 @@ function renderTable(items = []) {
   });
 }
 
+function readFilters() {
+  const val = (id) => document.getElementById(id).value;
+  return {
+    q: val("q").trim(),
+    category: val("category").trim(),
+    min: val("min_price"),
+    max: val("max_price"),
+    order: document.getElementById("order_by_price").checked,
+    limit: Number(val("limit") || 20),
+    offset: Number(val("offset") || 0),
+  };
+}
+
 async function loadList() {
+  const f = readFilters();
   const params = new URLSearchParams();
-  const q = document.getElementById("q").value.trim();
-  const cat = document.getElementById("category").value.trim();
-  const min = document.getElementById("min_price").value;
-  const max = document.getElementById("max_price").value;
-  const order = document.getElementById("order_by_price").checked;
-  const limit = document.getElementById("limit").value || 20;
-  const offset = document.getElementById("offset").value || 0;
-
-  if (q) params.append("q", q);
-  if (cat) params.append("category", cat);
-  if (min !== "") params.append("min_price", min);
-  if (max !== "") params.append("max_price", max);
-  params.append("order_by_price", order);
-  params.append("limit", limit);
-  params.append("offset", offset);
+  if (f.q) params.append("q", f.q);
+  if (f.category) params.append("category", f.category);
+  if (f.min !== "") params.append("min_price", f.min);
+  if (f.max !== "") params.append("max_price", f.max);
+  params.append("order_by_price", f.order);
+  params.append("limit", f.limit);
+  params.append("offset", f.offset);
+  params.append("format", "compact");
 
+  listState.loading = true;
+  listState.queued = [];
+  let stale = false;
   try {
     const data = await apiGet(`/products/?${params.toString()}`);
-    renderTable(data);
+    listState.items = decodeCompact(data);
+    listState.filters = f;
+    // eventos que chegaram durante o fetch: aplicar de novo é idempotente;
+    // algum que não dá para aplicar localmente pede outra carga
+    stale = listState.queued.filter((c) => !applyChange(c)).length > 0;
+    renderTable(listState.items);
   } catch (err) {
     alert("Erro: " + err.message);
+  } finally {
+    listState.loading = false;
+    listState.queued = [];
+  }
+  if (stale) loadList();
+}
+
+// -------- Feed de alterações (SSE) --------
+// O delta de cada evento é aplicado sobre a página em memória (listState).
+
+function matchesFilters(p, f) {
+  // sem q: categoria e faixa de preço são comparações exatas, iguais às do servidor
+  if (f.category && p.category !== f.category) return false;
+  if (f.min !== "" && p.price < Number(f.min)) return false;
+  if (f.max !== "" && p.price > Number(f.max)) return false;
+  return true;
+}
+
+function compareItems(f) {
+  return f.order ? (a, b) => a.price - b.price || a.id - b.id : (a, b) => a.id - b.id;
+}
+
+// devolve false quando não dá para aplicar localmente e a lista precisa recarregar
+function applyChange(change) {
+  const f = listState.filters;
+  if (!f) return true;
+  const items = listState.items;
+  const idx = items.findIndex((p) => p.id === change.id);
+  const wasFull = items.length >= f.limit;
+  if (idx >= 0) items.splice(idx, 1);
+  const p = change.product;
+  // q é ILIKE no banco (caixa e acento seguem a collation): só o servidor sabe se o item casa
+  if (p && f.q) return false;
+  if (p && matchesFilters(p, f)) {
+    // fora da primeira página não se sabe se o item cai antes dela
+    if (f.offset > 0) return false;
+    const cmp = compareItems(f);
+    let pos = items.findIndex((q) => cmp(p, q) < 0);
+    if (pos < 0) pos = items.length;
+    items.splice(pos, 0, p);
+    if (items.length > f.limit) items.length = f.limit;
+  } else if (idx >= 0 && wasFull) {
+    // página cheia perdeu um item: o próximo só o servidor sabe
+    return false;
+  }
+  return true;
+}
+
+function applyLocal(change) {
+  if (listState.loading) {
+    listState.queued.push(change);
+    return;
   }
+  if (applyChange(change)) renderTable(listState.items);
+  else loadList();
+}
+
+function onFeedEvent(e) {
+  const change = JSON.parse(e.data);
+  if (change.version <= listState.lastVersion) return;
+  listState.lastVersion = change.version;
+  applyLocal(change);
+}
+
+function connectFeed() {
+  if (!window.EventSource) return;
+  // o navegador reconecta sozinho e reenvia Last-Event-ID; o servidor repõe o que faltou
+  const feed = new EventSource("/products/changes");
+  ["create", "update", "delete"].forEach((op) => feed.addEventListener(op, onFeedEvent));
+  feed.addEventListener("reset", () => {
+    // novo processo no servidor (ou lacuna no replay): a versão recomeça
+    listState.lastVersion = 0;
+    loadList();
+  });
 }
 
 async function searchById() {
@@ -132,7 +253,9 @@ async function createProduct(e) {
     const data = await apiPost("/products/", payload);
     out.textContent = "✅ Criado: " + JSON.stringify(data, null, 2);
     f.reset();
-    loadList();
+    // aplica a resposta na página já; o evento "create" do feed chega depois
+    // com o mesmo id e applyChange só troca o item (sem duplicar)
+    applyLocal({ id: data.id, product: data });
   } catch (err) {
     out.textContent = "❌ " + err.message;
   }
@@ -145,4 +268,5 @@ document.addEventListener("DOMContentLoaded", () => {
   document.getElementById("btnSearchId")?.addEventListener("click", searchById);
   document.getElementById("formCreate")?.addEventListener("submit", createProduct);
   loadList();
+  connectFeed();
 });
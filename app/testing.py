@@ -0,0 +1,24 @@
+# app/testing.py
+"""
+Plugin pytest com a fixture ``query_budget`` para pegar regressões N+1.
+
+Ative com ``pytest -p app.testing`` ou ``pytest_plugins = ["app.testing"]``
+no conftest:
+
+    def test_listagem(client, query_budget):
+        with query_budget(2):  # versão do catálogo (ETag) + página
+            client.get("/products/?limit=50")
+
+A contagem vale para qualquer engine e thread (inclusive a do TestClient), então
+use o bloco só em volta da requisição medida.
+"""
+import pytest
+
+from app.core.metrics import QueryBudgetExceeded, query_budget as _query_budget
+
+__all__ = ["QueryBudgetExceeded", "query_budget"]
+
+
+@pytest.fixture
+def query_budget():
+    return _query_budget
@@ -0,0 +1,131 @@
+# benchmarks/_common.py
+"""
+Utilitários compartilhados pelos benchmarks: catálogo e usuários sintéticos
+semeados de forma reprodutível (``generate.py`` expõe isso na linha de
+comando) e medição de latência. A suíte completa fica em ``suite.py``.
+
+Os scripts apontam DB_URL para um SQLite temporário *antes* de importar
+``app``, então rodam sem MySQL:
+
+    python -m benchmarks.bench_pagination --sizes 10000 100000 1000000
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(tempfile.gettempdir()) / "ecommerce-bench"
+BENCH_DIR.mkdir(exist_ok=True)
+os.environ.setdefault("DB_URL", f"sqlite:///{BENCH_DIR / 'app.db'}")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.migrations import upgrade  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+CATEGORIES = [
+    ("periferico", 0.22), ("eletronico", 0.18), ("informatica", 0.15),
+    ("casa", 0.12), ("bebida", 0.08), ("alimento", 0.08),
+    ("livro", 0.07), ("esporte", 0.06), ("brinquedo", 0.04),
+]
+NOUNS = ["mouse", "teclado", "monitor", "cabo", "café", "caneca", "livro",
+         "cadeira", "fone", "headset", "notebook", "bola", "açúcar", "pão"]
+ADJECTIVES = ["sem fio", "gamer", "pro", "básico", "premium", "orgânico",
+              "compacto", "ergonômico", "usb-c", "edição limitada"]
+PASSWORD = "secret123"  # senha de todos os usuários semeados
+
+
+def product_rows(n: int, seed: int = 42):
+    """Gera ``n`` produtos com distribuição de categoria/preço realista."""
+    rng = random.Random(seed)
+    names = [c for c, _ in CATEGORIES]
+    weights = [w for _, w in CATEGORIES]
+    for i in range(n):
+        yield {
+            "name": f"{rng.choice(NOUNS)} {rng.choice(ADJECTIVES)} {i}",
+            "category": rng.choices(names, weights)[0],
+            # cauda longa: maioria barata, poucos itens caros
+            "price": round(rng.lognormvariate(4.0, 1.0), 2),
+        }
+
+
+def populate(engine, n: int, seed: int = 42, chunk: int = 50_000) -> None:
+    """Insere ``n`` produtos de ``product_rows`` em blocos (qualquer dialeto)."""
+    batch = []
+    with engine.begin() as conn:
+        for row in product_rows(n, seed):
+            batch.append(row)
+            if len(batch) >= chunk:
+                conn.execute(insert(Product), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(Product), batch)
+
+
+def user_rows(n: int, password_hash: str):
+    for i in range(n):
+        yield {"full_name": f"Usuário {i}", "email": f"user{i}@example.com", "password_hash": password_hash}
+
+
+def seed_users(engine, n: int, password: str = PASSWORD) -> None:
+    """Recria ``n`` usuários (user{i}@example.com) com a mesma senha: um único pbkdf2."""
+    from app.core.security import hash_password
+
+    with engine.begin() as conn:
+        conn.execute(User.__table__.delete())
+        if n:
+            conn.execute(insert(User), list(user_rows(n, hash_password(password))))
+
+
+def make_db(n: int, seed: int = 42, name: str | None = None, chunk: int = 50_000):
+    """Cria (ou reaproveita) um SQLite com ``n`` produtos e devolve (engine, Session)."""
+    path = BENCH_DIR / (name or f"products-{n}-{seed}.db")
+    fresh = not path.exists()
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Session = sessionmaker(bind=engine, future=True)
+    # schema pelas migrações: também cria índices que faltem em bancos antigos
+    upgrade(engine, log=lambda *_: None)
+    if fresh:
+        populate(engine, n, seed, chunk)
+    return engine, Session
+
+
+def measure(fn, repeat: int = 20, warmup: int = 2) -> dict:
+    """Executa ``fn`` várias vezes e devolve p50/p99/média em ms."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    pick = lambda q: round(samples[min(len(samples) - 1, int(len(samples) * q))], 3)  # noqa: E731
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def bind_app(engine):
+    """Aponta a aplicação (SessionLocal) para o banco do benchmark e devolve o app."""
+    from app.db.session import SessionLocal
+    from app.main import app
+
+    SessionLocal.configure(bind=engine)
+    return app
+
+
+def percentiles(samples_ms: list[float]) -> dict:
+    s = sorted(samples_ms)
+    pick = lambda q: round(s[min(len(s) - 1, int(len(s) * q))], 3)  # noqa: E731
+    return {"n": len(s), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
@@ -0,0 +1,89 @@
+# benchmarks/bench_auth.py
+"""
+Logins/s e requisições autenticadas (/auth/me) por segundo:
+
+- login com hash inline (no event loop) contra o pool dedicado do ``hasher``;
+- latência de /auth/me enquanto logins acontecem em paralelo: com hash
+  inline o event loop fica parado durante cada pbkdf2;
+- /auth/me com e sem o cache de token/usuário (sem cache = decode + SELECT).
+
+Com 1 CPU o pool não aumenta logins/s; o ganho é não travar o resto.
+Controle de admissão e limite de taxa ficam desligados: aqui interessa a
+vazão do hash (ver ``load_admission.py``).
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+os.environ.setdefault("AUTH_RATE_PER_MINUTE", "0")
+
+from benchmarks._common import bind_app, make_db, percentiles, seed_users  # noqa: E402
+from app.core import auth_cache  # noqa: E402
+from app.core.security import hasher  # noqa: E402
+
+
+async def hammer(client, make_request, total, concurrency):
+    samples = []
+    it = iter(range(total))
+
+    async def worker():
+        for i in it:
+            t0 = time.perf_counter()
+            r = await make_request(i)
+            samples.append((time.perf_counter() - t0) * 1000)
+            assert r.status_code == 200, r.text
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"rps": round(total / (time.perf_counter() - t0), 1), **percentiles(samples)}
+
+
+async def main_async(args):
+    engine, _ = make_db(1_000, name="auth-bench.db")
+    seed_users(engine, args.users)
+    app = bind_app(engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        def login(i):
+            return client.post("/auth/login", json={"email": f"user{i % args.users}@example.com", "password": "secret123"})
+
+        print(f"{'cenário':<28} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for mode in ("inline", "thread"):
+            hasher.mode = mode
+            r = await hammer(client, login, args.logins, args.concurrency)
+            print(f"{'login hash ' + mode:<28} {r['rps']:>8} {r['p50_ms']:>8} {r['p99_ms']:>8}")
+
+        tokens = [(await login(i)).json()["access_token"] for i in range(args.users)]
+
+        def me(i):
+            return client.get("/auth/me", headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"})
+
+        for mode in ("inline", "thread"):
+            hasher.mode = mode
+            background = asyncio.create_task(hammer(client, login, args.logins // 2, args.concurrency))
+            r = await hammer(client, me, args.reads // 3, 4)
+            await background
+            print(f"{'me durante logins, ' + mode:<28} {r['rps']:>8} {r['p50_ms']:>8} {r['p99_ms']:>8}")
+
+        for enabled in (False, True):
+            auth_cache.enabled = enabled
+            r = await hammer(client, me, args.reads, args.concurrency)
+            label = "me com cache" if enabled else "me sem cache"
+            print(f"{label:<28} {r['rps']:>8} {r['p50_ms']:>8} {r['p99_ms']:>8}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=50)
+    ap.add_argument("--logins", type=int, default=400)
+    ap.add_argument("--reads", type=int, default=3_000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main_async(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
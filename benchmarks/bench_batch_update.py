@@ -0,0 +1,62 @@
+# benchmarks/bench_batch_update.py
+"""
+Remarcação de preço de N produtos:
+
+- put loop: um PUT /products/{id} por item (get + commit + refresh cada);
+- batch items: um PATCH /products/batch com a lista explícita (UPDATE ... CASE);
+- batch rule: um PATCH /products/batch com a regra "category, price * 0.9".
+
+    python -m benchmarks.bench_batch_update --products 10000
+"""
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from benchmarks._common import bind_app, make_db
+from app.models.product import Product
+
+CATEGORY = "promo"
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=10_000)
+    args = ap.parse_args()
+    n = args.products
+
+    engine, Session = make_db(n, name=f"batch-{n}.db")
+    with engine.begin() as conn:
+        # todos na mesma categoria: a regra atinge exatamente os N produtos
+        conn.execute(Product.__table__.update().values(category=CATEGORY))
+    with Session() as db:
+        ids = db.execute(select(Product.id).order_by(Product.id)).scalars().all()
+
+    app = bind_app(engine)
+    with TestClient(app) as client:
+        t0 = time.perf_counter()
+        for pid in ids:
+            r = client.put(f"/products/{pid}", json={"price": 9.9})
+            assert r.status_code == 200, r.text
+        put_s = time.perf_counter() - t0
+
+        items = [{"id": pid, "fields": {"price": 19.9}} for pid in ids]
+        t0 = time.perf_counter()
+        r = client.patch("/products/batch", json={"items": items})
+        items_s = time.perf_counter() - t0
+        assert r.status_code == 200 and r.json()["updated"] == n, r.text
+
+        t0 = time.perf_counter()
+        r = client.patch("/products/batch", json={"rule": {"category": CATEGORY, "price_factor": 0.9}})
+        rule_s = time.perf_counter() - t0
+        assert r.status_code == 200 and r.json()["updated"] == n, r.text
+
+    print(f"{'modo':<12} {'total s':>9} {'ms/item':>9} {'speedup':>9}")
+    for label, secs in (("put loop", put_s), ("batch items", items_s), ("batch rule", rule_s)):
+        print(f"{label:<12} {secs:>9.3f} {secs * 1000 / n:>9.4f} {put_s / secs:>8.1f}x")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# benchmarks/bench_bst.py
+"""
+OrderedMap (AVL) contra a BST recursiva antiga e contra ``bisect`` numa
+lista ordenada, para 10^5–10^6 chaves.
+
+    python -m benchmarks.bench_bst --sizes 100000 1000000
+"""
+import argparse
+import bisect
+import random
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.algorithms.bst import OrderedMap  # noqa: E402
+
+
+# ---------- Implementação antiga (referência) ----------
+class _LegacyNode:
+    def __init__(self, key, value):
+        self.key, self.value, self.left, self.right = key, value, None, None
+
+
+def legacy_insert(root, key, value):
+    if root is None:
+        return _LegacyNode(key, value)
+    if key < root.key:
+        root.left = legacy_insert(root.left, key, value)
+    elif key > root.key:
+        root.right = legacy_insert(root.right, key, value)
+    else:
+        root.value = value
+    return root
+
+
+def legacy_inorder(root):
+    out = []
+
+    def _walk(n):
+        if not n:
+            return
+        _walk(n.left)
+        out.append(n.value)
+        _walk(n.right)
+
+    _walk(root)
+    return out
+
+
+def legacy_search(root, key):
+    cur = root
+    while cur:
+        if key == cur.key:
+            return cur.value
+        cur = cur.left if key < cur.key else cur.right
+    return None
+
+
+# ---------- Casos ----------
+def timed(fn):
+    t0 = time.perf_counter()
+    try:
+        fn()
+    except RecursionError:
+        return "RecursionError"
+    return f"{(time.perf_counter() - t0) * 1000:.1f}"
+
+
+def run(n: int, seed: int = 7) -> list[tuple[str, str, str]]:
+    rng = random.Random(seed)
+    keys = rng.sample(range(n * 10), n)
+    ordered = sorted(keys)
+    probes = [rng.choice(keys) for _ in range(100_000)]
+    out = []
+
+    state = {}
+
+    def legacy_build(src):
+        def f():
+            root = None
+            for k in src:
+                root = legacy_insert(root, k, k)
+            state["legacy"] = root
+        return f
+
+    def avl_build(src):
+        def f():
+            t = OrderedMap()
+            for k in src:
+                t.insert(k, k)
+            state["avl"] = t
+        return f
+
+    def bisect_build(src):
+        def f():
+            lst = []
+            for k in src:
+                bisect.insort(lst, k)
+            state["bisect"] = lst
+        return f
+
+    out.append(("insert aleatório", "legacy", timed(legacy_build(keys))))
+    out.append(("insert aleatório", "avl", timed(avl_build(keys))))
+    out.append(("insert aleatório", "bisect.insort", timed(bisect_build(keys))))
+    out.append(("bulk load ordenado", "avl.from_sorted",
+                timed(lambda: OrderedMap.from_sorted((k, k) for k in ordered))))
+    out.append(("bulk load ordenado", "sorted()", timed(lambda: sorted(keys))))
+    out.append(("insert em ordem", "legacy",
+                timed(legacy_build(ordered[:5000]) if n > 5000 else legacy_build(ordered))))
+    out.append(("insert em ordem", "avl", timed(avl_build(ordered))))
+
+    legacy, avl, lst = state.get("legacy"), state["avl"], sorted(keys)
+    if legacy is None:  # a construção em ordem sobrescreveu; refaz com chaves aleatórias
+        legacy_build(keys)()
+        legacy = state["legacy"]
+    avl = OrderedMap.from_sorted((k, k) for k in ordered)
+
+    out.append(("100k buscas", "legacy", timed(lambda: [legacy_search(legacy, k) for k in probes])))
+    out.append(("100k buscas", "avl", timed(lambda: [avl.get(k) for k in probes])))
+    out.append(("100k buscas", "bisect", timed(lambda: [bisect.bisect_left(lst, k) for k in probes])))
+
+    lo = ordered[n // 2]
+    out.append(("100 primeiros >= lo", "legacy inorder", timed(lambda: [v for v in legacy_inorder(legacy) if v >= lo][:100])))
+    out.append(("100 primeiros >= lo", "avl.items", timed(lambda: list(islice(avl.items(lo), 100)))))
+    out.append(("100 primeiros >= lo", "bisect", timed(lambda: lst[bisect.bisect_left(lst, lo):][:100])))
+
+    out.append(("100k rank", "avl.rank", timed(lambda: [avl.rank(k) for k in probes])))
+    out.append(("100k rank", "bisect", timed(lambda: [bisect.bisect_left(lst, k) for k in probes])))
+    out.append(("100k select", "avl.select", timed(lambda: [avl.select(i % n) for i in range(100_000)])))
+    out.append(("10k deletes", "avl", timed(lambda: [avl.delete(k) for k in probes[:10_000]])))
+    out.append(("10k deletes", "list.pop", timed(
+        lambda: [lst.pop(i) for k in probes[:10_000] if (i := bisect.bisect_left(lst, k)) < len(lst) and lst[i] == k])))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = ap.parse_args()
+    print(f"{'N':>8} {'caso':<22} {'implementação':<18} {'ms':>14}")
+    for n in args.sizes:
+        for case, impl, ms in run(n):
+            print(f"{n:>8} {case:<22} {impl:<18} {ms:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_pagination.py
+"""
+Latência de GET /products/ por tamanho de catálogo:
+
+- legacy: ``query.all()`` + sort em Python + slice (implementação antiga);
+- offset: ORDER BY/LIMIT/OFFSET no banco;
+- keyset: cursor sobre (price, id) — deve ficar plano com o crescimento.
+"""
+import argparse
+
+from benchmarks._common import make_db, measure
+from app.models.product import Product
+from app.services.pagination import filtered_select, paginate, split_page
+
+LIMIT = 50
+
+
+def legacy_page(db, offset):
+    items = db.query(Product).all()
+    items = sorted(items, key=lambda p: p.price)
+    return items[offset:offset + LIMIT]
+
+
+def sql_page(db, offset=0, cursor=None):
+    stmt = paginate(filtered_select(), True, LIMIT, offset, cursor)
+    return split_page(db.execute(stmt).scalars().all(), True, LIMIT)
+
+
+def deep_cursor(db, depth):
+    # cursor equivalente à página `depth`, obtido sem percorrer as anteriores
+    stmt = paginate(filtered_select(), True, depth * LIMIT - 1)
+    rows = db.execute(stmt).scalars().all()
+    return split_page(rows, True, depth * LIMIT - 1)[1]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--legacy-max", type=int, default=100_000, help="não roda o legado acima disto")
+    args = ap.parse_args()
+
+    print(f"{'N':>9} {'modo':<14} {'p50 ms':>9} {'p99 ms':>9}")
+    for n in args.sizes:
+        engine, Session = make_db(n)
+        with Session() as db:
+            depth = max(1, n // LIMIT // 2)
+            cur = deep_cursor(db, depth)
+            cases = {
+                "offset p1": lambda: sql_page(db, 0),
+                "offset meio": lambda: sql_page(db, depth * LIMIT),
+                "keyset p1": lambda: sql_page(db),
+                "keyset meio": lambda: sql_page(db, cursor=cur),
+            }
+            if n <= args.legacy_max:
+                cases["legacy meio"] = lambda: legacy_page(db, depth * LIMIT)
+            for label, fn in cases.items():
+                r = measure(fn, repeat=5 if label.startswith("legacy") else 30)
+                print(f"{n:>9} {label:<14} {r['p50_ms']:>9} {r['p99_ms']:>9}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_price_analytics.py
+"""
+Estatísticas de preço em Python puro (merge_sort + laços, como o serviço
+faria sobre a lista de produtos) contra o snapshot NumPy de PriceAnalytics.
+
+    python -m benchmarks.bench_price_analytics --sizes 100000 1000000
+
+Os dois lados partem das mesmas linhas (id, price, category) já em memória;
+a leitura do banco aparece à parte em "snapshot load".
+"""
+import argparse
+import random
+import statistics
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from benchmarks._common import make_db, measure
+from app.models.product import Product
+from app.services.catalog_events import ProductChange, ProductRow
+from app.services.price_analytics import PriceAnalytics
+from app.services.products_service import merge_sort
+
+BINS = 50
+QS = [50, 90, 95, 99]
+
+
+# ---------- Python puro ----------
+def py_histogram(rows, bins=BINS):
+    prices = [p for _, p, _ in rows]
+    lo, hi = min(prices), max(prices)
+    width = (hi - lo) / bins or 1.0
+    counts = [0] * bins
+    for p in prices:
+        counts[min(int((p - lo) / width), bins - 1)] += 1
+    return counts
+
+
+def py_percentiles(rows, qs=QS):
+    prices = merge_sort([p for _, p, _ in rows])
+    n = len(prices)
+    return [prices[min(n - 1, int(q / 100 * (n - 1)))] for q in qs]
+
+
+def py_category_stats(rows):
+    groups = defaultdict(list)
+    for _, p, c in rows:
+        groups[c].append(p)
+    out = {}
+    for c, ps in groups.items():
+        ps = merge_sort(ps)
+        out[c] = (len(ps), ps[0], ps[-1], statistics.fmean(ps), ps[len(ps) // 2], statistics.pstdev(ps))
+    return out
+
+
+def py_count(rows, lo, hi):
+    return sum(1 for _, p, _ in rows if lo <= p <= hi)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = ap.parse_args()
+
+    print(f"{'N':>8} {'caso':<24} {'python ms':>11} {'numpy ms':>10} {'speedup':>9}")
+    for n in args.sizes:
+        engine, Session = make_db(n)
+        with Session() as db:
+            rows = db.execute(select(Product.id, Product.price, Product.category)).all()
+            pa = PriceAnalytics()
+            load = measure(lambda: pa.load(db), repeat=1, warmup=0)
+        rng = random.Random(1)
+
+        def ranged_count():
+            lo = rng.uniform(10, 100)
+            return pa.count_range(lo, lo * 2)
+
+        def apply_100_changes():
+            # 100 remarcações chegando por evento + a compactação da consulta seguinte
+            for pid, price, category in rng.sample(rows, 100):
+                pa.apply(ProductChange("update", after=ProductRow(pid, "", category, price * 1.01)))
+            pa.snapshot()
+
+        cases = [
+            ("histogram 50 bins", lambda: py_histogram(rows), lambda: pa.histogram(BINS), 1),
+            ("percentiles", lambda: py_percentiles(rows), lambda: pa.percentiles(QS), 1),
+            ("category stats", lambda: py_category_stats(rows), pa.category_stats, 1),
+            ("count range", lambda: py_count(rows, 50.0, 100.0), ranged_count, 3),
+        ]
+        print(f"{n:>8} {'snapshot load (1x)':<24} {'':>11} {load['p50_ms']:>10}")
+        for label, py_fn, np_fn, py_rep in cases:
+            py = measure(py_fn, repeat=py_rep, warmup=0)["p50_ms"]
+            vec = measure(np_fn, repeat=20)["p50_ms"]
+            print(f"{n:>8} {label:<24} {py:>11} {vec:>10} {py / max(vec, 1e-6):>8.0f}x")
+        upd = measure(apply_100_changes, repeat=20)["p50_ms"]
+        print(f"{n:>8} {'100 updates + compact':<24} {'':>11} {upd:>10}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
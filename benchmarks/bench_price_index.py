@@ -0,0 +1,52 @@
+# benchmarks/bench_price_index.py
+"""
+search_by_price antigo (SELECT * + merge_sort + binary_search a cada
+chamada) contra o PriceIndex em memória (busca binária sobre arrays).
+"""
+import argparse
+import random
+
+from sqlalchemy import select
+
+from benchmarks._common import make_db, measure
+from app.models.product import Product
+from app.services.price_index import PriceIndex
+from app.services.products_service import binary_search, merge_sort
+
+
+def legacy_search(db, price):
+    items = db.execute(select(Product)).scalars().all()
+    items_sorted = merge_sort(items, key=lambda p: p.price)
+    return binary_search(items_sorted, price, key=lambda p: p.price)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = ap.parse_args()
+
+    print(f"{'N':>8} {'caso':<22} {'p50 ms':>10} {'p99 ms':>10}")
+    for n in args.sizes:
+        engine, Session = make_db(n)
+        with Session() as db:
+            prices = [p for (p,) in db.execute(select(Product.price).limit(1000))]
+            rng = random.Random(1)
+            idx = PriceIndex()
+            build = measure(lambda: idx.load(db, force=True), repeat=3, warmup=0)
+            cases = {
+                "legacy exact": (lambda: legacy_search(db, rng.choice(prices)), 3),
+                "index build (1x)": (None, build),
+                "index exact": (lambda: idx.exact(rng.choice(prices), 1), 2000),
+                "index range 50": (lambda: idx.range(50.0, 80.0, 50), 2000),
+                "index nearest k=10": (lambda: idx.nearest(rng.uniform(1, 500), 10), 2000),
+                "index cheapest k=10": (lambda: idx.cheapest(10), 2000),
+                "index add+remove": (lambda: (idx.add(10**9, 55.5), idx.remove(10**9, 55.5)), 2000),
+            }
+            for label, (fn, rep) in cases.items():
+                r = rep if fn is None else measure(fn, repeat=rep)
+                print(f"{n:>8} {label:<22} {r['p50_ms']:>10} {r['p99_ms']:>10}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_serialization.py
+"""
+Custo de montar o JSON de uma página de 200 produtos:
+
+- orm + response_model: entidades ORM validadas pelo FastAPI (caminho antigo);
+- orm + TypeAdapter.dump_json: entidades ORM, validação + dump em bytes;
+- rows + orjson: só as colunas (tuplas) e orjson direto;
+- rows + orjson compact: formato colunar.
+
+Mede a consulta junto (entidades custam também no SELECT) e só a serialização.
+"""
+import json
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from benchmarks._common import make_db, measure
+from app.models.product import Product
+from app.schemas.product import ProductOut
+from app.services.serialization import PRODUCT_COLUMNS, encode_products
+
+PAGE = 200
+
+
+def main():
+    engine, Session = make_db(10_000)
+    adapter = TypeAdapter(list[ProductOut])
+    orm_stmt = select(Product).order_by(Product.id).limit(PAGE)
+    row_stmt = select(*PRODUCT_COLUMNS).order_by(Product.id).limit(PAGE)
+
+    def fastapi_path(objs):
+        # o que o response_model fazia: valida cada objeto e passa pelo jsonable_encoder
+        return json.dumps(
+            jsonable_encoder(adapter.validate_python(objs, from_attributes=True)),
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode()
+
+    with Session() as db:
+        objs = db.execute(orm_stmt).scalars().all()
+        rows = db.execute(row_stmt).all()
+        cases = {
+            "orm + response_model": (
+                lambda: fastapi_path(db.execute(orm_stmt).scalars().all()),
+                lambda: fastapi_path(objs),
+            ),
+            "orm + TypeAdapter": (
+                lambda: adapter.dump_json(adapter.validate_python(db.execute(orm_stmt).scalars().all(), from_attributes=True)),
+                lambda: adapter.dump_json(adapter.validate_python(objs, from_attributes=True)),
+            ),
+            "rows + orjson": (
+                lambda: encode_products(db.execute(row_stmt).all()),
+                lambda: encode_products(rows),
+            ),
+            "rows + orjson compact": (
+                lambda: encode_products(db.execute(row_stmt).all(), compact=True),
+                lambda: encode_products(rows, compact=True),
+            ),
+        }
+        print(f"{'caminho (200 itens)':<24} {'SELECT+JSON p50 ms':>19} {'só JSON p50 ms':>15} {'bytes':>7}")
+        for label, (full, ser) in cases.items():
+            db.expunge_all()
+            r_full = measure(full, repeat=200)
+            r_ser = measure(ser, repeat=500)
+            print(f"{label:<24} {r_full['p50_ms']:>19} {r_ser['p50_ms']:>15} {len(ser()):>7}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_write_coalesce.py
+"""
+Criações de produto por segundo com 1, 16 e 128 clientes simultâneos:
+
+- direto: cada criação é uma transação (INSERT + commit + refresh), como
+  o ``POST /products`` sem coalescência;
+- group commit: as criações passam pelo ``write_coalescer`` e viram um
+  INSERT de várias linhas e um commit por lote.
+
+    python -m benchmarks.bench_write_coalesce --clients 1 16 128 --seconds 3
+
+Cada cliente é uma thread chamando ``products_service.create`` com a
+própria sessão, como uma requisição no threadpool. O SQLite do benchmark
+roda com ``synchronous=FULL`` (um fsync por commit, como o InnoDB com
+``innodb_flush_log_at_trx_commit=1``); escritores concorrentes esperam a
+trava do arquivo.
+"""
+import argparse
+import threading
+import time
+
+from sqlalchemy import event
+
+from benchmarks._common import BENCH_DIR, percentiles
+from app.schemas.product import ProductCreate
+from app.services import products_service
+from app.services.write_coalescer import write_coalescer
+
+
+def make_engine():
+    from sqlalchemy import create_engine
+
+    from app.db.migrations import upgrade
+
+    path = BENCH_DIR / "write-coalesce.db"
+    path.unlink(missing_ok=True)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 60})
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_conn, _):
+        dbapi_conn.execute("PRAGMA synchronous=FULL")
+
+    upgrade(engine, log=lambda *_: None)
+    return engine
+
+
+def client(Session, stop, samples, errors):
+    i = 0
+    while not stop.is_set():
+        payload = ProductCreate(name=f"produto {threading.get_ident()} {i}", category="bench", price=i % 500)
+        t0 = time.perf_counter()
+        try:
+            with Session() as db:
+                products_service.create(db, payload)
+        except Exception:
+            errors.append(1)
+        samples.append((time.perf_counter() - t0) * 1000)
+        i += 1
+
+
+def run(Session, clients: int, seconds: float) -> dict:
+    stop = threading.Event()
+    samples, errors = [], []
+    threads = [threading.Thread(target=client, args=(Session, stop, samples, errors)) for _ in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {"rate": len(samples) / elapsed, "errors": len(errors), **percentiles(samples)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 16, 128])
+    ap.add_argument("--seconds", type=float, default=3.0)
+    args = ap.parse_args()
+
+    from app.db.session import SessionLocal
+
+    engine = make_engine()
+    SessionLocal.configure(bind=engine)
+
+    print(f"{'modo':<14} {'clientes':>8} {'inserts/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'erros':>6} {'lote médio':>11}")
+    for clients in args.clients:
+        for label, coalesce in (("direto", False), ("group commit", True)):
+            write_coalescer.enabled = coalesce
+            write_coalescer.batches = write_coalescer.rows = 0
+            r = run(SessionLocal, clients, args.seconds)
+            avg = write_coalescer.stats()["avg_batch"] if coalesce else 1
+            print(f"{label:<14} {clients:>8} {r['rate']:>10.0f} {r['p50_ms']:>8} {r['p99_ms']:>8} "
+                  f"{r['errors']:>6} {avg:>11}")
+    write_coalescer.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/check_replicas.py
+"""
+Roteamento de leituras com dois SQLite fazendo papel de réplicas:
+
+    python -m benchmarks.check_replicas
+
+- as réplicas são cópias do primário com o nome do produto 1 trocado, para
+  ver de onde cada leitura veio;
+- leituras alternam entre as réplicas (round-robin);
+- depois de um PUT, o cookie ``db_primary_until`` manda o cliente para o
+  primário até a janela expirar;
+- com uma réplica fora do ar, as leituras ficam na outra; com as duas, no primário.
+
+Com MySQL, aponte DB_URL/DB_REPLICA_URLS para servidores reais e pule a cópia.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(tempfile.mkdtemp(prefix="ecommerce-replicas-"))
+PRIMARY = ROOT / "primary.db"
+REPLICAS = [ROOT / f"r{i}" / "replica.db" for i in range(2)]
+WINDOW = 1.0
+
+os.environ["DB_URL"] = f"sqlite:///{PRIMARY}"
+os.environ["DB_REPLICA_URLS"] = ",".join(f"sqlite:///{p}" for p in REPLICAS)
+os.environ["DB_REPLICA_CHECK_SECONDS"] = "0.2"
+os.environ["DB_READ_YOUR_WRITES_SECONDS"] = str(WINDOW)
+os.environ["CACHE_ENABLED"] = "false"  # toda leitura precisa ir ao banco
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, insert, text  # noqa: E402
+
+from benchmarks._common import product_rows  # noqa: E402
+from app.db.migrations import upgrade  # noqa: E402
+from app.db.session import engine, read_router, replica_engines  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.product import Product  # noqa: E402
+
+
+def seed():
+    upgrade(engine, log=lambda *_: None)
+    with engine.begin() as conn:
+        conn.execute(insert(Product), list(product_rows(100, seed=1)))
+    for i, path in enumerate(REPLICAS):
+        path.parent.mkdir()
+        shutil.copy(PRIMARY, path)
+        replica = create_engine(f"sqlite:///{path}")
+        with replica.begin() as conn:
+            conn.execute(text("UPDATE products SET name = :n WHERE id = 1"), {"n": f"réplica {i}"})
+        replica.dispose()
+
+
+def sources(client, n=20) -> Counter:
+    return Counter(client.get("/products/1").json()["name"] for _ in range(n))
+
+
+def take_down(i: int):
+    # some com o arquivo e descarta as conexões abertas: novas conexões falham
+    REPLICAS[i].parent.rename(REPLICAS[i].parent.with_name(f"r{i}-off"))
+    replica_engines[i].dispose()
+
+
+def main():
+    seed()
+    with TestClient(app) as client:
+        print("round-robin:        ", dict(sources(client)))
+
+        client.put("/products/1", json={"name": "primário (atualizado)"})
+        print("logo após escrita:  ", dict(sources(client, 5)))
+        time.sleep(WINDOW + 0.1)
+        print("janela expirada:    ", dict(sources(client, 4)))
+
+        take_down(0)
+        time.sleep(0.5)  # a verificação periódica percebe a queda
+        print("uma réplica fora:   ", dict(sources(client, 6)))
+
+        take_down(1)
+        time.sleep(0.5)
+        print("todas fora:         ", dict(sources(client, 4)))
+        print("roteador:", read_router.stats())
+    shutil.rmtree(ROOT, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
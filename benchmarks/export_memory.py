@@ -0,0 +1,80 @@
+# benchmarks/export_memory.py
+"""
+Pico de memória (RSS) para exportar o catálogo inteiro:
+
+    python -m benchmarks.export_memory --products 1000000
+
+Cada modo roda num processo novo e relata ``ru_maxrss``:
+
+- buffered: como ``get_all`` + serialização da lista — entidades ``Product``
+  com identity map, tudo em memória antes do primeiro byte;
+- buffered nome: tuplas em lista, ``sorted`` por nome sem acento e um
+  único ``dumps``;
+- stream id / stream nome: ``bulk_io.export_rows`` + ``encode_chunks``
+  (cursor do servidor, ``yield_per``; ordem por nome pela ordenação
+  externa) escrevendo num destino descartável, como o ``StreamingResponse``.
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks._common import make_db
+
+MODES = ("buffered", "buffered-name", "stream-id", "stream-name")
+
+
+def _sink(chunks) -> int:
+    return sum(len(c) for c in chunks)
+
+
+def child(mode: str, n: int) -> None:
+    from sqlalchemy import select
+
+    from app.models.product import Product
+    from app.services import bulk_io
+    from app.services.search_index import fold
+    from app.services.serialization import PRODUCT_COLUMNS, encode_products
+
+    _, Session = make_db(n)
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    with Session() as db:
+        if mode == "buffered":
+            items = db.execute(select(Product).order_by(Product.id)).scalars().all()
+            size = len(encode_products((p.id, p.name, p.category, p.price) for p in items))
+        elif mode == "buffered-name":
+            rows = db.execute(select(*PRODUCT_COLUMNS)).all()
+            rows.sort(key=lambda r: (fold(r[1]), r[0]))
+            size = len(encode_products(rows))
+        else:
+            rows = bulk_io.export_rows(db, order=mode.split("-")[1])
+            size = _sink(bulk_io.encode_chunks(rows, "json", 1_000))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode} {time.perf_counter() - t0:.2f} {base / 1024:.0f} {peak / 1024:.0f} {size}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=1_000_000)
+    ap.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        return child(args.child, args.products)
+
+    make_db(args.products)  # gera o banco antes, fora da medição
+    root = Path(__file__).resolve().parent.parent
+    print(f"{'modo':<14} {'segundos':>9} {'RSS inicial MiB':>16} {'pico MiB':>9} {'corpo MiB':>10}")
+    for mode in MODES:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.export_memory", "--products", str(args.products), "--child", mode],
+            cwd=root, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        _, seconds, base, peak, size = out
+        print(f"{mode:<14} {float(seconds):>9.2f} {base:>16} {peak:>9} {int(size) / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/load_admission.py
+"""
+Leituras de produto enquanto uma enxurrada de logins chega ao mesmo processo:
+
+    python -m benchmarks.load_admission --flood 256 --seconds 5
+
+Para cada modo mede a latência de GET /products/{id} (alguns clientes
+constantes) sem carga e durante o pico de POST /auth/login:
+
+- sem admissão: logins ocupam o threadpool e o pool de conexões e as
+  leituras esperam atrás deles;
+- admissão: o grupo ``auth`` tem poucas vagas e fila curta; o excedente
+  volta 503 + Retry-After na hora e as leituras mantêm o p99;
+- admissão + taxa: além disso o balde por IP/e-mail corta o flood (429)
+  antes do banco e do pbkdf2.
+
+O gerador de carga roda no mesmo processo (e na mesma CPU) que o app, então
+os números absolutos são pessimistas. Com 1 CPU, deixe o grupo ``auth``
+pequeno (ex.: ``ADMISSION_AUTH_CONCURRENCY=2``): cada pbkdf2 admitido
+disputa a CPU com as leituras.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks._common import make_db, percentiles, seed_users
+from app.api.routes import build_router
+from app.core import admission
+from app.core.admission import AdmissionMiddleware, auth_limiter
+from app.db.session import SessionLocal
+from app.services.product_cache import product_cache
+
+USERS = 50
+
+
+def build_app(with_admission: bool) -> FastAPI:
+    app = FastAPI()
+    app.include_router(build_router())
+    if with_admission:
+        app.add_middleware(AdmissionMiddleware, controller=admission.from_settings())
+    return app
+
+
+async def reader(client, n_products, stop, samples, statuses):
+    rng = random.Random()
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        r = await client.get(f"/products/{rng.randint(1, n_products)}")
+        samples.append((time.perf_counter() - t0) * 1000)
+        statuses[r.status_code] += 1
+
+
+async def flooder(client, stop, statuses):
+    rng = random.Random()
+    while not stop.is_set():
+        i = rng.randrange(USERS)
+        # metade das tentativas com senha errada, como num ataque de força bruta
+        password = "secret123" if rng.random() < 0.5 else "errada"
+        r = await client.post("/auth/login", json={"email": f"user{i}@example.com", "password": password})
+        statuses[r.status_code] += 1
+        if r.status_code in (429, 503):
+            # cliente bem-comportado respeitaria o Retry-After; o flood só respira
+            await asyncio.sleep(0.1)
+
+
+async def scenario(app, n_products, readers, flood, seconds):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        stop = asyncio.Event()
+        samples, read_status, login_status = [], Counter(), Counter()
+        tasks = [asyncio.create_task(reader(client, n_products, stop, samples, read_status)) for _ in range(readers)]
+        tasks += [asyncio.create_task(flooder(client, stop, login_status)) for _ in range(flood)]
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    return {**percentiles(samples), "reads": dict(read_status), "logins": dict(login_status)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=10_000)
+    ap.add_argument("--readers", type=int, default=8)
+    ap.add_argument("--flood", type=int, default=256, help="clientes simultâneos fazendo login")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    args = ap.parse_args()
+
+    engine, _ = make_db(args.products, name=f"admission-{args.products}.db")
+    seed_users(engine, USERS)
+    SessionLocal.configure(bind=engine)
+    product_cache.enabled = False  # toda leitura vai ao banco
+
+    modes = (
+        ("sem admissão", False, False),
+        ("admissão", True, False),
+        ("admissão + taxa", True, True),
+    )
+
+    async def all_runs():
+        print(f"{'modo':<18} {'carga':<8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'leituras':>9}  logins por status")
+        for label, with_admission, with_rate in modes:
+            auth_limiter.enabled = with_rate
+            auth_limiter.clear()
+            app = build_app(with_admission)
+            for load, flood in (("idle", 0), ("flood", args.flood)):
+                r = await scenario(app, args.products, args.readers, flood, args.seconds)
+                print(f"{label:<18} {load:<8} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} "
+                      f"{r['n']:>9}  {r['logins'] or '-'}  leituras {r['reads']}")
+
+    asyncio.run(all_runs())
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
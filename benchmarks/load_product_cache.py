@@ -0,0 +1,59 @@
+# benchmarks/load_product_cache.py
+"""
+Carga em processo sobre GET /products/{id} e GET /products/ com o cache
+de produtos ligado e desligado. A distribuição de acesso é enviesada
+(poucos produtos/filtros "quentes"), como num catálogo real, e ~1% das
+requisições são escritas, que invalidam o cache.
+"""
+import argparse
+import random
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks._common import CATEGORIES, bind_app, make_db, percentiles
+from app.services.product_cache import product_cache
+
+
+def scenario(client, n_products, requests, seed, write_ratio=0.01):
+    rng = random.Random(seed)
+    cats = [c for c, _ in CATEGORIES]
+    samples = []
+    for _ in range(requests):
+        r = rng.random()
+        if r < write_ratio:
+            pid = rng.randint(1, n_products)
+            url, method, body = f"/products/{pid}", "put", {"price": round(rng.uniform(1, 500), 2)}
+        elif r < 0.6:
+            pid = min(n_products, int(rng.paretovariate(1.2)))
+            url, method, body = f"/products/{pid}", "get", None
+        else:
+            params = f"category={rng.choice(cats[:4])}&limit=50&order_by_price={rng.random() < 0.5}".lower()
+            url, method, body = f"/products/?{params}", "get", None
+        t0 = time.perf_counter()
+        resp = client.get(url) if method == "get" else client.put(url, json=body)
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert resp.status_code < 500, resp.text
+    return percentiles(samples)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=100_000)
+    ap.add_argument("--requests", type=int, default=5_000)
+    args = ap.parse_args()
+
+    engine, _ = make_db(args.products)
+    app = bind_app(engine)
+    with TestClient(app) as client:
+        for enabled in (False, True):
+            product_cache.enabled = enabled
+            product_cache.backend.clear()
+            r = scenario(client, args.products, args.requests, seed=3)
+            label = "cache ligado" if enabled else "sem cache"
+            print(f"{label:<14} p50={r['p50_ms']}ms p95={r['p95_ms']}ms p99={r['p99_ms']}ms")
+        print("stats:", product_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
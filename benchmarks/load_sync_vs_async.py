@@ -0,0 +1,82 @@
+# benchmarks/load_sync_vs_async.py
+"""
+Vazão e latência das rotas de leitura de produtos com a pilha síncrona
+(threadpool + Session) e a assíncrona (AsyncSession + aiosqlite), em
+vários níveis de concorrência. O cache de produtos fica desligado para
+que toda requisição vá ao banco.
+
+    python -m benchmarks.load_sync_vs_async --concurrency 1 16 64 256
+
+Com SQLite local não há espera de rede: o aiosqlite roda cada conexão numa
+thread e o ganho do modo assíncrono é pequeno ou negativo. A diferença
+aparece com o MySQL real, onde a requisição síncrona prende um worker do
+threadpool durante todo o round trip (aponte DB_URL/ASYNC_DB_URL para ele).
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks._common import make_db, percentiles
+from app.api.routes import build_router
+from app.db.session import SessionLocal, init_async_engine
+from app.services.product_cache import product_cache
+
+
+async def run(app, n_products, requests, concurrency, seed=11):
+    rng = random.Random(seed)
+    urls = [
+        f"/products/{rng.randint(1, n_products)}" if rng.random() < 0.7
+        else f"/products/?limit=50&order_by_price=true&min_price={rng.randint(1, 200)}"
+        for _ in range(requests)
+    ]
+    samples = []
+    queue = iter(urls)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for url in queue:
+                t0 = time.perf_counter()
+                r = await client.get(url)
+                samples.append((time.perf_counter() - t0) * 1000)
+                assert r.status_code == 200, r.text
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+    return {"rps": round(requests / elapsed, 1), **percentiles(samples)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=100_000)
+    ap.add_argument("--requests", type=int, default=2_000)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64, 256])
+    args = ap.parse_args()
+
+    engine, _ = make_db(args.products)
+    SessionLocal.configure(bind=engine)
+    init_async_engine(str(engine.url).replace("sqlite://", "sqlite+aiosqlite://", 1))
+    product_cache.enabled = False
+
+    apps = {}
+    for mode in ("sync", "async"):
+        apps[mode] = FastAPI()
+        apps[mode].include_router(build_router(async_db=mode == "async"))
+
+    async def all_runs():
+        # um único event loop: o pool do engine assíncrono fica preso ao loop que o criou
+        print(f"{'modo':<6} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+        for conc in args.concurrency:
+            for mode, app in apps.items():
+                r = await run(app, args.products, args.requests, conc)
+                print(f"{mode:<6} {conc:>5} {r['rps']:>9} {r['p50_ms']:>9} {r['p99_ms']:>9}")
+
+    asyncio.run(all_runs())
+
+
+if __name__ == "__main__":
+    main()
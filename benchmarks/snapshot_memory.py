@@ -0,0 +1,157 @@
+# benchmarks/snapshot_memory.py
+"""
+Memória por worker e tempo de partida do app real: sem snapshot vs snapshot
+mapeado.
+
+    python -m benchmarks.snapshot_memory --products 1000000 --workers 4
+
+Sobe ``--workers`` processos ``uvicorn app.main:app`` (um por porta, como os
+workers do ``uvicorn --workers``, mas endereçáveis um a um) sobre o mesmo
+SQLite, em dois modos:
+
+- ``próprio``: sem ``SNAPSHOT_PATH``; o aquecimento monta os índices em
+  memória de cada worker a partir do banco;
+- ``snapshot``: ``SNAPSHOT_PATH`` aponta para o arquivo publicado
+  (``catalog_snapshot.publish``), que cada worker mapeia.
+
+Para cada worker: tempo até ``/ready`` responder 200; depois um tráfego de
+detalhe (``GET /products/{id}``) e consultas por preço, e por fim RSS e PSS
+lidos de ``/proc/<pid>/smaps_rollup`` com todos vivos (o PSS divide as
+páginas compartilhadas entre quem as mapeia). ``--routes all`` inclui busca
+e estatísticas, que no modo snapshot carregam sob demanda. Só Linux.
+"""
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from benchmarks._common import BENCH_DIR, make_db
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _memory_kb(pid: int) -> dict:
+    out = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                out[key.lower()] = int(rest.split()[0])
+    return out
+
+
+def _get(port: int, path: str) -> int:
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=60) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+
+def _wait_ready(proc, port: int, timeout: float = 600.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"worker na porta {port} saiu com código {proc.returncode}")
+        try:
+            if _get(port, "/ready") == 200:
+                return
+        except OSError:
+            pass  # ainda subindo
+        time.sleep(0.05)
+    raise TimeoutError(f"worker na porta {port} não ficou pronto")
+
+
+def _traffic(port: int, n_products: int, requests: int, routes: str, seed: int) -> None:
+    rng = random.Random(seed)
+    paths = [
+        lambda: f"/products/{rng.randint(1, n_products)}",
+        lambda: f"/products/price/range?min_price={rng.uniform(1, 400):.2f}&limit=50",
+        lambda: f"/products/price/nearest?price={rng.uniform(1, 500):.2f}&k=10",
+        lambda: "/products/price/cheapest?k=10",
+    ]
+    if routes == "all":
+        paths += [
+            lambda: f"/products/search?q={rng.choice(['mouse', 'cafe', 'teclado gamer', 'cab'])}",
+            lambda: "/products/stats/categories",
+        ]
+    for _ in range(requests):
+        status = _get(port, rng.choice(paths)())
+        if status >= 500:
+            raise RuntimeError(f"worker na porta {port} respondeu {status}")
+
+
+def run(mode: str, db_path: str, snap_path: str, args) -> list[dict]:
+    env = dict(
+        os.environ,
+        DB_URL=f"sqlite:///{db_path}",
+        SNAPSHOT_PATH=snap_path if mode == "snapshot" else "",
+        DB_AUTO_MIGRATE="false",
+        PYTHONPATH=str(ROOT),
+    )
+    ports = [args.port + i for i in range(args.workers)]
+    started = time.perf_counter()
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--log-level", "warning"],
+            cwd=ROOT, env=env,
+        )
+        for port in ports
+    ]
+    try:
+        out = []
+        for proc, port in zip(procs, ports):
+            _wait_ready(proc, port)
+            out.append({"ready_ms": (time.perf_counter() - started) * 1000})
+        for i, port in enumerate(ports):
+            _traffic(port, args.products, args.requests, args.routes, seed=i)
+        for res, proc in zip(out, procs):
+            res.update(_memory_kb(proc.pid))  # todos vivos ao mesmo tempo
+        return out
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=1_000_000)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--requests", type=int, default=200, help="requisições por worker antes de medir")
+    ap.add_argument("--routes", choices=("snapshot", "all"), default="snapshot")
+    ap.add_argument("--port", type=int, default=8700)
+    args = ap.parse_args()
+
+    engine, Session = make_db(args.products)
+    db_path = engine.url.database
+    snap_path = BENCH_DIR / f"catalog-{args.products}.snap"
+
+    from app.services import catalog_snapshot
+
+    with Session() as db:
+        info = catalog_snapshot.publish(db, snap_path)
+    print(f"publicação: {info['rows']} linhas em {info['seconds']}s, "
+          f"{snap_path.stat().st_size / 2**20:.1f} MiB")
+    engine.dispose()
+
+    print(f"{'modo':<10} {'pronto ms (máx)':>16} {'RSS MiB/worker':>15} {'PSS MiB/worker':>15} {'PSS total MiB':>14}")
+    for label, mode in (("próprio", "own"), ("snapshot", "snapshot")):
+        res = run(mode, db_path, str(snap_path), args)
+        ready = max(r["ready_ms"] for r in res)
+        rss = statistics.mean(r["rss"] for r in res) / 1024
+        pss = [r["pss"] / 1024 for r in res]
+        print(f"{label:<10} {ready:>16.0f} {rss:>15.1f} {statistics.mean(pss):>15.1f} {sum(pss):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
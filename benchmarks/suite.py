@@ -0,0 +1,283 @@
+# benchmarks/suite.py
+"""
+Suíte reprodutível de desempenho: micro-benchmarks dos algoritmos de
+``app/services`` e ``app/algorithms`` e cenários HTTP em processo sobre o
+app completo (middlewares incluídos), num catálogo sintético semeado.
+
+    python -m benchmarks.suite --products 100000 --out base.json
+    python -m benchmarks.suite --products 100000 --baseline base.json
+    python -m benchmarks.suite --only http --filter login --concurrency 32
+
+Cada caso reporta p50/p95/p99 (ms); os cenários HTTP também req/s e erros.
+Com ``--out`` o resultado vai para JSON (com metadados: commit, Python,
+tamanho, semente). Com ``--baseline`` cada caso é comparado ao arquivo
+salvo: latência acima de ``--tolerance`` (padrão 20%), ou vazão abaixo
+disso, conta como regressão e o processo sai com código 1 (útil em CI).
+Compare só resultados da mesma máquina e do mesmo ``--products``.
+
+Controle de admissão e limite de taxa ficam desligados: a suíte mede o
+custo das rotas, não as proteções de sobrecarga (ver ``load_admission.py``).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+os.environ.setdefault("AUTH_RATE_PER_MINUTE", "0")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from benchmarks._common import CATEGORIES, NOUNS, PASSWORD, bind_app, make_db, measure, percentiles, seed_users  # noqa: E402
+from app.algorithms.bst import OrderedMap  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.services.pagination import filtered_select, paginate, split_page  # noqa: E402
+from app.services.price_analytics import PriceAnalytics  # noqa: E402
+from app.services.price_index import PriceIndex  # noqa: E402
+from app.services.products_service import binary_search, merge_sort, top_k  # noqa: E402
+from app.services.search_index import SearchIndex  # noqa: E402
+
+USERS = 100
+SEARCHES = ["mouse", "cafe", "tecl", "mouse sem", "premium cadeira", "acucar organico"]
+
+
+# ---------- Micro-benchmarks ----------
+def micro_cases(db, rows, rng: random.Random, micro_max: int):
+    """(nome, função, repetições, tamanho da entrada)."""
+    sample = rows[:micro_max]
+    prices = [p for _, p, _ in sample]
+    sorted_prices = sorted(prices)
+    cats = [c for c, _ in CATEGORIES]
+
+    price_index = PriceIndex()
+    price_index.rebuild((pid, p) for pid, p, _ in rows)
+    search_index = SearchIndex()
+    search_index.load(db)
+    analytics = PriceAnalytics()
+    analytics.rebuild(rows)
+    keys = [rng.random() for _ in range(len(sample))]
+    ordered = OrderedMap.from_sorted((k, None) for k in sorted(keys))
+
+    def bst_insert():
+        m = OrderedMap()
+        for k in keys[:10_000]:
+            m.insert(k)
+
+    def keyset_page():
+        stmt = paginate(filtered_select(rng.choice(NOUNS), db=db), True, 50, 0, None)
+        split_page(db.execute(stmt).scalars().all(), True, 50)
+
+    yield "merge_sort", lambda: merge_sort(prices), 3, len(prices)
+    yield "binary_search", lambda: binary_search(sorted_prices, rng.choice(prices)), 2000, len(prices)
+    yield "top_k_heap", lambda: top_k(sample, 10, key=lambda r: r[1]), 5, len(sample)
+    yield "price_index_build", lambda: PriceIndex().rebuild((pid, p) for pid, p, _ in rows), 3, len(rows)
+    yield "price_index_range", lambda: price_index.range(50.0, 80.0, 50), 2000, len(rows)
+    yield "price_index_nearest", lambda: price_index.nearest(rng.uniform(1, 500), 10), 2000, len(rows)
+    yield "search_index_search", lambda: search_index.search(rng.choice(SEARCHES), 20), 500, len(rows)
+    yield "search_index_suggest", lambda: search_index.suggest(rng.choice(SEARCHES)[:3], 10), 500, len(rows)
+    yield "analytics_histogram", lambda: analytics.histogram(50, rng.choice(cats)), 200, len(rows)
+    yield "analytics_percentiles", lambda: analytics.percentiles([50, 95, 99]), 50, len(rows)
+    yield "bst_insert_10k", bst_insert, 5, 10_000
+    yield "bst_get", lambda: ordered.get(rng.choice(keys)), 5000, len(keys)
+    yield "bst_range_100", lambda: list(zip(range(100), ordered.items(lo=rng.random()))), 2000, len(keys)
+    yield "sql_filtered_page", keyset_page, 50, len(rows)
+
+
+def run_micro(Session, rng, micro_max: int, name_filter: str | None) -> dict:
+    results = {}
+    with Session() as db:
+        rows = [tuple(r) for r in db.execute(select(Product.id, Product.price, Product.category).order_by(Product.id))]
+        for name, fn, repeat, size in micro_cases(db, rows, rng, micro_max):
+            if name_filter and name_filter not in name:
+                continue
+            r = measure(fn, repeat=repeat, warmup=1)
+            results[f"micro.{name}"] = {**r, "n": repeat, "size": size}
+            print(f"  {name:<26} {r['p50_ms']:>10} {r['p95_ms']:>10} {r['p99_ms']:>10}   (n={size})")
+    return results
+
+
+# ---------- Cenários HTTP ----------
+def http_scenarios(n_products: int, tokens: list[str]):
+    """Cada cenário: função (client, rng, estado) -> requisição pendente."""
+    cats = [c for c, _ in CATEGORIES]
+
+    def browse(client, rng, state):
+        if rng.random() < 0.7:
+            # popularidade enviesada: poucos produtos recebem a maior parte dos acessos
+            return client.get(f"/products/{min(n_products, int(rng.paretovariate(1.1)))}")
+        return client.get("/products/", params={"category": rng.choice(cats), "limit": 50})
+
+    def search(client, rng, state):
+        return client.get("/products/search", params={"q": rng.choice(SEARCHES), "limit": 20})
+
+    async def paginate_(client, rng, state):
+        params = {"order_by_price": "true", "limit": 50}
+        if state.get("cursor"):
+            params["cursor"] = state["cursor"]
+        r = await client.get("/products/", params=params)
+        # cada worker percorre o catálogo página a página e recomeça no fim
+        state["cursor"] = r.headers.get("X-Next-Cursor")
+        return r
+
+    def login(client, rng, state):
+        i = rng.randrange(USERS)
+        return client.post("/auth/login", json={"email": f"user{i}@example.com", "password": PASSWORD})
+
+    def authenticated(client, rng, state):
+        return client.get("/auth/me", headers={"Authorization": f"Bearer {rng.choice(tokens)}"})
+
+    return {"browse": browse, "search": search, "paginate": paginate_, "login": login, "authenticated": authenticated}
+
+
+async def run_scenario(client, make_request, requests: int, concurrency: int, seed: int) -> dict:
+    samples, errors = [], 0
+    remaining = iter(range(requests))
+
+    async def worker(w):
+        nonlocal errors
+        rng, state = random.Random(seed * 1000 + w), {}
+        for _ in remaining:
+            t0 = time.perf_counter()
+            r = await make_request(client, rng, state)
+            samples.append((time.perf_counter() - t0) * 1000)
+            if r.status_code >= 400:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    return {"rps": round(requests / elapsed, 1), **percentiles(samples), "errors": errors}
+
+
+def run_http(engine, n_products, requests, concurrency, seed, name_filter) -> dict:
+    app = bind_app(engine)
+
+    async def all_scenarios():
+        results = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            tokens = []
+            for i in range(min(USERS, 10)):
+                r = await client.post("/auth/login", json={"email": f"user{i}@example.com", "password": PASSWORD})
+                tokens.append(r.json()["access_token"])
+            for name, fn in http_scenarios(n_products, tokens).items():
+                if name_filter and name_filter not in name:
+                    continue
+                # login é CPU (pbkdf2): menos requisições para caber no mesmo tempo
+                total = max(concurrency, requests // 10) if name == "login" else requests
+                r = await run_scenario(client, fn, total, concurrency, seed)
+                results[f"http.{name}"] = r
+                print(f"  {name:<26} {r['p50_ms']:>10} {r['p95_ms']:>10} {r['p99_ms']:>10} {r['rps']:>9} {r['errors']:>7}")
+        return results
+
+    return asyncio.run(all_scenarios())
+
+
+# ---------- Resultado e baseline ----------
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=Path(__file__).resolve().parent, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta_ms: float = 0.05) -> list[str]:
+    """
+    Imprime a comparação caso a caso e devolve os nomes que regrediram.
+    Diferenças de latência menores que ``min_delta_ms`` não contam: em casos
+    de microssegundos o arredondamento sozinho daria dezenas de por cento.
+    """
+    if baseline.get("meta", {}).get("products") != current["meta"]["products"]:
+        print(f"aviso: baseline com {baseline.get('meta', {}).get('products')} produtos, "
+              f"atual com {current['meta']['products']}")
+    regressions = []
+    print(f"\n{'caso':<34} {'métrica':<8} {'baseline':>10} {'atual':>10} {'Δ':>8}")
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        metrics = [("p50_ms", True), ("p95_ms", True)] + ([("rps", False)] if "rps" in cur else [])
+        for metric, lower_is_better in metrics:
+            b, c = base.get(metric), cur.get(metric)
+            if not b or c is None:
+                continue
+            delta = (c - b) / b
+            if lower_is_better:
+                worse = delta > tolerance and c - b >= min_delta_ms
+            else:
+                worse = delta < -tolerance
+            flag = "  REGRESSÃO" if worse else ""
+            print(f"{name:<34} {metric:<8} {b:>10} {c:>10} {delta:>+7.0%}{flag}")
+            if worse and name not in regressions:
+                regressions.append(name)
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--products", type=int, default=100_000, help="10^3 a 10^6")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--only", choices=("micro", "http"))
+    ap.add_argument("--filter", help="só casos cujo nome contém o texto")
+    ap.add_argument("--micro-max", type=int, default=200_000, help="teto da entrada de merge_sort e afins")
+    ap.add_argument("--requests", type=int, default=2_000, help="requisições por cenário HTTP")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--out", type=Path, help="grava o resultado em JSON")
+    ap.add_argument("--baseline", type=Path, help="JSON de uma execução anterior para comparar")
+    ap.add_argument("--tolerance", type=float, default=0.20)
+    ap.add_argument("--min-delta-ms", type=float, default=0.05, help="ignora diferenças de latência menores")
+    args = ap.parse_args()
+
+    engine, Session = make_db(args.products, args.seed)
+    seed_users(engine, USERS)
+    rng = random.Random(args.seed)
+    results = {}
+
+    header = f"  {'caso':<26} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"
+    if args.only in (None, "micro"):
+        print(f"micro-benchmarks ({args.products} produtos)\n{header}")
+        results.update(run_micro(Session, rng, args.micro_max, args.filter))
+    if args.only in (None, "http"):
+        print(f"HTTP (concorrência {args.concurrency})\n{header} {'req/s':>9} {'erros':>7}")
+        results.update(run_http(engine, args.products, args.requests, args.concurrency, args.seed, args.filter))
+    engine.dispose()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "products": args.products,
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\nresultado gravado em {args.out}")
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} caso(s) regrediram além de {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nsem regressões")
+
+
+if __name__ == "__main__":
+    main()
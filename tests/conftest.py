@@ -0,0 +1,62 @@
+# tests/conftest.py
+"""
+Os módulos do app criam o engine na importação: sem DB_URL no ambiente os
+testes usam um SQLite temporário em vez do MySQL do .env.
+
+``client`` é o app real via ``TestClient`` (sem o lifespan: os índices
+carregam sob demanda), com a tabela ``products`` vazia e os índices e o cache
+do processo zerados. ``other_worker`` escreve por uma conexão crua, como outro
+worker do uvicorn: sem eventos nem ``local_commits`` neste processo.
+"""
+import os
+import tempfile
+
+os.environ.setdefault("DB_URL", f"sqlite:///{tempfile.mkdtemp(prefix='ecommerce-tests-')}/tests.db")
+
+import pytest
+
+pytest_plugins = ["app.testing"]
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from app.db.migrations import upgrade
+    from app.db.session import engine
+
+    upgrade(engine, log=lambda *_: None)
+    return engine
+
+
+@pytest.fixture
+def client(engine):
+    from fastapi.testclient import TestClient
+    from sqlalchemy import delete
+
+    from app.main import app
+    from app.models.product import Product
+    from app.services import catalog_version
+    from app.services.price_analytics import price_analytics
+    from app.services.price_index import price_index
+    from app.services.product_cache import product_cache
+    from app.services.search_index import search_index
+
+    with engine.begin() as conn:
+        conn.execute(delete(Product))
+        catalog_version.bump(conn)
+    for index in (price_index, search_index, price_analytics):
+        index.invalidate()
+    product_cache.backend.clear()
+    return TestClient(app)
+
+
+@pytest.fixture
+def other_worker(engine):
+    from app.services import catalog_version
+
+    def write(stmt, params=None):
+        with engine.begin() as conn:
+            result = conn.execute(stmt, params or {})
+            catalog_version.bump(conn)
+            return result
+
+    return write
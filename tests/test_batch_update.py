@@ -0,0 +1,87 @@
+# tests/test_batch_update.py
+"""
+PATCH /products/batch: lista (UPDATE com CASE por id) e regra (um UPDATE
+filtrado), com RETURNING (SQLite) e pelo caminho sem RETURNING do MySQL.
+"""
+import pytest
+
+
+@pytest.fixture(params=[True, False], ids=["returning", "sem-returning"])
+def batch_client(request, client, engine, monkeypatch):
+    monkeypatch.setattr(engine.dialect, "update_returning", request.param)
+    return client
+
+
+@pytest.fixture
+def seeded(batch_client):
+    def create(name, category, price):
+        return batch_client.post("/products/", json={"name": name, "category": category, "price": price}).json()["id"]
+
+    return {"A": create("Mouse", "x", 10.0), "B": create("Teclado", "x", 20.0), "C": create("Monitor", "y", 30.0)}
+
+
+def _patch(client, body, **params):
+    return client.patch("/products/batch", json=body, params=params)
+
+
+def _get(client, pid):
+    return client.get(f"/products/{pid}").json()
+
+
+def test_items_update_each_row_once(batch_client, seeded):
+    a, b = seeded["A"], seeded["B"]
+    resp = _patch(batch_client, {"items": [
+        {"id": a, "fields": {"price": 11.5}},
+        {"id": b, "fields": {"name": "Teclado Mecânico"}, "version": 1},
+    ]})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["updated"] == 2
+    assert [(i["id"], i["name"], i["price"], i["version"]) for i in body["items"]] == [
+        (a, "Mouse", 11.5, 2), (b, "Teclado Mecânico", 20.0, 2),
+    ]
+    assert _get(batch_client, a)["price"] == 11.5
+    # eventos chegam aos índices em memória
+    assert [p["id"] for p in batch_client.get("/products/price/exact?price=11.5").json()] == [a]
+    assert [p["id"] for p in batch_client.get("/products/search?q=mecanico").json()] == [b]
+
+
+def test_items_conflict_writes_nothing(batch_client, seeded):
+    a, b = seeded["A"], seeded["B"]
+    resp = _patch(batch_client, {"items": [
+        {"id": a, "fields": {"price": 1.0}},
+        {"id": b, "fields": {"price": 2.0}, "version": 7},
+        {"id": 999999, "fields": {"price": 3.0}},
+    ]})
+    assert resp.status_code == 409
+    detail = resp.json()["detail"]
+    assert detail["stale"] == [b] and detail["missing"] == [999999]
+    assert (_get(batch_client, a)["price"], _get(batch_client, b)["price"]) == (10.0, 20.0)
+
+
+def test_rule_updates_only_matching_rows(batch_client, seeded):
+    resp = _patch(batch_client, {"rule": {"category": "x", "price_factor": 0.5, "price_delta": 0.333}})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["updated"] == 2
+    assert [(i["id"], i["price"], i["version"]) for i in body["items"]] == [
+        (seeded["A"], 5.33, 2), (seeded["B"], 10.33, 2),
+    ]
+    assert _get(batch_client, seeded["C"])["price"] == 30.0
+    assert [p["id"] for p in batch_client.get("/products/price/cheapest?k=1").json()] == [seeded["A"]]
+
+
+def test_rule_without_items_in_response(batch_client, seeded):
+    resp = _patch(batch_client, {"rule": {"min_price": 15.0, "price_delta": -100.0}}, return_items="false")
+    assert resp.status_code == 200
+    assert resp.json()["updated"] == 2 and resp.json()["items"] == []
+    assert _get(batch_client, seeded["B"])["price"] == 0.0  # nunca abaixo de zero
+
+
+def test_rule_with_stale_catalog_version_conflicts(batch_client, seeded):
+    version = _patch(batch_client, {"rule": {"category": "y", "price_factor": 1.0}}).json()["catalog_version"]
+    batch_client.put(f"/products/{seeded['A']}", json={"price": 12.0})
+    resp = _patch(batch_client, {"rule": {"category": "x", "price_factor": 2.0, "expected_catalog_version": version}})
+    assert resp.status_code == 409
+    assert resp.json()["detail"]["catalog_version"] == version + 1
+    assert _get(batch_client, seeded["B"])["price"] == 20.0
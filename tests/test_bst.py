@@ -0,0 +1,47 @@
+# tests/test_bst.py
+"""OrderedMap (AVL) contra um dict ordenado, e a fachada antiga bst_*."""
+import random
+
+import pytest
+
+from app.algorithms.bst import OrderedMap, bst_inorder, bst_insert, bst_search
+
+
+def test_matches_sorted_dict_model():
+    rng = random.Random(3)
+    tree, model = OrderedMap(), {}
+    for _ in range(5000):
+        key = rng.randrange(500)
+        if rng.random() < 0.3:
+            assert tree.delete(key) == (model.pop(key, None) is not None)
+        else:
+            assert tree.insert(key, -key) == (key not in model)
+            model[key] = -key
+    keys = sorted(model)
+    assert list(tree) == keys
+    assert [k for k, _ in tree.items(100, 200, reverse=True)] == [k for k in reversed(keys) if 100 <= k <= 200]
+    for i in (0, len(keys) // 2, -1):
+        assert tree.select(i) == (keys[i], -keys[i])
+        assert tree.rank(keys[i]) == keys.index(keys[i])
+    assert tree.height() <= 1.45 * len(keys).bit_length() + 1
+
+
+def test_sorted_inserts_stay_balanced():
+    tree = OrderedMap()
+    for i in range(100_000):
+        tree.insert(i, i)
+    assert tree.height() <= 18
+    assert OrderedMap.from_sorted((i, i) for i in range(100_000)).height() <= 18
+
+
+def test_legacy_functions_delegate_with_warning():
+    root = None
+    with pytest.warns(DeprecationWarning):
+        for key in range(5000):  # em ordem: a BST recursiva estourava a pilha aqui
+            root = bst_insert(root, key, f"v{key}")
+        root = bst_insert(root, 7, "novo")
+    with pytest.warns(DeprecationWarning):
+        assert bst_search(root, 7) == "novo"
+        assert bst_search(root, -1) is None
+        assert bst_inorder(root)[:3] == ["v0", "v1", "v2"]
+        assert bst_inorder(None) == []
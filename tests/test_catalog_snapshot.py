@@ -0,0 +1,77 @@
+# tests/test_catalog_snapshot.py
+"""Consultas por preço com snapshot mapeado: escritas locais depois da publicação aparecem."""
+import random
+
+import pytest
+
+from app.services import catalog_snapshot as snapshots
+from app.services.catalog_snapshot import catalog_snapshot
+from app.services.price_index import PriceIndex, SqlPriceIndex
+
+
+def _create(client, name, price):
+    resp = client.post("/products/", json={"name": name, "category": "c", "price": price})
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+@pytest.fixture
+def published(client, engine, tmp_path, monkeypatch):
+    """Catálogo com três produtos publicado num snapshot que este worker mapeia."""
+    ids = {name: _create(client, name, price) for name, price in (("A", 10.0), ("B", 15.0), ("C", 30.0))}
+    path = tmp_path / "catalog.snap"
+    with engine.connect() as conn:
+        snapshots.publish(conn, path)
+    monkeypatch.setattr(catalog_snapshot, "path", str(path))
+    monkeypatch.setattr(catalog_snapshot, "check_seconds", 0)
+    monkeypatch.setattr(catalog_snapshot, "_snap", None)
+    monkeypatch.setattr(catalog_snapshot, "_stat", None)
+    monkeypatch.setattr(catalog_snapshot, "_dirty", {})
+    monkeypatch.setattr(catalog_snapshot, "_stale_before", 0.0)
+    assert catalog_snapshot.current() is not None
+    return ids
+
+
+def _names(resp):
+    assert resp.status_code == 200
+    return [p["name"] for p in resp.json()]
+
+
+def test_served_from_snapshot(client, published):
+    assert _names(client.get("/products/price/range?min_price=10&max_price=20")) == ["A", "B"]
+    assert _names(client.get("/products/price/priciest?k=3")) == ["C", "B", "A"]
+
+
+def test_local_update_leaves_range_and_reorders(client, published):
+    assert client.put(f"/products/{published['A']}", json={"price": 500.0}).status_code == 200
+    assert _names(client.get("/products/price/range?min_price=10&max_price=20")) == ["B"]
+    assert _names(client.get("/products/price/priciest?k=3")) == ["A", "C", "B"]
+    assert client.get(f"/products/{published['A']}").json()["price"] == 500.0
+
+
+def test_local_insert_and_delete_show_up(client, published):
+    _create(client, "D", 12.0)
+    assert client.delete(f"/products/{published['B']}").status_code == 204
+    assert _names(client.get("/products/price/range?min_price=10&max_price=20")) == ["A", "D"]
+    assert _names(client.get("/products/price/nearest?price=13&k=2")) == ["D", "A"]
+
+
+def test_sql_fallback_matches_price_index(client, engine):
+    rng = random.Random(7)
+    prices = [round(rng.choice([5, 9.99, 10, 20, 20, 49.9]) + rng.choice([0, 0, 0.5]), 2) for _ in range(60)]
+    for i, price in enumerate(prices):
+        _create(client, f"p{i}", price)
+    index = PriceIndex(refresh_seconds=0)
+    with engine.connect() as conn:
+        index.load(conn)
+        sql = SqlPriceIndex(conn)
+        for query in (
+            lambda ix: ix.exact(20.0, 50),
+            lambda ix: ix.range(9.99, 20.5, 7, 3),
+            lambda ix: ix.range(None, 10, 50),
+            lambda ix: ix.nearest(15.0, 9),
+            lambda ix: ix.nearest(20.0, 5),
+            lambda ix: ix.cheapest(8),
+            lambda ix: ix.priciest(8),
+        ):
+            assert query(sql) == query(index)
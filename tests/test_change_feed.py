@@ -0,0 +1,57 @@
+# tests/test_change_feed.py
+"""GET /products/changes: eventos das escritas e retomada por Last-Event-ID."""
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services.change_feed import change_feed
+
+
+@pytest.fixture(autouse=True)
+def short_streams(monkeypatch):
+    # o stream termina sozinho e o TestClient devolve o corpo inteiro
+    monkeypatch.setattr(settings, "FEED_MAX_STREAM_SECONDS", 0.2)
+
+
+def _events(client, last_event_id):
+    resp = client.get("/products/changes", headers={"Last-Event-ID": last_event_id})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in resp.text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["id"], fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _cursor():
+    return f"{change_feed.epoch}-{change_feed.last_seq}"
+
+
+def test_write_routes_publish_changes_in_order(client):
+    since = _cursor()
+    pid = client.post("/products/", json={"name": "Mouse", "category": "p", "price": 10.0}).json()["id"]
+    client.put(f"/products/{pid}", json={"price": 12.5})
+    client.delete(f"/products/{pid}")
+
+    events = _events(client, since)
+    assert [(op, data["id"]) for _, op, data in events] == [("create", pid), ("update", pid), ("delete", pid)]
+    assert events[1][2]["product"] == {"id": pid, "name": "Mouse", "category": "p", "price": 12.5}
+    assert events[2][2]["product"] is None
+    versions = [data["version"] for _, _, data in events]
+    assert versions == sorted(versions) and len(set(versions)) == 3
+
+
+def test_resume_from_last_event_id(client):
+    since = _cursor()
+    for name in ("A", "B", "C"):
+        client.post("/products/", json={"name": name, "category": "p", "price": 1.0})
+    first_id = _events(client, since)[0][0]
+    assert [data["product"]["name"] for _, _, data in _events(client, first_id)] == ["B", "C"]
+
+
+def test_unknown_event_id_gets_reset(client):
+    events = _events(client, "outro-processo-7")
+    assert [op for _, op, _ in events] == ["reset"]
@@ -0,0 +1,61 @@
+# tests/test_metrics.py
+"""/metrics por template de rota, Server-Timing e o orçamento de queries das rotas quentes."""
+import re
+
+import pytest
+
+from app.testing import QueryBudgetExceeded
+
+
+def _seed(client, n=60):
+    return [
+        client.post("/products/", json={"name": f"Produto {i}", "category": "c", "price": float(i)}).json()["id"]
+        for i in range(n)
+    ]
+
+
+def _metric(body: str, name: str, **labels) -> float:
+    want = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    for line in body.splitlines():
+        m = re.match(rf"{name}\{{(.*)\}} (\S+)$", line)
+        if m and all(part in m.group(1).split(",") for part in want.split(",")):
+            return float(m.group(2))
+    return 0.0
+
+
+def test_requests_are_counted_by_route_template(client):
+    pid = _seed(client, 1)[0]
+    before = client.get("/metrics").text
+    client.get(f"/products/{pid}")
+    client.get("/products/999999")
+    after = client.get("/metrics").text
+    route = {"method": "GET", "route": "/products/{product_id}"}
+    for status in (200, 404):
+        delta = (_metric(after, "http_requests_total", status=status, **route)
+                 - _metric(before, "http_requests_total", status=status, **route))
+        assert delta == 1
+    assert f'route="/products/{pid}"' not in after
+    assert _metric(after, "db_queries_per_request_count", **route) >= 2
+
+
+def test_server_timing_reports_queries(client):
+    _seed(client, 3)
+    timing = client.get("/products/").headers["server-timing"]
+    assert re.search(r'db;dur=[\d.]+;desc="2 queries"', timing), timing
+
+
+def test_listing_and_detail_query_budgets(client, query_budget):
+    ids = _seed(client)
+    with query_budget(2):  # versão do catálogo (cache/ETag) + página
+        assert len(client.get("/products/?limit=50").json()) == 50
+    with query_budget(2):  # versão + linha
+        client.get(f"/products/{ids[0]}")
+    with query_budget(1):  # em cache: só a versão
+        client.get(f"/products/{ids[0]}")
+
+
+def test_query_budget_fails_loudly(client, query_budget):
+    _seed(client, 2)
+    with pytest.raises(QueryBudgetExceeded, match="limite 0"):
+        with query_budget(0):
+            client.get("/products/?limit=5")
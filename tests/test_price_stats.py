@@ -0,0 +1,88 @@
+# tests/test_price_stats.py
+"""/products/stats/*: resultados do NumPy contra um cálculo direto, antes e depois de escritas."""
+import random
+import statistics
+import time
+
+import numpy as np
+from sqlalchemy import insert
+
+from app.models.product import Product
+from app.services.price_analytics import price_analytics
+
+CATEGORIES = ("audio", "video", "perifericos")
+
+
+def _seed(client, n=80, seed=11):
+    rng = random.Random(seed)
+    catalog = {}
+    for i in range(n):
+        category, price = rng.choice(CATEGORIES), round(rng.uniform(1, 500), 2)
+        resp = client.post("/products/", json={"name": f"p{i}", "category": category, "price": price})
+        catalog[resp.json()["id"]] = (category, price)
+    return catalog
+
+
+def _expected_categories(catalog):
+    out = []
+    for category in sorted({c for c, _ in catalog.values()}):
+        prices = [p for c, p in catalog.values() if c == category]
+        out.append({
+            "category": category,
+            "count": len(prices),
+            "min_price": min(prices),
+            "max_price": max(prices),
+            "avg_price": round(statistics.fmean(prices), 2),
+            "median_price": round(statistics.median(prices), 2),
+            "std_price": round(statistics.pstdev(prices), 2),
+        })
+    return out
+
+
+def _categories(client):
+    return sorted(client.get("/products/stats/categories").json(), key=lambda r: r["category"])
+
+
+def _assert_matches(client, catalog):
+    assert _categories(client) == _expected_categories(catalog)
+    prices = [p for _, p in catalog.values()]
+    count = client.get("/products/stats/count", params={"min_price": 100, "max_price": 250}).json()["count"]
+    assert count == sum(100 <= p <= 250 for p in prices)
+    video = client.get("/products/stats/count", params={"min_price": 100, "category": "video"}).json()["count"]
+    assert video == sum(p >= 100 for c, p in catalog.values() if c == "video")
+    pct = client.get("/products/stats/percentiles", params={"q": "50,90"}).json()
+    assert pct["count"] == len(prices)
+    assert pct["percentiles"] == {f"p{q}": round(float(np.percentile(prices, q)), 2) for q in (50, 90)}
+    hist = client.get("/products/stats/histogram", params={"bins": 7}).json()
+    counts, _ = np.histogram(prices, bins=7)
+    assert hist["counts"] == counts.tolist() and hist["total"] == len(prices)
+
+
+def test_stats_match_direct_computation(client):
+    _assert_matches(client, _seed(client))
+
+
+def test_stats_follow_local_writes(client):
+    catalog = _seed(client)
+    _assert_matches(client, catalog)
+    ids = sorted(catalog)
+    client.put(f"/products/{ids[0]}", json={"price": 999.0, "category": "video"})
+    catalog[ids[0]] = ("video", 999.0)
+    client.delete(f"/products/{ids[1]}")
+    del catalog[ids[1]]
+    resp = client.post("/products/", json={"name": "novo", "category": "games", "price": 42.0})
+    catalog[resp.json()["id"]] = ("games", 42.0)
+    _assert_matches(client, catalog)
+
+
+def test_stats_pick_up_other_worker_writes(client, other_worker, monkeypatch):
+    catalog = _seed(client, n=20)
+    _assert_matches(client, catalog)
+    pid = other_worker(insert(Product).values(name="x", category="audio", price=123.0)).inserted_primary_key[0]
+    catalog[pid] = ("audio", 123.0)
+    monkeypatch.setattr(price_analytics, "refresh_seconds", 1e-6)
+    deadline = time.monotonic() + 5
+    while _categories(client) != _expected_categories(catalog):
+        assert time.monotonic() < deadline, "estatísticas não recarregaram"
+        time.sleep(0.02)
+    _assert_matches(client, catalog)
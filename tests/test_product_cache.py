@@ -0,0 +1,47 @@
+# tests/test_product_cache.py
+"""Cache de GET /products e /products/{id}: escritas locais e de outros workers invalidam."""
+from sqlalchemy import insert, update
+
+from app.models.product import Product
+from app.services.product_cache import product_cache
+
+
+def _create(client, name, category="perifericos", price=10.0):
+    resp = client.post("/products/", json={"name": name, "category": category, "price": price})
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def _hits():
+    return product_cache.stats()["hits"]
+
+
+def test_detail_is_served_from_cache(client):
+    pid = _create(client, "Mouse")["id"]
+    assert client.get(f"/products/{pid}").json()["name"] == "Mouse"
+    hits = _hits()
+    assert client.get(f"/products/{pid}").json()["name"] == "Mouse"
+    assert _hits() == hits + 1
+
+
+def test_local_update_invalidates_detail_and_listing(client):
+    pid = _create(client, "Mouse")["id"]
+    client.get(f"/products/{pid}")
+    client.get("/products/?category=perifericos")
+    assert client.put(f"/products/{pid}", json={"price": 99.0}).status_code == 200
+    assert client.get(f"/products/{pid}").json()["price"] == 99.0
+    assert [p["price"] for p in client.get("/products/?category=perifericos").json()] == [99.0]
+
+
+def test_other_worker_update_invalidates_detail(client, other_worker):
+    pid = _create(client, "Mouse")["id"]
+    assert client.get(f"/products/{pid}").json()["price"] == 10.0
+    other_worker(update(Product).where(Product.id == pid).values(price=55.0, version=Product.version + 1))
+    assert client.get(f"/products/{pid}").json()["price"] == 55.0
+
+
+def test_other_worker_insert_invalidates_listing(client, other_worker):
+    _create(client, "Mouse")
+    assert [p["name"] for p in client.get("/products/").json()] == ["Mouse"]
+    other_worker(insert(Product).values(name="Monitor", category="video", price=900.0))
+    assert [p["name"] for p in client.get("/products/").json()] == ["Mouse", "Monitor"]
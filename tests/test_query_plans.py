@@ -0,0 +1,46 @@
+# tests/test_query_plans.py
+"""
+EXPLAIN das consultas quentes, montadas pelos builders das rotas
+(filtered_select, paginate, top_k_select): uma mudança que tire uma delas do
+índice (ou traga filesort) quebra aqui.
+
+Com TEST_DB_URL (ex.: um MySQL de teste) o plano é conferido nesse banco;
+sem ele, num SQLite novo.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.db.migrations import hot_queries, plan_ok, upgrade
+from app.models.product import Product
+from app.services.pagination import filtered_select, paginate
+
+QUERIES = hot_queries()
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    url = os.environ.get("TEST_DB_URL") or f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    engine = create_engine(url)
+    upgrade(engine, log=lambda *_: None)
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", list(QUERIES))
+def test_hot_query_uses_index(conn, name):
+    ok, plan = plan_ok(conn, QUERIES[name])
+    assert ok, "\n".join(plan)
+
+
+@pytest.mark.parametrize("stmt", [
+    paginate(filtered_select(q="mouse"), False, 50),
+    paginate(filtered_select(), False, 50).where(Product.id.not_in([1, 2, 3])),
+    paginate(filtered_select(), True, 50).where(Product.name != "x"),
+    filtered_select(min_price=10.0).order_by(Product.name).limit(50),
+], ids=["ILIKE", "NOT IN", "filtro fora do índice", "ordem por nome com filtro"])
+def test_scans_that_do_not_stop_at_limit_fail(conn, stmt):
+    ok, plan = plan_ok(conn, stmt)
+    assert not ok, "\n".join(plan)
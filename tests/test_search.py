@@ -0,0 +1,77 @@
+# tests/test_search.py
+"""
+/products/search (índice invertido: palavras por prefixo, sem acento, com
+ranking) e o filtro q da listagem (trecho do nome no SQL).
+"""
+import time
+
+from sqlalchemy import insert
+
+from app.models.product import Product
+from app.services.search_index import search_index
+
+
+def _create(client, name, category="mercearia"):
+    resp = client.post("/products/", json={"name": name, "category": category, "price": 10.0})
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _search(client, q, **params):
+    resp = client.get("/products/search", params={"q": q, **params})
+    assert resp.status_code == 200
+    return [p["name"] for p in resp.json()]
+
+
+def _listing(client, q):
+    resp = client.get("/products/", params={"q": q})
+    assert resp.status_code == 200
+    return [p["name"] for p in resp.json()]
+
+
+def test_search_folds_accents_and_matches_word_prefixes(client):
+    for name in ("Café Torrado", "Cafeteira Elétrica", "Mousepad", "Açúcar Orgânico"):
+        _create(client, name)
+    assert _search(client, "cafe") == ["Café Torrado", "Cafeteira Elétrica"]  # exato antes de prefixo
+    assert _search(client, "CAF torr") == ["Café Torrado"]
+    assert _search(client, "acucar organ") == ["Açúcar Orgânico"]
+    assert _search(client, "pad") == []  # só início de palavra
+    assert client.get("/products/search/suggest", params={"q": "caf"}).json() == ["cafe", "cafeteira"]
+
+
+def test_search_filters_by_category(client):
+    _create(client, "Mouse Gamer", "perifericos")
+    _create(client, "Mouse Pad", "acessorios")
+    assert _search(client, "mouse", category="acessorios") == ["Mouse Pad"]
+
+
+def test_search_follows_local_writes(client):
+    pid = _create(client, "Teclado Mecânico")
+    assert _search(client, "tecl") == ["Teclado Mecânico"]
+    client.put(f"/products/{pid}", json={"name": "Monitor Curvo"})
+    assert _search(client, "tecl") == []
+    assert _search(client, "curv") == ["Monitor Curvo"]
+    client.delete(f"/products/{pid}")
+    assert _search(client, "monitor") == []
+
+
+def test_search_picks_up_other_worker_writes(client, other_worker, monkeypatch):
+    _create(client, "Mouse")
+    assert _search(client, "monitor") == []
+    other_worker(insert(Product).values(name="Monitor", category="video", price=900.0))
+    monkeypatch.setattr(search_index, "refresh_seconds", 1e-6)
+    deadline = time.monotonic() + 5
+    while _search(client, "monitor") != ["Monitor"]:
+        assert time.monotonic() < deadline, "índice não recarregou"
+        time.sleep(0.02)
+
+
+def test_listing_q_is_a_substring_in_sql(client, other_worker):
+    for name in ("Mouse Gamer", "Mousepad XL", "Teclado"):
+        _create(client, name)
+    other_worker(insert(Product).values(name="Monitor", category="video", price=900.0))
+    assert _listing(client, "mouse") == ["Mouse Gamer", "Mousepad XL"]
+    assert _listing(client, "pad") == ["Mousepad XL"]
+    assert _listing(client, "-") == []
+    facets = client.get("/products/facets", params={"q": "mouse"}).json()
+    assert [(f["category"], f["count"]) for f in facets] == [("mercearia", 2)]